@@ -6,10 +6,20 @@ Based on patterns from GoogleCloudPlatform/agent-starter-pack
 
 import os
 import sys
+import json
 import yaml
+import shutil
+import argparse
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version, PackageNotFoundError
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Sequence
+
+try:
+    from packaging.version import InvalidVersion, Version
+except ImportError:  # not installed yet; pip vendors a copy
+    from pip._vendor.packaging.version import InvalidVersion, Version
 
 # ANSI color codes for pretty output
 GREEN = '\033[92m'
@@ -19,6 +29,20 @@ BLUE = '\033[94m'
 BOLD = '\033[1m'
 RESET = '\033[0m'
 
+PREREQ_CACHE = Path(".starter-kit/cache/prereqs.json")
+MIN_ADK_VERSION = Version("1.0")
+
+# core.sessions.history.MODES; the wizard runs before ADK is installed, so
+# it cannot import that module
+HISTORY_POLICIES = ("off", "window", "budget", "summary")
+
+REQUIREMENTS = {
+    "python3": "Python 3.12+",
+    "gcloud": "Google Cloud SDK",
+    "poetry": "Poetry (dependency management)",
+    "terraform": "Terraform (infrastructure)",
+}
+
 def print_header():
     """Print welcome header"""
     print(f"""
@@ -65,37 +89,94 @@ def prompt_bool(question: str, default: bool = False) -> bool:
         
     return answer.lower() in ['y', 'yes', 'true', '1']
 
-def check_prerequisites() -> bool:
+def prompt_choice(question: str, choices: Sequence[str], default: str) -> str:
+    """Prompt until the answer is one of ``choices``"""
+    question = f"{question} ({'/'.join(choices)})"
+    while True:
+        answer = prompt(question, default).lower()
+        if answer in choices:
+            return answer
+        print_error(f"Choose one of: {', '.join(choices)}")
+
+def parse_version(text: str) -> Optional[Version]:
+    """Parse a PEP 440 version string; None if it is not one.
+
+    Pre-releases sort before their release, so "1.0.0rc1" < Version("1.0").
+    """
+    try:
+        return Version(text)
+    except InvalidVersion:
+        return None
+
+def probe_tool(cmd: str) -> Dict[str, Any]:
+    """Run `<cmd> --version` and return whether it works and its first output line"""
+    if not shutil.which(cmd):
+        return {"found": False, "version": None}
+    try:
+        result = subprocess.run([cmd, "--version"], capture_output=True, text=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return {"found": False, "version": None}
+    output = (result.stdout or result.stderr).strip()
+    return {"found": True, "version": output.splitlines()[0] if output else None}
+
+def prereq_cache_key(commands) -> Dict[str, Any]:
+    """Key probe results on PATH and the resolved path and mtime of each binary"""
+    binaries = {}
+    for cmd in commands:
+        path = shutil.which(cmd)
+        if path:
+            real_path = os.path.realpath(path)
+            binaries[cmd] = [real_path, os.stat(real_path).st_mtime_ns]
+        else:
+            binaries[cmd] = None
+    return {"path": os.environ.get("PATH", ""), "binaries": binaries}
+
+def probe_tools(commands, use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Probe all tools concurrently, reusing cached results when nothing changed"""
+    key = prereq_cache_key(commands)
+    if use_cache and PREREQ_CACHE.exists():
+        try:
+            with open(PREREQ_CACHE) as f:
+                cached = json.load(f)
+            if cached.get("key") == key:
+                return cached["results"]
+        except (json.JSONDecodeError, KeyError):
+            pass
+    
+    with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+        results = dict(zip(commands, executor.map(probe_tool, commands)))
+    
+    PREREQ_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    with open(PREREQ_CACHE, 'w') as f:
+        json.dump({"key": key, "results": results}, f, indent=2)
+    return results
+
+def check_prerequisites(use_cache: bool = True) -> bool:
     """Check if all prerequisites are installed"""
     print(f"\n{BOLD}Checking prerequisites...{RESET}")
     
-    requirements = {
-        "python3": "Python 3.12+",
-        "gcloud": "Google Cloud SDK",
-        "poetry": "Poetry (dependency management)",
-        "terraform": "Terraform (infrastructure)",
-    }
-    
     all_good = True
-    for cmd, name in requirements.items():
-        try:
-            subprocess.run([cmd, "--version"], capture_output=True, check=True)
+    results = probe_tools(list(REQUIREMENTS), use_cache)
+    for cmd, name in REQUIREMENTS.items():
+        if results[cmd]["found"]:
             print_success(f"{name} found")
-        except (subprocess.CalledProcessError, FileNotFoundError):
+        else:
             print_error(f"{name} not found - please install it first")
             all_good = False
     
     # Check ADK version
     try:
-        import pkg_resources
-        adk_version = pkg_resources.get_distribution('google-adk').version
-        if adk_version >= "1.0":
-            print_success(f"Google ADK {adk_version} found")
-        else:
-            print_error(f"Google ADK {adk_version} is too old - need 1.0+")
-            all_good = False
-    except:
+        adk_version = version('google-adk')
+    except PackageNotFoundError:
         print_error("Google ADK not found - will install during setup")
+        return all_good
+    
+    parsed = parse_version(adk_version)
+    if parsed is not None and parsed >= MIN_ADK_VERSION:
+        print_success(f"Google ADK {adk_version} found")
+    else:
+        print_error(f"Google ADK {adk_version} is too old - need {MIN_ADK_VERSION}+")
+        all_good = False
     
     return all_good
 
@@ -154,6 +235,12 @@ def configure_features() -> Dict[str, Any]:
             "enabled": prompt_bool("Enable OpenTelemetry tracing?", True),
             "sample_rate": 1.0
         },
+        "response_cache": {
+            "enabled": prompt_bool("Cache identical model responses (tool agents)?", False),
+            "ttl_seconds": 300,
+            "max_entries": 1024,
+            "shared_store": ""
+        },
         "cicd": {
             "provider": "cloudbuild",
             "auto_deploy_staging": prompt_bool("Auto-deploy to staging on commit?", True),
@@ -176,6 +263,12 @@ def configure_agent_defaults() -> Dict[str, Any]:
             "temperature": 0.7,
             "max_tokens": 2048,
             "timeout": 30,
+            "history": {
+                "policy": prompt_choice("History policy", HISTORY_POLICIES, "off"),
+                "max_tokens": None,
+                "max_events": 0,
+                "summary_tokens": 256
+            },
             "default_tools": ["log_event"]
         }
     }
@@ -251,12 +344,23 @@ def install_dependencies():
         print_error("Failed to install dependencies")
         print_info("Run 'poetry install' manually to complete setup")
 
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Interactive setup wizard")
+    parser.add_argument(
+        "--refresh-prereqs",
+        action="store_true",
+        help=f"Probe prerequisites again instead of using {PREREQ_CACHE}"
+    )
+    return parser.parse_args(argv)
+
 def main():
     """Main setup wizard"""
+    args = parse_args()
     print_header()
     
     # Check prerequisites
-    if not check_prerequisites():
+    if not check_prerequisites(use_cache=not args.refresh_prereqs):
         print_error("\nPlease install missing prerequisites and run setup again.")
         sys.exit(1)
     
@@ -21,6 +21,8 @@
 import logging
 import warnings
 from google.adk import Agent
+from core.cache import ResponseCache, cache_callbacks
+from core.sessions import HistoryPolicy, history_callbacks
 from .config import Config
 from .prompts import GLOBAL_INSTRUCTION, INSTRUCTION
 from .shared_libraries.callbacks import (
@@ -51,6 +53,23 @@ configs = Config()
 # configure logging __name__
 logger = logging.getLogger(__name__)
 
+# Exact-match model response cache, set by features.response_cache in starter-kit.yaml
+response_cache = ResponseCache.from_config({
+    "enabled": {{response_cache_enabled|default:False}},
+    "ttl_seconds": {{response_cache_ttl_seconds|default:300}},
+    "max_entries": {{response_cache_max_entries|default:1024}},
+    "shared_store": "{{response_cache_shared_store|default:}}",
+    "name": "{{agent_name}}",
+})
+
+# Bound on the history sent to the model, set by agent_defaults.history in starter-kit.yaml
+history_policy = HistoryPolicy.from_config({
+    "policy": "{{history_policy|default:off}}",
+    "max_tokens": {{history_max_tokens|default:2048}},
+    "max_events": {{history_max_events|default:0}},
+    "summary_tokens": {{history_summary_tokens|default:256}},
+})
+
 
 root_agent = Agent(
     model={{model_name|default:gemini-2.0-flash}},
@@ -73,6 +92,8 @@ root_agent = Agent(
     ],
     before_tool_callback=before_tool,
     after_tool_callback=after_tool,
-    before_agent_callback=before_agent,
-    before_model_callback=rate_limit_callback,
+    # History is trimmed before before_agent runs
+    **history_callbacks(history_policy, before_agent_callback=before_agent),
+    # Rate limiting runs before the cache lookup
+    **cache_callbacks(response_cache, before_model_callback=rate_limit_callback),
 )
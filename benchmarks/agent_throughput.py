@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Universal ADK Agent Starter Kit - Agent Throughput Benchmark
+
+Drives each template type (simple, multi, rag, tool) through an ADK Runner
+with LatencyMockModel standing in for the LLM, at 1, 8, 64 and 512
+concurrent sessions. Reports events/sec, turn latency p50/p95/p99 and peak
+RSS, compares them with a JSON baseline and exits non-zero when a run
+regresses past --threshold or has no baseline to compare with. Baselines
+depend on the machine, so record one with --update-baseline on the machine
+that runs the comparison.
+
+The template types are benchmarked as mock topologies shaped like the
+templates (a single LlmAgent, a critic->reviser SequentialAgent, an agent
+that retrieves before answering, an agent that calls a tool before
+answering). A generated agent can be benchmarked directly with
+--agent package.module:root_agent; every LlmAgent in its tree gets a mock
+model. create_agent.py emits tests/agents/<name>/bench_<name>.py stubs that
+do exactly that.
+
+Each configuration runs in a fresh process so peak RSS is per configuration.
+
+Usage:
+    python benchmarks/agent_throughput.py [--types simple,tool] [--concurrency 1,8]
+                                          [--update-baseline] [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import resource
+import statistics
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "tests")]
+
+TEMPLATE_TYPES = ["simple", "multi", "rag", "tool"]
+DEFAULT_CONCURRENCY = [1, 8, 64, 512]
+DEFAULT_TURNS = 5
+DEFAULT_LATENCY_MS = 5.0
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baselines" / "agent_throughput.json"
+
+# Metrics where a higher value is a regression; events_per_sec is the reverse
+LOWER_IS_BETTER = ["p50_ms", "p95_ms", "p99_ms", "peak_rss_kb"]
+
+
+def mock_model(latency_ms, response="Here is the answer you asked for.", tool_name=None):
+    """A LatencyMockModel; with ``tool_name`` it calls that tool before answering."""
+    from google.adk.models.llm_response import LlmResponse
+    from google.genai import types
+
+    from testing import testing_utils
+
+    class ToolCallingMockModel(testing_utils.LatencyMockModel):
+        """Calls ``tool_name`` first, then answers once the tool has responded."""
+
+        def select_response(self, llm_request, index):
+            last = llm_request.contents[-1] if llm_request.contents else None
+            if last and any(part.function_response for part in last.parts or []):
+                return self.responses[0]
+            return LlmResponse(content=testing_utils.ModelContent([
+                types.Part.from_function_call(name=tool_name, args={"query": "benchmark"})
+            ]))
+
+    model_cls = ToolCallingMockModel if tool_name else testing_utils.LatencyMockModel
+    model = model_cls.create([response])
+    model.cycle_responses = True
+    model.time_to_first_chunk = testing_utils.LatencyDistribution.lognormal(latency_ms / 1000, 0.25)
+    # Soak runs keep only the latest request per model
+    model.recorder = testing_utils.RequestRecorder("last", 1)
+    return model
+
+
+def retrieve_documents(query: str) -> dict:
+    """Retrieves documents relevant to the query."""
+    return {"documents": [f"Document {i} about {query}" for i in range(3)]}
+
+
+def lookup_order(query: str) -> dict:
+    """Looks up an order."""
+    return {"status": "shipped", "query": query}
+
+
+def build_template_agent(agent_type, latency_ms):
+    """A mock topology shaped like the given template type."""
+    from google.adk.agents import LlmAgent, SequentialAgent
+
+    if agent_type == "simple":
+        return LlmAgent(name="simple_agent", model=mock_model(latency_ms),
+                        instruction="Answer the user.")
+    if agent_type == "multi":
+        critic = LlmAgent(name="critic_agent", model=mock_model(latency_ms, "Critique."))
+        reviser = LlmAgent(name="reviser_agent", model=mock_model(latency_ms, "Revised answer."))
+        return SequentialAgent(name="multi_agent", sub_agents=[critic, reviser])
+    if agent_type == "rag":
+        return LlmAgent(name="rag_agent", tools=[retrieve_documents],
+                        model=mock_model(latency_ms, tool_name="retrieve_documents"))
+    if agent_type == "tool":
+        return LlmAgent(name="tool_agent", tools=[lookup_order],
+                        model=mock_model(latency_ms, tool_name="lookup_order"))
+    raise ValueError(f"Unknown template type: {agent_type}")
+
+
+def load_agent(spec, latency_ms):
+    """Import ``module:attribute`` and give every LlmAgent in its tree a mock model."""
+    from google.adk.agents import LlmAgent
+
+    module_name, _, attribute = spec.partition(":")
+    agent = getattr(importlib.import_module(module_name), attribute or "root_agent")
+    pending = [agent]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, LlmAgent):
+            current.model = mock_model(latency_ms)
+        pending.extend(current.sub_agents)
+    return agent
+
+
+def run_config(target, concurrency, turns, latency_ms):
+    """Run one configuration in this process and return its metrics."""
+    from google.adk.runners import InMemoryRunner
+
+    from testing import testing_utils
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore", category=UserWarning)
+    if target in TEMPLATE_TYPES:
+        agent = build_template_agent(target, latency_ms)
+    else:
+        agent = load_agent(target, latency_ms)
+    runner = InMemoryRunner(agent=agent, app_name="bench")
+
+    latencies = []
+    events = 0
+
+    async def session_worker(index):
+        nonlocal events
+        session = await runner.session_service.create_session(
+            app_name="bench", user_id=f"user_{index}"
+        )
+        for turn in range(turns):
+            start = time.perf_counter()
+            async for _ in runner.run_async(
+                user_id=session.user_id,
+                session_id=session.id,
+                new_message=testing_utils.UserContent(f"Question {turn}"),
+            ):
+                events += 1
+            latencies.append(time.perf_counter() - start)
+
+    async def drive():
+        nonlocal events
+        # One untimed session first, so one-off setup costs stay out of the percentiles
+        await session_worker("warmup")
+        latencies.clear()
+        events = 0
+        start = time.perf_counter()
+        await asyncio.gather(*(session_worker(index) for index in range(concurrency)))
+        return time.perf_counter() - start
+
+    wall_time = asyncio.run(drive())
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "turns": len(latencies),
+        "events": events,
+        "wall_time": wall_time,
+        "events_per_sec": events / wall_time,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return regression messages for results that are worse than baseline by > threshold."""
+    regressions = []
+    for key, metrics in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if metrics["events_per_sec"] < base["events_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{key}: events/sec {metrics['events_per_sec']:.1f} < baseline {base['events_per_sec']:.1f}"
+            )
+        for metric in LOWER_IS_BETTER:
+            if metrics[metric] > base[metric] * (1 + threshold):
+                regressions.append(f"{key}: {metric} {metrics[metric]:.1f} > baseline {base[metric]:.1f}")
+    return regressions
+
+
+def parse_list(value, cast=str):
+    return [cast(item) for item in value.split(",") if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark agent throughput and latency")
+    parser.add_argument("--types", default=",".join(TEMPLATE_TYPES),
+                        help=f"Template types to benchmark (default: {','.join(TEMPLATE_TYPES)})")
+    parser.add_argument("--agent", metavar="MODULE:ATTR",
+                        help="Benchmark this agent instead of the template types")
+    parser.add_argument("--name", help="Baseline key for --agent (default: the module path)")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_CONCURRENCY)),
+                        help="Concurrent session counts (default: 1,8,64,512)")
+    parser.add_argument("--turns", type=int, default=DEFAULT_TURNS,
+                        help=f"Turns per session (default: {DEFAULT_TURNS})")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS,
+                        help=f"Median mock model time-to-first-chunk (default: {DEFAULT_LATENCY_MS:g})")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE),
+                        help="JSON baseline file (default: benchmarks/baselines/agent_throughput.json)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write this run's results into the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed relative regression before failing (default: {DEFAULT_THRESHOLD:g})")
+    args = parser.parse_args(argv)
+
+    targets = [(args.name or args.agent, args.agent)] if args.agent else [
+        (agent_type, agent_type) for agent_type in parse_list(args.types)
+    ]
+    results = {}
+    print(f"{'config':<24} {'events/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RSS MB':>8}")
+    for name, target in targets:
+        for concurrency in parse_list(args.concurrency, int):
+            # A fresh process per configuration keeps peak RSS meaningful
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                metrics = executor.submit(
+                    run_config, target, concurrency, args.turns, args.latency_ms
+                ).result()
+            key = f"{name}@{concurrency}"
+            results[key] = metrics
+            print(f"{key:<24} {metrics['events_per_sec']:>10.1f} {metrics['p50_ms']:>9.2f} "
+                  f"{metrics['p95_ms']:>9.2f} {metrics['p99_ms']:>9.2f} "
+                  f"{metrics['peak_rss_kb'] / 1024:>8.1f}")
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    if args.update_baseline:
+        baseline.update(results)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\n✓ Updated baseline {baseline_path}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regressions past {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+    # Nothing to compare with is a failure too, not a silent pass
+    missing = [key for key in results if key not in baseline]
+    if missing:
+        print(f"\n✗ No baseline for {', '.join(missing)} in {baseline_path}; "
+              f"record one with --update-baseline")
+    if regressions or missing:
+        return 1
+    print(f"\n✓ No regressions past {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
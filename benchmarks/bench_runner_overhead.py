@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Universal ADK Agent Starter Kit - Test Runner Overhead Benchmark
+
+Runs mocked single-turn conversations through tests/testing/testing_utils.py's
+InMemoryRunner and reports per-turn overhead for the original runner (an
+asyncio.run per session lookup plus Runner.run's per-call thread and loop)
+and for the persistent-loop runner, both via run() and run_async().
+
+Requires google-adk.
+
+Usage:
+    python benchmarks/bench_runner_overhead.py [--turns 200]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "tests")]
+
+from google.adk.agents.llm_agent import LlmAgent  # noqa: E402
+
+from testing import testing_utils  # noqa: E402
+
+
+class LegacyInMemoryRunner(testing_utils.InMemoryRunner):
+    """The original runner: a fresh event loop for every session access."""
+
+    @property
+    def session(self):
+        if not self.session_id:
+            session = asyncio.run(
+                self.runner.session_service.create_session(
+                    app_name='test_app', user_id='test_user'
+                )
+            )
+            self.session_id = session.id
+            return session
+        return asyncio.run(
+            self.runner.session_service.get_session(
+                app_name='test_app', user_id='test_user', session_id=self.session_id
+            )
+        )
+
+    def run(self, new_message):
+        return list(
+            self.runner.run(
+                user_id=self.session.user_id,
+                session_id=self.session.id,
+                new_message=testing_utils.get_user_content(new_message),
+            )
+        )
+
+
+def make_agent(turns):
+    """An agent whose mock model answers every turn instantly."""
+    model = testing_utils.MockModel.create(responses=[f"reply {i}" for i in range(turns)])
+    return LlmAgent(name="bench_agent", model=model)
+
+
+def bench_sync(runner_cls, turns):
+    """Seconds per turn driving runner.run()."""
+    runner = runner_cls(make_agent(turns))
+    start = time.perf_counter()
+    for i in range(turns):
+        runner.run(f"turn {i}")
+    elapsed = time.perf_counter() - start
+    runner.close()
+    return elapsed / turns
+
+
+def bench_async(turns):
+    """Seconds per turn awaiting runner.run_async() inside one loop."""
+    runner = testing_utils.InMemoryRunner(make_agent(turns))
+
+    async def drive():
+        for i in range(turns):
+            await runner.run_async(f"turn {i}")
+
+    start = time.perf_counter()
+    asyncio.run(drive())
+    elapsed = time.perf_counter() - start
+    runner.close()
+    return elapsed / turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-turn test runner overhead")
+    parser.add_argument("--turns", type=int, default=200, help="Turns per runner (default: 200)")
+    args = parser.parse_args()
+    # ADK logs a warning per turn for the mock's missing usage metadata
+    logging.disable(logging.WARNING)
+
+    legacy = bench_sync(LegacyInMemoryRunner, args.turns)
+    persistent = bench_sync(testing_utils.InMemoryRunner, args.turns)
+    native = bench_async(args.turns)
+
+    print(f"Mocked turns per runner: {args.turns}")
+    print(f"  legacy run()            {legacy * 1e6:9.1f} us/turn")
+    print(f"  persistent run()        {persistent * 1e6:9.1f} us/turn  ({legacy / persistent:.1f}x)")
+    print(f"  persistent run_async()  {native * 1e6:9.1f} us/turn  ({legacy / native:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Universal ADK Agent Starter Kit - Session Service Benchmark
+
+Creates --sessions sessions, appends --events events to each through a
+fresh session handle, then gets every session back, on ADK's
+InMemorySessionService and on src/core/sessions' SqliteSessionService
+(batched commits, and one commit per event). Reports
+operations per second for each phase and peak RSS; each service runs in its
+own process so RSS is per service.
+
+Requires google-adk.
+
+Usage:
+    python benchmarks/bench_session_service.py [--sessions 100000] [--events 4]
+"""
+
+import argparse
+import asyncio
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+SERVICES = ["in_memory", "sqlite", "sqlite_unbatched"]
+
+
+def make_service(name, db_path):
+    if name == "in_memory":
+        from google.adk.sessions import InMemorySessionService
+        return InMemorySessionService()
+    from core.sessions import SqliteSessionService
+    return SqliteSessionService(db_path, batch_size=1 if name == "sqlite_unbatched" else 256)
+
+
+def run_service(name, sessions, events_per_session):
+    """Benchmark one service in this process and return its timings."""
+    from google.adk.events.event import Event
+    from google.adk.events.event_actions import EventActions
+    from google.adk.sessions.session import Session
+    from google.genai import types
+
+    async def drive(service):
+        timings = {}
+        start = time.perf_counter()
+        # Only keys are kept, as a server handling independent requests would
+        created = []
+        for i in range(sessions):
+            session = await service.create_session(app_name="bench", user_id=f"user_{i % 1000}", state={"turn": 0})
+            created.append((session.user_id, session.id))
+        timings["create"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for turn in range(events_per_session):
+            for user_id, session_id in created:
+                session = Session(app_name="bench", user_id=user_id, id=session_id)
+                await service.append_event(session, Event(
+                    author="bench_agent",
+                    invocation_id=f"inv_{turn}",
+                    content=types.Content(role="model", parts=[types.Part(text=f"reply {turn}")]),
+                    actions=EventActions(state_delta={"turn": turn}),
+                ))
+        await service.flush()
+        timings["append"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for user_id, session_id in created:
+            await service.get_session(app_name="bench", user_id=user_id, session_id=session_id)
+        timings["get"] = time.perf_counter() - start
+        return timings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        service = make_service(name, str(Path(tmp) / "sessions.db"))
+        timings = asyncio.run(drive(service))
+        if hasattr(service, "close"):
+            service.close()
+    timings["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark session services at scale")
+    parser.add_argument("--sessions", type=int, default=100_000, help="Sessions to create (default: 100000)")
+    parser.add_argument("--events", type=int, default=4, help="Events appended per session (default: 4)")
+    parser.add_argument("--services", default=",".join(SERVICES),
+                        help=f"Services to benchmark (default: {','.join(SERVICES)})")
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sessions, {args.events} events each")
+    print(f"{'service':<18} {'create/s':>10} {'append/s':>10} {'get/s':>10} {'RSS MB':>8}")
+    for name in args.services.split(","):
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            timings = executor.submit(run_service, name, args.sessions, args.events).result()
+        print(f"{name:<18} {args.sessions / timings['create']:>10.0f} "
+              f"{args.sessions * args.events / timings['append']:>10.0f} "
+              f"{args.sessions / timings['get']:>10.0f} {timings['peak_rss_kb'] / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Universal ADK Agent Starter Kit - Template Rendering Benchmark
+
+Renders every file of the four AGENT_TYPES templates repeatedly and reports
+renders/sec for the original per-call regex implementation and for the
+compiled, cached template engine used by create_agent.py.
+
+Usage:
+    python benchmarks/bench_templates.py [--iterations 2000]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from create_agent import AGENT_TYPES, AgentCreator  # noqa: E402
+
+BENCH_CONFIG = {
+    "project": {
+        "project_id": "bench-project",
+        "location": "us-central1",
+        "namespace": "benchco",
+        "author_name": "Bench Author",
+        "author_email": "bench@example.com",
+    },
+    "agents": {"default_model": "gemini-2.0-flash", "use_vertex": True},
+    "deployment": {"target": "cloud_run", "enable_monitoring": True},
+    "features": {"enable_a2a": False, "enable_evaluation": True},
+}
+
+
+def legacy_process_template(template_vars, content, agent_name, agent_description=""):
+    """The pre-compilation implementation of AgentCreator.process_template."""
+    vars = template_vars.copy()
+    vars.update({
+        "agent_name": agent_name,
+        "agent_display_name": agent_name.replace("_", " ").title(),
+        "agent_description": agent_description or f"ADK agent for {agent_name}"
+    })
+
+    def replace_var(match):
+        var_expr = match.group(1)
+        if "|" in var_expr:
+            var_name, default_expr = var_expr.split("|", 1)
+            if default_expr.startswith("default:"):
+                default_value = default_expr[8:]
+                return vars.get(var_name.strip(), default_value)
+        return vars.get(var_expr.strip(), match.group(0))
+
+    return re.sub(r'\{\{([^}]+)\}\}', replace_var, content)
+
+
+def template_files(agent_type):
+    """List every file in an agent type's template tree."""
+    template_path = ROOT / AGENT_TYPES[agent_type]["template_path"]
+    return sorted(path for path in template_path.rglob("*") if path.is_file())
+
+
+def bench_legacy(creator, files, iterations):
+    """Read and render every file per iteration, as create_agent did before."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        for path in files:
+            legacy_process_template(
+                creator.template_vars, path.read_text(), f"agent_{i}"
+            )
+    return time.perf_counter() - start
+
+
+def bench_compiled(creator, files, iterations):
+    """Render every file per iteration through the compiled template cache."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        vars = creator.agent_template_vars(f"agent_{i}")
+        for path in files:
+            creator.templates.load(path).render(vars)
+    return time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark for every agent type."""
+    parser = argparse.ArgumentParser(description="Benchmark template rendering")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=2000,
+        help="Renders per agent type (default: 2000)"
+    )
+    args = parser.parse_args()
+
+    creator = AgentCreator(config=BENCH_CONFIG)
+
+    # Sanity check: both implementations must produce identical output
+    for agent_type in AGENT_TYPES:
+        vars = creator.agent_template_vars("check_agent")
+        for path in template_files(agent_type):
+            expected = legacy_process_template(
+                creator.template_vars, path.read_text(), "check_agent"
+            )
+            if creator.templates.load(path).render(vars) != expected:
+                print(f"ERROR: Rendered output differs for {path}")
+                sys.exit(1)
+
+    print(f"{'type':<8} {'files':>5} {'legacy r/s':>12} {'compiled r/s':>13} {'speedup':>8}")
+    for agent_type in AGENT_TYPES:
+        files = template_files(agent_type)
+        legacy = bench_legacy(creator, files, args.iterations)
+        compiled = bench_compiled(creator, files, args.iterations)
+        print(
+            f"{agent_type:<8} {len(files):>5} "
+            f"{args.iterations / legacy:>12.0f} "
+            f"{args.iterations / compiled:>13.0f} "
+            f"{legacy / compiled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
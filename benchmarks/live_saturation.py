@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Universal ADK Agent Starter Kit - Live Session Saturation Benchmark
+
+Runs increasing numbers of concurrent live (bidi-streaming) sessions against
+an agent whose live model is a LatencyMockModel, and reports time to first
+response, inter-chunk gaps, LiveRequestQueue depth and event-loop lag per
+level. Stops at the first level where p99 loop lag (or p99 time to first
+response, with --max-ttfr-ms) crosses its limit: that is where the event
+loop saturates.
+
+Each session speaks --audio-seconds of audio in 20 ms chunks, waits for the
+answer, thinks for --think-ms and repeats for --turns turns. One untimed
+session runs first so one-off setup costs stay out of the first level.
+
+Usage:
+    python benchmarks/live_saturation.py [--levels 1,8,32,128,512]
+                                         [--max-loop-lag-ms 50] [--max-ttfr-ms 800]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import warnings
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT / "tests")]
+
+DEFAULT_LEVELS = "1,8,32,128,512"
+
+
+def build_agent(latency_ms, chunk_delay_ms, chunks):
+    from google.adk.agents import LlmAgent
+
+    from testing import testing_utils
+
+    model = testing_utils.LatencyMockModel.create([f"chunk {i} " for i in range(chunks)])
+    model.time_to_first_chunk = testing_utils.LatencyDistribution.lognormal(latency_ms / 1000, 0.25)
+    model.chunk_delay = testing_utils.LatencyDistribution.fixed(chunk_delay_ms / 1000)
+    return LlmAgent(name="live_agent", model=model, instruction="Answer the user.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the live-session count that saturates the event loop")
+    parser.add_argument("--levels", default=DEFAULT_LEVELS,
+                        help=f"Concurrent session counts to try in order (default: {DEFAULT_LEVELS})")
+    parser.add_argument("--turns", type=int, default=3, help="Turns per session (default: 3)")
+    parser.add_argument("--audio-seconds", type=float, default=1.0,
+                        help="Seconds of audio per user turn (default: 1)")
+    parser.add_argument("--think-ms", type=float, default=200.0,
+                        help="Pause after each answer (default: 200)")
+    parser.add_argument("--latency-ms", type=float, default=300.0,
+                        help="Median mock time to first chunk (default: 300)")
+    parser.add_argument("--chunk-delay-ms", type=float, default=40.0,
+                        help="Mock delay between response chunks (default: 40)")
+    parser.add_argument("--chunks", type=int, default=10, help="Response chunks per turn (default: 10)")
+    parser.add_argument("--max-loop-lag-ms", type=float, default=50.0,
+                        help="p99 event-loop lag that counts as saturated (default: 50)")
+    parser.add_argument("--max-ttfr-ms", type=float,
+                        help="p99 time to first response that counts as saturated")
+    args = parser.parse_args(argv)
+
+    from testing import live_harness
+
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore", category=UserWarning)
+    agent = build_agent(args.latency_ms, args.chunk_delay_ms, args.chunks)
+    script = [
+        live_harness.AudioTurn(seconds=args.audio_seconds, think_time=args.think_ms / 1000)
+    ] * args.turns
+
+    saturated_at, reports = asyncio.run(live_harness.find_saturation(
+        agent,
+        script,
+        levels=[int(level) for level in args.levels.split(",") if level],
+        max_loop_lag=args.max_loop_lag_ms / 1000,
+        max_time_to_first_response=args.max_ttfr_ms / 1000 if args.max_ttfr_ms else None,
+    ))
+
+    print(f"{'sessions':>8} {'ttfr p50':>9} {'ttfr p99':>9} {'gap p99':>8} "
+          f"{'queue max':>9} {'lag p99':>8} {'errors':>6}")
+    for report in reports:
+        s = report.summary()
+        print(f"{s['sessions']:>8} {s['ttfr_p50_ms']:>9.1f} {s['ttfr_p99_ms']:>9.1f} "
+              f"{s['gap_p99_ms']:>8.1f} {s['queue_depth_max']:>9} {s['loop_lag_p99_ms']:>8.1f} "
+              f"{s['errors']:>6}")
+
+    if saturated_at is None:
+        print(f"\n✓ No saturation up to {reports[-1].sessions} sessions")
+    else:
+        print(f"\n⚠️  Event loop saturates at {saturated_at} concurrent live sessions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
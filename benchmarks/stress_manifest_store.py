@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Universal ADK Agent Starter Kit - A2A Manifest Store Stress Test
+
+Runs several processes that upsert overlapping agent names into one
+ManifestStore concurrently, then checks that no write was lost, no agent
+appears twice, and the exported YAML matches the store.
+
+Usage:
+    python benchmarks/stress_manifest_store.py [--writers 8] [--agents 200]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from multiprocessing import Process
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from create_agent import ManifestStore  # noqa: E402
+
+
+def writer(db_path, yaml_path, writer_id, agents):
+    """Upsert every agent name, tagging each entry with this writer's id."""
+    store = ManifestStore(db_path, yaml_path)
+    for index in range(agents):
+        store.upsert({
+            "name": f"agent_{index}",
+            "identity": f"stress.agent_{index}",
+            "writer": writer_id,
+        }, export=False)
+        # Writer-private names check that no insert is dropped; exporting
+        # periodically races YAML writes against the other processes
+        store.upsert(
+            {"name": f"writer_{writer_id}_agent_{index}", "writer": writer_id},
+            export=index % 25 == 0,
+        )
+    store.export_yaml()
+    store.close()
+
+
+def main():
+    """Run the stress test and exit non-zero on any inconsistency."""
+    parser = argparse.ArgumentParser(description="Stress test ManifestStore")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent processes")
+    parser.add_argument("--agents", type=int, default=200, help="Agents per writer")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "a2a_manifest.db"
+        yaml_path = Path(tmp) / "a2a_manifest.yaml"
+        # Create the schema before the writers race on it
+        ManifestStore(db_path, yaml_path).close()
+
+        start = time.perf_counter()
+        processes = [
+            Process(target=writer, args=(db_path, yaml_path, writer_id, args.agents))
+            for writer_id in range(args.writers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        if any(process.exitcode != 0 for process in processes):
+            print("ERROR: a writer process failed")
+            sys.exit(1)
+
+        store = ManifestStore(db_path, yaml_path)
+        entries = store.entries()
+        names = [entry["name"] for entry in entries]
+        expected = args.agents * (args.writers + 1)
+        with open(yaml_path) as f:
+            exported = yaml.safe_load(f)["agents"]
+        store.close()
+
+        errors = []
+        if len(names) != len(set(names)):
+            errors.append("duplicate agent names in store")
+        if len(names) != expected:
+            errors.append(f"expected {expected} agents, found {len(names)}")
+        if exported != entries:
+            errors.append("exported YAML does not match the store")
+
+        writes = args.writers * args.agents * 2
+        print(f"{writes} upserts from {args.writers} writers in {elapsed:.2f}s "
+              f"({writes / elapsed:.0f} upserts/sec)")
+        if errors:
+            for error in errors:
+                print(f"ERROR: {error}")
+            sys.exit(1)
+        print(f"✓ {len(names)} unique agents, YAML export consistent")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,16 @@ import shutil
 from pathlib import Path
 from string import Template
 import re
+import json
+import time
+import hashlib
+import sqlite3
+import stat
+import tempfile
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 
 AGENT_TYPES = {
     "simple": {
@@ -34,11 +44,431 @@ AGENT_TYPES = {
     }
 }
 
+# Matches {{variable}} and {{variable|default:value}} expressions
+TEMPLATE_VAR_PATTERN = re.compile(r'\{\{([^}]+)\}\}')
+
+
+# Thread pool size for --batch file writes
+DEFAULT_WORKERS = 8
+
+# Per-agent record of generated files, used by --update
+GENERATION_MANIFEST = ".generated.json"
+
+# A2A manifest: indexed store and the YAML view exported from it
+A2A_MANIFEST_DB = ".starter-kit/a2a_manifest.db"
+A2A_MANIFEST_YAML = "a2a_manifest.yaml"
+
+
+def content_hash(data):
+    """Return the SHA-256 hex digest of text or bytes."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _umask():
+    """Return the process umask (os.umask can only read it by setting it)."""
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def match_mode(tmp_path, path):
+    """Give a temp file the mode of the file it replaces, or the umask default.
+    
+    mkstemp creates files readable by their owner only, which would otherwise
+    carry over to every file renamed into place.
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_umask()
+    os.chmod(tmp_path, mode)
+
+
+class CompiledTemplate:
+    """A template parsed once into alternating literal and variable segments.
+
+    ``literals`` always holds one more entry than ``variables``; rendering
+    interleaves them, so the template text is never re-scanned.
+    """
+
+    __slots__ = ("literals", "variables", "digest")
+
+    def __init__(self, content):
+        self.digest = content_hash(content)
+        self.literals = []
+        self.variables = []
+        position = 0
+        for match in TEMPLATE_VAR_PATTERN.finditer(content):
+            self.literals.append(content[position:match.start()])
+            self.variables.append(self._parse_expression(match))
+            position = match.end()
+        self.literals.append(content[position:])
+
+    @staticmethod
+    def _parse_expression(match):
+        """Return the (lookup key, fallback) pair for a variable expression."""
+        var_expr = match.group(1)
+        if "|" in var_expr:
+            # Handle default values: {{var|default:value}}
+            var_name, default_expr = var_expr.split("|", 1)
+            if default_expr.startswith("default:"):
+                return var_name.strip(), default_expr[8:]
+        # Unknown variables are left untouched in the output
+        return var_expr.strip(), match.group(0)
+
+    def render(self, vars):
+        """Render the template with the given variables."""
+        if not self.variables:
+            return self.literals[0]
+        literals = self.literals
+        parts = [literals[0]]
+        for index, (name, fallback) in enumerate(self.variables, 1):
+            parts.append(vars.get(name, fallback))
+            parts.append(literals[index])
+        return "".join(parts)
+
+
+@lru_cache(maxsize=256)
+def compile_template(content):
+    """Compile template text, reusing the result for identical content."""
+    return CompiledTemplate(content)
+
+
+class TemplateCache:
+    """Compiled templates keyed by file path, invalidated on mtime/size change."""
+
+    def __init__(self):
+        self._entries = {}
+        self._trees = {}
+
+    def load(self, path):
+        """Return the compiled template for ``path``, compiling it if stale."""
+        path = Path(path)
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(path)
+        if entry is None or entry[0] != stamp:
+            entry = (stamp, compile_template(path.read_text()))
+            self._entries[path] = entry
+        return entry[1]
+    
+    def list_tree(self, template_path):
+        """Return (template file, relative destination) pairs for a template tree.
+        
+        The tree is scanned once per process and reused for every agent.
+        """
+        template_path = Path(template_path)
+        tree = self._trees.get(template_path)
+        if tree is None:
+            tree = []
+            self._scan_tree(template_path, Path(), tree)
+            self._trees[template_path] = tree
+        return tree
+    
+    def _scan_tree(self, directory, relative, tree):
+        """Recursively collect template files below ``directory``."""
+        for item in sorted(directory.iterdir()):
+            if item.is_file():
+                # Determine destination filename
+                dest_name = item.name
+                if dest_name.endswith('.template'):
+                    dest_name = dest_name[:-9]  # Remove .template suffix
+                tree.append((item, relative / dest_name))
+            elif item.is_dir():
+                self._scan_tree(item, relative / item.name, tree)
+
+
+class StagingArea:
+    """Files rendered in memory and written to disk in one batch.
+    
+    ``commit`` first writes everything to staging locations next to the final
+    paths, and only renames them into place once every write has succeeded:
+    a directory that does not exist yet (such as a new agent package) is
+    staged as a hidden temp dir and renamed as a whole, while files going
+    into existing directories get a temp file each. A failure at any point
+    removes all staged output and restores the files already replaced, so
+    the tree is left as it was.
+    """
+    
+    def __init__(self):
+        self._files = {}
+    
+    def add(self, path, content):
+        """Stage ``content`` for ``path``; a later add for the same path wins."""
+        self._files[Path(path)] = content
+    
+    def extend(self, files):
+        """Stage several (path, content) pairs."""
+        for path, content in files:
+            self.add(path, content)
+    
+    def __len__(self):
+        return len(self._files)
+    
+    def paths(self):
+        """Return staged paths in the order they were added."""
+        return list(self._files)
+    
+    def print_plan(self, action="create"):
+        """Print the planned file set with byte counts (for --dry-run)."""
+        total = 0
+        for path, content in self._files.items():
+            size = len(content.encode("utf-8"))
+            total += size
+            print(f"  Would {action}: {path} ({size} bytes)")
+        print(f"  {len(self._files)} files, {total} bytes")
+    
+    def commit(self, executor=None):
+        """Write all staged files, atomically renaming them into place."""
+        staging_dirs = {}   # new directory -> its hidden staging directory
+        staged_files = []   # (temp path, final path) for existing directories
+        writes = []         # (staging path, content)
+        
+        try:
+            for path, content in self._files.items():
+                new_root = self._new_root(path)
+                if new_root is None:
+                    fd, tmp_name = tempfile.mkstemp(
+                        dir=path.parent, prefix=f".{path.name}.", suffix=".staging"
+                    )
+                    os.close(fd)
+                    match_mode(tmp_name, path)
+                    staged_files.append((Path(tmp_name), path))
+                    writes.append((Path(tmp_name), content))
+                else:
+                    if new_root not in staging_dirs:
+                        staging_dirs[new_root] = new_root.parent / (
+                            f".{new_root.name}.staging-{uuid.uuid4().hex[:8]}"
+                        )
+                    staged = staging_dirs[new_root] / path.relative_to(new_root)
+                    writes.append((staged, content))
+            
+            for directory in {staged.parent for staged, _ in writes}:
+                directory.mkdir(parents=True, exist_ok=True)
+            if executor is None:
+                for staged, content in writes:
+                    staged.write_text(content)
+            else:
+                list(executor.map(lambda item: item[0].write_text(item[1]), writes))
+        except BaseException:
+            self._discard(staging_dirs.values(), staged_files)
+            raise
+        
+        # Every byte is on disk; move the staged output into place
+        renamed = []
+        replaced = []   # (final path, backup of its old content or None)
+        try:
+            for new_root, staging_dir in list(staging_dirs.items()):
+                os.rename(staging_dir, new_root)
+                renamed.append(new_root)
+                del staging_dirs[new_root]
+            for tmp_path, path in staged_files:
+                backup = self._backup(path)
+                try:
+                    os.replace(tmp_path, path)
+                except BaseException:
+                    if backup is not None:
+                        backup.unlink()
+                    raise
+                replaced.append((path, backup))
+        except BaseException:
+            self._restore(replaced)
+            self._discard(list(staging_dirs.values()) + renamed, staged_files)
+            raise
+        for _, backup in replaced:
+            if backup is not None:
+                backup.unlink()
+    
+    @staticmethod
+    def _new_root(path):
+        """Return the topmost missing ancestor directory of ``path``, if any."""
+        new_root = None
+        for parent in path.parents:
+            if parent.exists():
+                break
+            new_root = parent
+        return new_root
+    
+    @staticmethod
+    def _backup(path):
+        """Hard-link an existing file aside so a failed commit can restore it."""
+        if not path.exists():
+            return None
+        backup = path.parent / f".{path.name}.backup-{uuid.uuid4().hex[:8]}"
+        try:
+            os.link(path, backup)
+        except OSError:
+            shutil.copy2(path, backup)
+        return backup
+    
+    @staticmethod
+    def _restore(replaced):
+        """Put back the files a failed commit had already replaced."""
+        for path, backup in reversed(replaced):
+            if backup is None:
+                path.unlink(missing_ok=True)
+            else:
+                os.replace(backup, path)
+    
+    @staticmethod
+    def _discard(directories, staged_files):
+        """Remove staging directories and temp files after a failed commit."""
+        for directory in directories:
+            shutil.rmtree(directory, ignore_errors=True)
+        for tmp_path, _ in staged_files:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+
+class ManifestStore:
+    """A2A manifest entries indexed by agent name in a SQLite file.
+    
+    Upserts run in an IMMEDIATE transaction, so concurrent writers (e.g. two
+    ``make new-agent`` runs) are serialized by SQLite's file lock instead of
+    overwriting each other. The YAML manifest is a view exported on demand;
+    it is written to a temp file and renamed into place while the write lock
+    is held, so readers never see a partial file.
+    
+    The hash of the YAML last written is kept in the ``meta`` table. If the
+    file no longer matches it (someone edited it by hand, say), its entries
+    are merged back into the store at the start of the next transaction, so
+    the next export does not drop them.
+    """
+    
+    def __init__(self, db_path=A2A_MANIFEST_DB, yaml_path=A2A_MANIFEST_YAML):
+        self.db_path = Path(db_path)
+        self.yaml_path = Path(yaml_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Autocommit mode; transactions are managed explicitly below
+        self._conn = sqlite3.connect(str(self.db_path), timeout=60, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS agents ("
+            " name TEXT PRIMARY KEY,"
+            " position INTEGER NOT NULL,"
+            " entry TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        with self._write_transaction():
+            self._import_yaml()
+    
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+    
+    def get(self, name):
+        """Return the manifest entry for an agent, or None."""
+        row = self._conn.execute(
+            "SELECT entry FROM agents WHERE name = ?", (name,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def entries(self):
+        """Return all entries in first-insertion order."""
+        rows = self._conn.execute("SELECT entry FROM agents ORDER BY position")
+        return [json.loads(entry) for (entry,) in rows]
+    
+    def upsert(self, entry, export=True):
+        """Insert or replace the entry for ``entry["name"]``."""
+        self.upsert_many([entry], export=export)
+    
+    def upsert_many(self, entries, export=True):
+        """Insert or replace several entries in one transaction.
+        
+        An agent keeps its original position in the manifest when updated.
+        """
+        with self._write_transaction():
+            self._import_yaml()
+            self._insert(entries)
+            if export:
+                self._write_yaml(self.yaml_path)
+    
+    def export_yaml(self, path=None):
+        """Write the YAML view of the manifest and return its path."""
+        path = Path(path) if path else self.yaml_path
+        with self._write_transaction():
+            self._import_yaml()
+            self._write_yaml(path)
+        return path
+    
+    @contextmanager
+    def _write_transaction(self):
+        """Run the enclosed statements in a transaction holding the write lock."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+    
+    def _write_yaml(self, path):
+        """Atomically replace ``path`` with the current manifest."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = yaml.dump({"agents": self.entries()}, default_flow_style=False)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            match_mode(tmp_name, path)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        if path == self.yaml_path:
+            self._set_yaml_hash(content_hash(data))
+    
+    def _insert(self, entries):
+        """Insert or replace entries; new agents go to the end of the manifest."""
+        self._conn.executemany(
+            "INSERT INTO agents (name, position, entry) VALUES"
+            " (?, (SELECT COALESCE(MAX(position), 0) + 1 FROM agents), ?)"
+            " ON CONFLICT(name) DO UPDATE SET entry = excluded.entry",
+            [(entry["name"], json.dumps(entry, sort_keys=True)) for entry in entries],
+        )
+    
+    def _set_yaml_hash(self, digest):
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('yaml_hash', ?)"
+            " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (digest,),
+        )
+    
+    def _import_yaml(self):
+        """Merge the YAML manifest into the store if it changed since it was written.
+        
+        Runs inside a write transaction. Entries in the YAML win over stored
+        ones with the same name.
+        """
+        if not self.yaml_path.exists():
+            return
+        data = self.yaml_path.read_bytes()
+        digest = content_hash(data)
+        row = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'yaml_hash'"
+        ).fetchone()
+        if row and row[0] == digest:
+            return
+        manifest = yaml.safe_load(data) or {}
+        # Older manifests may list an agent twice; the last entry wins
+        self._insert(
+            entry for entry in manifest.get("agents") or [] if entry.get("name")
+        )
+        self._set_yaml_hash(digest)
+
+
 class AgentCreator:
-    def __init__(self, config_file="starter-kit.yaml"):
+    def __init__(self, config_file="starter-kit.yaml", config=None):
         """Initialize the agent creator with configuration."""
-        self.config = self.load_config(config_file)
+        self.config = config if config is not None else self.load_config(config_file)
         self.template_vars = self.build_template_vars()
+        self.templates = TemplateCache()
     
     def load_config(self, config_file):
         """Load configuration from YAML file."""
@@ -52,6 +482,9 @@ class AgentCreator:
     
     def build_template_vars(self):
         """Build template variables from configuration."""
+        response_cache = self.config.get("features", {}).get("response_cache") or {}
+        agent_defaults = self.config.get("agent_defaults") or {}
+        history = agent_defaults.get("history") or {}
         return {
             "project_id": self.config["project"]["project_id"],
             "location": self.config["project"]["location"],
@@ -60,43 +493,140 @@ class AgentCreator:
             "author_email": self.config["project"]["author_email"],
             "model_name": self.config["agents"]["default_model"],
             "use_vertex": str(self.config["agents"]["use_vertex"]).lower(),
+            # Rendered as Python literals into the tool_agent template
+            "response_cache_enabled": str(bool(response_cache.get("enabled", False))),
+            "response_cache_ttl_seconds": str(response_cache.get("ttl_seconds", 300)),
+            "response_cache_max_entries": str(response_cache.get("max_entries", 1024)),
+            "response_cache_shared_store": response_cache.get("shared_store") or "",
+            "history_policy": history.get("policy", "off"),
+            "history_max_tokens": str(history.get("max_tokens") or agent_defaults.get("max_tokens", 2048)),
+            "history_max_events": str(history.get("max_events") or 0),
+            "history_summary_tokens": str(history.get("summary_tokens", 256)),
         }
     
-    def process_template(self, content, agent_name, agent_description=""):
-        """Process template content with variables."""
-        # Add agent-specific variables
-        vars = self.template_vars.copy()
+    def agent_template_vars(self, agent_name, agent_description=""):
+        """Build the full variable set for rendering one agent's templates."""
+        vars = dict(self.template_vars)
         vars.update({
             "agent_name": agent_name,
             "agent_display_name": agent_name.replace("_", " ").title(),
             "agent_description": agent_description or f"ADK agent for {agent_name}"
         })
-        
-        # Process {{variable}} style templates
-        def replace_var(match):
-            var_expr = match.group(1)
-            if "|" in var_expr:
-                # Handle default values: {{var|default:value}}
-                var_name, default_expr = var_expr.split("|", 1)
-                if default_expr.startswith("default:"):
-                    default_value = default_expr[8:]
-                    return vars.get(var_name.strip(), default_value)
-            return vars.get(var_expr.strip(), match.group(0))
-        
-        content = re.sub(r'\{\{([^}]+)\}\}', replace_var, content)
-        return content
-    
-    def create_agent(self, agent_type, agent_name, agent_description=""):
+        return vars
+    
+    def process_template(self, content, agent_name, agent_description=""):
+        """Process template content with variables."""
+        vars = self.agent_template_vars(agent_name, agent_description)
+        return compile_template(content).render(vars)
+    
+    def create_agent(self, agent_type, agent_name, agent_description="", dry_run=False):
         """Create a new agent from template."""
+        plan = self._plan_agent(agent_type, agent_name, agent_description)
+        if plan is None:
+            return False
+        
+        print(f"Creating {agent_type} agent: {agent_name}")
+        print(f"Destination: {plan['dest_path']}")
+        
+        # Stage agent, test and deployment files, then write them in one batch
+        staging = StagingArea()
+        staging.extend(plan["files"] + plan["deploy_files"])
+        if dry_run:
+            staging.print_plan()
+            return True
+        if not self._commit(staging):
+            return False
+        
+        # Update A2A manifest if enabled
+        if self.config["features"].get("enable_a2a", False):
+            self._update_a2a_manifest([agent_name])
+        
+        print(f"\n✓ Agent {agent_name} created successfully!")
+        print(f"\nNext steps:")
+        print(f"1. cd src/{self.config['project']['namespace']}/agents/{agent_name}")
+        print(f"2. Review and customize agent.py and prompt.py")
+        print(f"3. Add any custom tools in tools.py")
+        print(f"4. Run: adk run {agent_name}")
+        
+        return True
+    
+    def create_agents(self, specs, workers=DEFAULT_WORKERS, timings=None, dry_run=False):
+        """Create several agents in one process, sharing config and templates.
+        
+        All agents are rendered first, then committed in one staged batch
+        written through a thread pool. The A2A manifest is updated once at
+        the end.
+        """
+        timings = dict(timings or {})
+        
+        # Phase 1: validate and render every agent in memory
+        start = time.perf_counter()
+        plans = []
+        seen = set()
+        failed = 0
+        for spec in specs:
+            agent_name = spec.get("name", "")
+            if agent_name in seen:
+                print(f"ERROR: Agent {agent_name} is listed more than once in the batch")
+                failed += 1
+                continue
+            seen.add(agent_name)
+            plan = self._plan_agent(
+                spec.get("type", ""), agent_name, spec.get("description", "")
+            )
+            if plan is None:
+                failed += 1
+                continue
+            plans.append(plan)
+        timings["render"] = time.perf_counter() - start
+        
+        # Phase 2: stage agent, test and deployment files for the whole batch
+        staging = StagingArea()
+        for plan in plans:
+            staging.extend(plan["files"])
+        for plan in plans:
+            staging.extend(plan["deploy_files"])
+        if dry_run:
+            staging.print_plan()
+            return failed == 0
+        
+        # Phase 3: write everything concurrently, then rename into place
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if not self._commit(staging, executor=executor, verbose=False):
+                return False
+        timings["write"] = time.perf_counter() - start
+        
+        # Phase 4: A2A manifest, once for the whole batch
+        start = time.perf_counter()
+        if plans and self.config["features"].get("enable_a2a", False):
+            self._update_a2a_manifest([plan["agent_name"] for plan in plans])
+        timings["a2a manifest"] = time.perf_counter() - start
+        
+        for plan in plans:
+            print(f"  ✓ {plan['agent_type']} agent {plan['agent_name']} -> {plan['dest_path']}")
+        
+        print(f"\nBatch complete: {len(plans)} created, {failed} failed, {len(staging)} files written")
+        print_timings(timings)
+        
+        return failed == 0
+    
+    def _plan_agent(self, agent_type, agent_name, agent_description="", previous=None):
+        """Validate an agent request and render all of its files in memory.
+        
+        With ``previous`` (an existing generation manifest) the agent is
+        expected to exist, and template files whose template and variables
+        are unchanged are not re-rendered: their content is left as None.
+        """
         if agent_type not in AGENT_TYPES:
             print(f"ERROR: Unknown agent type '{agent_type}'")
             print(f"Available types: {', '.join(AGENT_TYPES.keys())}")
-            return False
+            return None
         
         # Validate agent name
         if not re.match(r'^[a-z][a-z0-9_]*$', agent_name):
             print(f"ERROR: Agent name must be lowercase with underscores only (e.g., my_agent)")
-            return False
+            return None
         
         template_info = AGENT_TYPES[agent_type]
         template_path = Path(template_info["template_path"])
@@ -104,67 +634,218 @@ class AgentCreator:
         if not template_path.exists():
             print(f"ERROR: Template directory {template_path} not found.")
             print("Please run extract.py first to extract templates from source repositories.")
-            return False
+            return None
         
         # Create destination path
         dest_path = Path(f"src/{self.config['project']['namespace']}/agents/{agent_name}")
         
-        if dest_path.exists():
+        if previous is None and dest_path.exists():
             print(f"ERROR: Agent {agent_name} already exists at {dest_path}")
-            return False
+            print("Use --update to re-render it from the current templates.")
+            return None
         
-        print(f"Creating {agent_type} agent: {agent_name}")
-        print(f"Destination: {dest_path}")
+        files = []
+        deploy_files = []
+        sources = {}
+        vars = self.agent_template_vars(agent_name, agent_description)
+        self._copy_template(template_path, dest_path, vars, files, sources, previous)
+        self._create_init_file(dest_path, files)
+        self._create_test_files(agent_name, files)
+        self._create_deployment_files(agent_name, deploy_files)
         
-        # Copy template files
-        self._copy_template(template_path, dest_path, agent_name, agent_description)
+        # Later entries win (e.g. the generated __init__.py over a template one),
+        # and each path must appear once so pooled writes cannot race.
+        files = list(dict(files).items())
         
-        # Create additional files
-        self._create_init_file(dest_path)
-        self._create_deployment_files(agent_name)
-        self._create_test_files(agent_name)
+        plan = {
+            "agent_type": agent_type,
+            "agent_name": agent_name,
+            "agent_description": agent_description,
+            "dest_path": dest_path,
+            "variables": vars,
+            "sources": sources,
+            "files": files,
+            "deploy_files": deploy_files,
+        }
+        if previous is None:
+            records = {
+                path.as_posix(): self._file_record(plan, path, content)
+                for path, content in files + deploy_files
+            }
+            files.append(self._generation_manifest(plan, records))
+        return plan
+    
+    def update_agents(self, agent_names=None, dry_run=False):
+        """Re-render existing agents, rewriting only files whose inputs changed.
         
-        # Update A2A manifest if enabled
-        if self.config["features"].get("enable_a2a", False):
-            self._update_a2a_manifest(agent_name)
+        Files edited by hand since they were generated are left untouched.
+        Without ``agent_names`` every agent with a generation manifest is updated.
+        """
+        agents_dir = Path(f"src/{self.config['project']['namespace']}/agents")
+        if agent_names is None:
+            agent_names = sorted(
+                manifest.parent.name
+                for manifest in agents_dir.glob(f"*/{GENERATION_MANIFEST}")
+            )
         
-        print(f"\n✓ Agent {agent_name} created successfully!")
-        print(f"\nNext steps:")
-        print(f"1. cd src/{self.config['project']['namespace']}/agents/{agent_name}")
-        print(f"2. Review and customize agent.py and prompt.py")
-        print(f"3. Add any custom tools in tools.py")
-        print(f"4. Run: adk run {agent_name}")
+        totals = {"updated": 0, "unchanged": 0, "skipped": 0}
+        failed = 0
+        for agent_name in agent_names:
+            counts = self._update_agent(agents_dir / agent_name, agent_name, dry_run)
+            if counts is None:
+                failed += 1
+                continue
+            for status, count in counts.items():
+                totals[status] += count
+        
+        print(
+            f"\nUpdate complete: {totals['updated']} files updated, "
+            f"{totals['unchanged']} unchanged, {totals['skipped']} skipped"
+            + (f", {failed} agents failed" if failed else "")
+        )
+        return failed == 0
+    
+    def _update_agent(self, dest_path, agent_name, dry_run=False):
+        """Update one agent from its generation manifest; return status counts."""
+        manifest_file = dest_path / GENERATION_MANIFEST
+        if not manifest_file.exists():
+            print(f"ERROR: No {GENERATION_MANIFEST} found for agent {agent_name} at {dest_path}")
+            print("Only agents generated by this version of create_agent.py can be updated.")
+            return None
+        
+        previous = self._read_generation_manifest(manifest_file)
+        if previous is None:
+            print(f"Skipping agent {agent_name}.")
+            return None
+        
+        plan = self._plan_agent(
+            previous.get("agent_type"),
+            agent_name,
+            previous.get("agent_description", ""),
+            previous=previous,
+        )
+        if plan is None:
+            return None
+        
+        print(f"Updating {plan['agent_type']} agent: {agent_name}")
+        counts = {"updated": 0, "unchanged": 0, "skipped": 0}
+        staging = StagingArea()
+        previous_files = previous.get("files", {})
+        records = {}
+        
+        for path, content in plan["files"] + plan["deploy_files"]:
+            key = path.as_posix()
+            old = previous_files.get(key)
+            if content is None:
+                # Template and variables unchanged: keep the recorded output
+                records[key] = old
+                counts["unchanged"] += 1
+                continue
+            
+            record = self._file_record(plan, path, content)
+            if old and old["output_hash"] == record["output_hash"]:
+                records[key] = record
+                counts["unchanged"] += 1
+            elif old and not path.exists():
+                # Deleted by the user since it was generated
+                records[key] = old
+                counts["skipped"] += 1
+                print(f"  Skipped (deleted locally): {path}")
+            elif path.exists() and content_hash(path.read_bytes()) not in (
+                old["output_hash"] if old else None,
+                record["output_hash"],
+            ):
+                # Edited by the user since it was generated
+                records[key] = old or record
+                counts["skipped"] += 1
+                print(f"  Skipped (modified locally): {path}")
+            else:
+                staging.add(path, content)
+                records[key] = record
+                counts["updated"] += 1
+        
+        if dry_run:
+            staging.print_plan(action="update")
+            return counts
         
+        # Commit the changed files together with the refreshed manifest
+        updated = staging.paths()
+        staging.add(*self._generation_manifest(plan, records))
+        if not self._commit(staging, verbose=False):
+            return None
+        for path in updated:
+            print(f"  Updated: {path}")
+        return counts
+    
+    def _read_generation_manifest(self, manifest_file):
+        """Load a generation manifest; return None if it is malformed."""
+        try:
+            with open(manifest_file, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Could not read {manifest_file}: {e}")
+            return None
+        if (
+            not isinstance(manifest, dict)
+            or not isinstance(manifest.get("agent_type"), str)
+            or not isinstance(manifest.get("files", {}), dict)
+        ):
+            print(f"ERROR: {manifest_file} is malformed (expected an object with agent_type)")
+            return None
+        return manifest
+    
+    def _file_record(self, plan, path, content):
+        """Describe how a generated file was produced."""
+        template_file, template_hash = plan["sources"].get(path, (None, None))
+        return {
+            "template": template_file.as_posix() if template_file else None,
+            "template_hash": template_hash,
+            "output_hash": content_hash(content),
+        }
+    
+    def _generation_manifest(self, plan, records):
+        """Build the (path, content) pair for an agent's generation manifest."""
+        manifest = {
+            "agent_type": plan["agent_type"],
+            "agent_name": plan["agent_name"],
+            "agent_description": plan["agent_description"],
+            "variables": plan["variables"],
+            "files": records,
+        }
+        manifest_path = plan["dest_path"] / GENERATION_MANIFEST
+        return manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    
+    def _commit(self, staging, executor=None, verbose=True):
+        """Commit staged files, reporting failures instead of raising."""
+        try:
+            staging.commit(executor=executor)
+        except OSError as e:
+            print(f"ERROR: Failed to write files, nothing was changed: {e}")
+            return False
+        
+        if verbose:
+            for path in staging.paths():
+                print(f"  Created: {path}")
         return True
     
-    def _copy_template(self, template_path, dest_path, agent_name, agent_description):
-        """Copy and process template files."""
-        dest_path.mkdir(parents=True, exist_ok=True)
+    def _copy_template(self, template_path, dest_path, vars, files, sources, previous=None):
+        """Render template files into the pending file list."""
+        unchanged_vars = previous is not None and previous.get("variables") == vars
+        previous_files = previous.get("files", {}) if previous else {}
         
-        for item in template_path.iterdir():
-            if item.is_file():
-                # Read template file
-                content = item.read_text()
-                
-                # Process template variables
-                content = self.process_template(content, agent_name, agent_description)
-                
-                # Determine destination filename
-                dest_name = item.name
-                if dest_name.endswith('.template'):
-                    dest_name = dest_name[:-9]  # Remove .template suffix
-                
-                # Write processed file
-                dest_file = dest_path / dest_name
-                dest_file.write_text(content)
-                print(f"  Created: {dest_file}")
+        for template_file, relative_dest in self.templates.list_tree(template_path):
+            path = dest_path / relative_dest
+            template = self.templates.load(template_file)
+            sources[path] = (template_file, template.digest)
             
-            elif item.is_dir():
-                # Recursively copy directories
-                dest_subdir = dest_path / item.name
-                self._copy_template(item, dest_subdir, agent_name, agent_description)
+            # Skip rendering when neither the template nor its inputs changed
+            record = previous_files.get(path.as_posix())
+            if unchanged_vars and record and record.get("template_hash") == template.digest:
+                files.append((path, None))
+            else:
+                files.append((path, template.render(vars)))
     
-    def _create_init_file(self, agent_path):
+    def _create_init_file(self, agent_path, files):
         """Create __init__.py file for the agent package."""
         init_content = f'''# Agent package initialization
 # Extracted and configured by Universal ADK Agent Starter Kit
@@ -173,14 +854,11 @@ from .agent import root_agent
 
 __all__ = ["root_agent"]
 '''
-        init_file = agent_path / "__init__.py"
-        init_file.write_text(init_content)
-        print(f"  Created: {init_file}")
+        files.append((agent_path / "__init__.py", init_content))
     
-    def _create_deployment_files(self, agent_name):
+    def _create_deployment_files(self, agent_name, files):
         """Create deployment configuration for the agent."""
         deploy_dir = Path(f"deployment/agents/{agent_name}")
-        deploy_dir.mkdir(parents=True, exist_ok=True)
         
         # Create deployment configuration
         deploy_config = {
@@ -191,15 +869,12 @@ __all__ = ["root_agent"]
             "enable_monitoring": self.config["deployment"]["enable_monitoring"]
         }
         
-        deploy_file = deploy_dir / "deploy.yaml"
-        with open(deploy_file, 'w') as f:
-            yaml.dump(deploy_config, f, default_flow_style=False)
-        print(f"  Created: {deploy_file}")
+        deploy_content = yaml.dump(deploy_config, default_flow_style=False)
+        files.append((deploy_dir / "deploy.yaml", deploy_content))
     
-    def _create_test_files(self, agent_name):
+    def _create_test_files(self, agent_name, files):
         """Create test files for the agent."""
         test_dir = Path(f"tests/agents/{agent_name}")
-        test_dir.mkdir(parents=True, exist_ok=True)
         
         # Create test file
         test_content = f'''# Test suite for {agent_name} agent
@@ -235,10 +910,32 @@ def test_{agent_name}_tools():
     # Add specific tool tests based on agent type
 '''
         
-        test_file = test_dir / f"test_{agent_name}.py"
-        test_file.write_text(test_content)
-        print(f"  Created: {test_file}")
-        
+        files.append((test_dir / f"test_{agent_name}.py", test_content))
+
+        # Create benchmark stub, run through benchmarks/agent_throughput.py
+        bench_content = f'''# Throughput benchmark for {agent_name} agent
+# Generated by Universal ADK Agent Starter Kit
+#
+# Runs the agent with mock models at 1, 8, 64 and 512 concurrent sessions:
+#   python tests/agents/{agent_name}/bench_{agent_name}.py --update-baseline
+#   python tests/agents/{agent_name}/bench_{agent_name}.py --threshold 0.2
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.agent_throughput import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main([
+        "--agent", "{self.config['project']['namespace']}.agents.{agent_name}:root_agent",
+        "--name", "{agent_name}",
+    ] + sys.argv[1:]))
+'''
+        files.append((test_dir / f"bench_{agent_name}.py", bench_content))
+
         # Create evalset file if evaluation is enabled
         if self.config["features"].get("enable_evaluation", True):
             evalset = {
@@ -259,33 +956,60 @@ def test_{agent_name}_tools():
                 ]
             }
             
-            evalset_file = test_dir / f"{agent_name}_eval.json"
-            import json
-            with open(evalset_file, 'w') as f:
-                json.dump(evalset, f, indent=2)
-            print(f"  Created: {evalset_file}")
+            evalset_content = json.dumps(evalset, indent=2)
+            files.append((test_dir / f"{agent_name}_eval.json", evalset_content))
     
-    def _update_a2a_manifest(self, agent_name):
-        """Update A2A manifest with new agent."""
-        manifest_file = Path("a2a_manifest.yaml")
-        
-        if manifest_file.exists():
-            with open(manifest_file, 'r') as f:
-                manifest = yaml.safe_load(f) or {"agents": []}
-        else:
-            manifest = {"agents": []}
-        
-        # Add new agent
-        manifest["agents"].append({
-            "name": agent_name,
-            "identity": f"{self.config['project']['namespace']}.{agent_name}",
-            "endpoint": f"https://{agent_name}-{self.config['project']['project_id']}.a.run.app",
-            "status": "pending_deployment"
-        })
-        
-        with open(manifest_file, 'w') as f:
-            yaml.dump(manifest, f, default_flow_style=False)
-        print(f"  Updated: {manifest_file}")
+    def _update_a2a_manifest(self, agent_names):
+        """Upsert new agents into the A2A manifest store and export the YAML view."""
+        store = ManifestStore()
+        try:
+            store.upsert_many([
+                {
+                    "name": agent_name,
+                    "identity": f"{self.config['project']['namespace']}.{agent_name}",
+                    "endpoint": f"https://{agent_name}-{self.config['project']['project_id']}.a.run.app",
+                    "status": "pending_deployment"
+                }
+                for agent_name in agent_names
+            ])
+        finally:
+            store.close()
+        print(f"  Updated: {store.yaml_path}")
+
+
+def load_batch_file(batch_file):
+    """Load agent specs from a batch manifest.
+    
+    The manifest is either a list of {type, name, description} entries or a
+    mapping with an ``agents`` list and optional ``defaults`` applied to each.
+    """
+    if not Path(batch_file).exists():
+        print(f"ERROR: Batch file {batch_file} not found.")
+        sys.exit(1)
+    
+    with open(batch_file, 'r') as f:
+        data = yaml.safe_load(f) or {}
+    
+    if isinstance(data, list):
+        data = {"agents": data}
+    
+    defaults = data.get("defaults") or {}
+    agents = data.get("agents")
+    if not isinstance(agents, list):
+        print(f"ERROR: Batch file {batch_file} must contain an 'agents' list.")
+        sys.exit(1)
+    
+    return [{**defaults, **spec} for spec in agents]
+
+
+def print_timings(timings):
+    """Print a per-phase timing summary."""
+    total = sum(timings.values())
+    print("\nTiming summary:")
+    for phase, seconds in timings.items():
+        print(f"  {phase:<14} {seconds * 1000:>10.1f} ms")
+    print(f"  {'total':<14} {total * 1000:>10.1f} ms")
+
 
 def main():
     """Main entry point."""
@@ -295,12 +1019,10 @@ def main():
     parser.add_argument(
         "--type",
         choices=list(AGENT_TYPES.keys()),
-        required=True,
         help="Type of agent to create"
     )
     parser.add_argument(
         "--name",
-        required=True,
         help="Name of the agent (lowercase with underscores)"
     )
     parser.add_argument(
@@ -313,12 +1035,66 @@ def main():
         default="starter-kit.yaml",
         help="Configuration file (default: starter-kit.yaml)"
     )
+    parser.add_argument(
+        "--batch",
+        metavar="AGENTS_YAML",
+        help="Create every agent listed in a batch manifest file"
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Re-render existing agents (--name, or all) from the current templates"
+    )
+    parser.add_argument(
+        "--export-manifest",
+        action="store_true",
+        help=f"Export {A2A_MANIFEST_YAML} from the A2A manifest store and exit"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the files that would be written, with byte counts, and exit"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Thread pool size for --batch writes (default: {DEFAULT_WORKERS})"
+    )
     
     args = parser.parse_args()
     
-    # Create agent
-    creator = AgentCreator(args.config)
-    success = creator.create_agent(args.type, args.name, args.description)
+    if args.export_manifest:
+        store = ManifestStore()
+        print(f"Exported: {store.export_yaml()}")
+        store.close()
+        return
+    
+    if not args.batch and not args.update and not (args.type and args.name):
+        parser.error("--type and --name are required unless --batch or --update is given")
+    
+    if args.update:
+        creator = AgentCreator(args.config)
+        if args.batch:
+            agent_names = [spec.get("name", "") for spec in load_batch_file(args.batch)]
+        else:
+            agent_names = [args.name] if args.name else None
+        success = creator.update_agents(agent_names, dry_run=args.dry_run)
+    elif args.batch:
+        # Load config and batch manifest once for every agent
+        start = time.perf_counter()
+        creator = AgentCreator(args.config)
+        specs = load_batch_file(args.batch)
+        timings = {"load config": time.perf_counter() - start}
+        success = creator.create_agents(
+            specs, workers=args.workers, timings=timings, dry_run=args.dry_run
+        )
+    else:
+        # Create agent
+        creator = AgentCreator(args.config)
+        success = creator.create_agent(
+            args.type, args.name, args.description, dry_run=args.dry_run
+        )
     
     if not success:
         sys.exit(1)
@@ -11,10 +11,28 @@ Every extracted file includes proper attribution to its source.
 
 import os
 import re
+import sys
 import json
+import time
+import hashlib
+import argparse
+import threading
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import shutil
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
+
+# Default worker pool size and report location for extraction runs
+DEFAULT_WORKERS = 8
+DEFAULT_REPORT = ".starter-kit/extraction_report.json"
+
+# Incremental extraction state; bump STATE_VERSION when the output format of
+# non rule-based transforms (attribution headers, directory copies) changes
+DEFAULT_STATE = ".starter-kit/extraction_state.json"
+STATE_VERSION = 1
+DEFAULT_WATCH_INTERVAL = 2.0
 
 # Define all extractions with source and destination
 EXTRACTIONS = [
@@ -95,13 +113,13 @@ EXTRACTIONS = [
     # ========== Testing Framework (from adk-python) ==========
     {
         "source": "adk-python/tests/matchers.py",
-        "dest": "tests/core/matchers.py",
+        "dest": "tests/testing/matchers.py",
         "transform": "add_attribution_only",
         "attribution": "google/adk-python/tests/"
     },
     {
         "source": "adk-python/tests/fixtures.py",
-        "dest": "tests/core/fixtures.py",
+        "dest": "tests/testing/fixtures.py",
         "transform": "add_attribution_only",
         "attribution": "google/adk-python/tests/"
     },
@@ -127,81 +145,179 @@ EXTRACTIONS = [
     },
 ]
 
-def add_attribution(content: str, file_type: str, attribution: str) -> str:
-    """Add attribution comment to file content based on file type."""
+# A rewrite rule: regex pattern, replacement (string or callable taking the
+# match) and re flags scoped to this rule only
+Rule = namedtuple("Rule", ["name", "pattern", "replacement", "flags"], defaults=[0])
+
+# Characters that end a pattern's literal first character
+REGEX_METACHARACTERS = set("\\.^$*+?{}[]|()")
+
+class RuleSet:
+    """Rewrite rules compiled into one alternation and applied in one scan.
+    
+    Each rule becomes a named group of a single combined pattern, and every
+    match is dispatched to its rule's replacement. Unlike chained ``re.sub``
+    passes, output is never re-scanned: at any position the leftmost match
+    wins, and between rules matching at the same position the one declared
+    first wins. Rule patterns must not define named groups of their own.
+    """
+    
+    def __init__(self, name: str, rules: List[Rule]):
+        self.name = name
+        self.rules = list(rules)
+        self.hits = {rule.name: 0 for rule in self.rules}
+        self._hits_lock = threading.Lock()
+        self._groups = {f"_r{index}": rule for index, rule in enumerate(self.rules)}
+        
+        alternatives = "|".join(
+            f"(?P<{group}>{self._scoped(rule.pattern, rule.flags)})"
+            for group, rule in self._groups.items()
+        )
+        # A lookahead on the possible first characters lets the regex engine
+        # skip positions where no rule can start
+        first_chars = self._first_characters()
+        if first_chars:
+            guard = "".join(re.escape(char) for char in sorted(first_chars))
+            alternatives = f"(?=[{guard}])(?:{alternatives})"
+        self.pattern = re.compile(alternatives)
+        
+        fingerprint = json.dumps(
+            [[rule.name, rule.pattern, rule.replacement if isinstance(rule.replacement, str)
+              else rule.replacement.__qualname__, int(rule.flags)] for rule in self.rules]
+        )
+        self.version = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:12]
+    
+    @staticmethod
+    def _scoped(pattern: str, flags: int) -> str:
+        """Wrap a pattern so its flags apply to it alone."""
+        letters = "".join(
+            letter for flag, letter in ((re.IGNORECASE, "i"), (re.MULTILINE, "m"),
+                                        (re.DOTALL, "s"), (re.VERBOSE, "x"))
+            if flags & flag
+        )
+        return f"(?{letters}:{pattern})" if letters else f"(?:{pattern})"
+    
+    def _first_characters(self):
+        """Return every character a match can start with, or None if unknown."""
+        chars = set()
+        for rule in self.rules:
+            first = rule.pattern[:1]
+            if not first or first in REGEX_METACHARACTERS or rule.flags & re.VERBOSE:
+                return None
+            if len(rule.pattern) > 1 and rule.pattern[1] in "*?{":
+                return None  # The first character is optional
+            chars.add(first)
+            if rule.flags & re.IGNORECASE:
+                chars.update((first.lower(), first.upper()))
+        return chars
+    
+    def apply(self, content: str, hits: Dict[str, int] = None) -> str:
+        """Rewrite ``content`` in one pass, counting hits per rule.
+        
+        Hits are added to ``self.hits`` and, if given, to ``hits`` keyed as
+        ``"<rule set>.<rule>"``.
+        """
+        counts = {}
+        groups = self._groups
+        
+        def dispatch(match):
+            rule = groups[match.lastgroup]
+            counts[rule.name] = counts.get(rule.name, 0) + 1
+            if isinstance(rule.replacement, str):
+                return rule.replacement
+            return rule.replacement(match)
+        
+        result = self.pattern.sub(dispatch, content)
+        
+        with self._hits_lock:
+            for rule_name, count in counts.items():
+                self.hits[rule_name] += count
+        if hits is not None:
+            for rule_name, count in counts.items():
+                key = f"{self.name}.{rule_name}"
+                hits[key] = hits.get(key, 0) + count
+        return result
+
+def add_attribution(content: str, file_type: str, attribution: str, commit: str = None) -> str:
+    """Add attribution comment to file content based on file type.
+    
+    ``commit`` is the upstream commit SHA the file was read from, if known.
+    """
+    commit_line = f"# Source commit: {commit}\n" if commit else ""
     if file_type == '.py':
         return f'''# Extracted from {attribution}
 # Part of the Universal ADK Agent Starter Kit
 # Original source: https://github.com/{attribution}
-
+{commit_line}
 {content}'''
     elif file_type in ['.yaml', '.yml']:
         return f'''# Extracted from {attribution}
 # Part of the Universal ADK Agent Starter Kit
 # Original source: https://github.com/{attribution}
-
+{commit_line}
 {content}'''
     elif file_type == '.md':
+        commit_line = f"<!-- Source commit: {commit} -->\n" if commit else ""
         return f'''<!-- Extracted from {attribution} -->
 <!-- Part of the Universal ADK Agent Starter Kit -->
 <!-- Original source: https://github.com/{attribution} -->
-
+{commit_line}
 {content}'''
     elif file_type == '.toml':
         return f'''# Extracted from {attribution}
 # Part of the Universal ADK Agent Starter Kit
 # Original source: https://github.com/{attribution}
-
+{commit_line}
 {content}'''
     else:
         return content
 
-def make_configurable(content: str) -> str:
-    """Replace hardcoded values with template variables."""
-    replacements = [
-        # Project IDs
-        (r'project[_-]?id\s*=\s*["\'][\w-]+["\']', 'project_id = "{{project_id}}"'),
-        (r'PROJECT_ID\s*=\s*["\'][\w-]+["\']', 'PROJECT_ID = "{{project_id}}"'),
-        
-        # Agent names
-        (r'name\s*=\s*["\'][\w_-]+["\']', 'name = "{{agent_name}}"'),
-        (r'agent_name\s*=\s*["\'][\w_-]+["\']', 'agent_name = "{{agent_name}}"'),
-        
-        # Model names (keep Gemini but make configurable)
-        (r'model\s*=\s*["\']gemini-[\w.-]+["\']', 'model = "{{model_name|default:gemini-2.0-flash}}"'),
-        
-        # Locations
-        (r'location\s*=\s*["\'][\w-]+["\']', 'location = "{{location|default:us-central1}}"'),
-        
-        # Package names in imports (for namespace configuration)
-        (r'from llm_auditor', 'from {{namespace}}.agents.{{agent_name}}'),
-        (r'from customer_service', 'from {{namespace}}.agents.{{agent_name}}'),
-        (r'from rag', 'from {{namespace}}.agents.{{agent_name}}'),
-    ]
+MAKE_CONFIGURABLE_RULES = RuleSet("make_configurable", [
+    # Project IDs
+    Rule("project_id", r'project[_-]?id\s*=\s*["\'][\w-]+["\']', 'project_id = "{{project_id}}"', re.IGNORECASE),
+    Rule("PROJECT_ID", r'PROJECT_ID\s*=\s*["\'][\w-]+["\']', 'PROJECT_ID = "{{project_id}}"', re.IGNORECASE),
     
-    result = content
-    for pattern, replacement in replacements:
-        result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
+    # Agent names
+    Rule("name", r'name\s*=\s*["\'][\w_-]+["\']', 'name = "{{agent_name}}"', re.IGNORECASE),
+    Rule("agent_name", r'agent_name\s*=\s*["\'][\w_-]+["\']', 'agent_name = "{{agent_name}}"', re.IGNORECASE),
     
-    return result
+    # Model names (keep Gemini but make configurable)
+    Rule("model", r'model\s*=\s*["\']gemini-[\w.-]+["\']', 'model = "{{model_name|default:gemini-2.0-flash}}"', re.IGNORECASE),
+    
+    # Locations
+    Rule("location", r'location\s*=\s*["\'][\w-]+["\']', 'location = "{{location|default:us-central1}}"', re.IGNORECASE),
+    
+    # Package names in imports (for namespace configuration)
+    Rule("import_llm_auditor", r'from llm_auditor', 'from {{namespace}}.agents.{{agent_name}}', re.IGNORECASE),
+    Rule("import_customer_service", r'from customer_service', 'from {{namespace}}.agents.{{agent_name}}', re.IGNORECASE),
+    Rule("import_rag", r'from rag', 'from {{namespace}}.agents.{{agent_name}}', re.IGNORECASE),
+])
+
+def make_configurable(content: str) -> str:
+    """Replace hardcoded values with template variables."""
+    return MAKE_CONFIGURABLE_RULES.apply(content)
+
+TEMPLATIZE_PYPROJECT_RULES = RuleSet("templatize_pyproject", [
+    # Package name, description and authors
+    Rule("name", r'name = "[\w-]+"', 'name = "{{agent_name}}"'),
+    Rule("description", r'description = ".*?"', 'description = "{{agent_description}}"'),
+    Rule("authors", r'authors = \[.*?\]', 'authors = ["{{author_name}} <{{author_email}}>"]', re.DOTALL),
+])
 
 def templatize_pyproject(content: str) -> str:
     """Convert pyproject.toml to template."""
-    # Replace package name
-    content = re.sub(r'name = "[\w-]+"', 'name = "{{agent_name}}"', content)
-    # Replace description
-    content = re.sub(r'description = ".*?"', 'description = "{{agent_description}}"', content)
-    # Replace authors
-    content = re.sub(r'authors = \[.*?\]', 'authors = ["{{author_name}} <{{author_email}}>"]', content, flags=re.DOTALL)
-    return content
+    return TEMPLATIZE_PYPROJECT_RULES.apply(content)
+
+TEMPLATIZE_README_RULES = RuleSet("templatize_readme", [
+    # Replace agent-specific names with placeholders
+    Rule("heading", r'# [\w\s-]+ Agent', '# {{agent_display_name}} Agent'),
+    Rule("llm_auditor", r'llm[_-]auditor', '{{agent_name}}', re.IGNORECASE),
+    Rule("customer_service", r'customer[_-]service', '{{agent_name}}', re.IGNORECASE),
+])
 
 def templatize_readme(content: str) -> str:
     """Convert README.md to template."""
-    # Replace agent-specific names with placeholders
-    content = re.sub(r'# [\w\s-]+ Agent', '# {{agent_display_name}} Agent', content)
-    content = re.sub(r'llm[_-]auditor', '{{agent_name}}', content, flags=re.IGNORECASE)
-    content = re.sub(r'customer[_-]service', '{{agent_name}}', content, flags=re.IGNORECASE)
-    return content
+    return TEMPLATIZE_README_RULES.apply(content)
 
 def make_env_configurable(content: str) -> str:
     """Make .env.example configurable."""
@@ -221,82 +337,702 @@ GOOGLE_GENAI_USE_VERTEXAI={{use_vertex|default:true}}
 '''
     return universal_config + content
 
+TEMPLATIZE_MAKEFILE_RULES = RuleSet("templatize_makefile", [
+    # Replace hardcoded values
+    Rule("project_id", r'PROJECT_ID\s*:?=\s*[\w-]+', 'PROJECT_ID := {{project_id}}'),
+    Rule("agent_name", r'AGENT_NAME\s*:?=\s*[\w-]+', 'AGENT_NAME := {{agent_name}}'),
+])
+
 def templatize_makefile(content: str) -> str:
     """Convert Makefile to template."""
-    # Replace hardcoded values
-    content = re.sub(r'PROJECT_ID\s*:?=\s*[\w-]+', 'PROJECT_ID := {{project_id}}', content)
-    content = re.sub(r'AGENT_NAME\s*:?=\s*[\w-]+', 'AGENT_NAME := {{agent_name}}', content)
-    return content
+    return TEMPLATIZE_MAKEFILE_RULES.apply(content)
+
+TEMPLATIZE_TERRAFORM_RULES = RuleSet("templatize_terraform", [
+    # Make variables configurable
+    Rule("default", r'default\s*=\s*"[\w-]+"', 'default = "{{project_id}}"'),
+])
+
+def templatize_terraform(content: str) -> str:
+    """Make Terraform variable defaults configurable."""
+    return TEMPLATIZE_TERRAFORM_RULES.apply(content)
+
+# Single-file transforms, keyed by the "transform" name used in EXTRACTIONS.
+# Rule sets are applied directly so their hits are recorded per extraction.
+TRANSFORMS = {
+    "make_configurable": MAKE_CONFIGURABLE_RULES,
+    "templatize_pyproject": TEMPLATIZE_PYPROJECT_RULES,
+    "templatize_readme": TEMPLATIZE_README_RULES,
+    "make_env_configurable": make_env_configurable,
+    "templatize_makefile": TEMPLATIZE_MAKEFILE_RULES,
+}
+
+def new_stats() -> Dict[str, Any]:
+    """Create the I/O and timing counters for one extraction."""
+    return {
+        "files_written": 0,
+        "files_unchanged": 0,
+        "bytes_read": 0,
+        "bytes_written": 0,
+        "transform_time": 0.0,
+        "rule_hits": {},
+    }
+
+def read_text(source, handle, stats: Dict[str, Any]) -> str:
+    """Read a source file through its backend, counting the bytes read."""
+    data = source.read_bytes(handle)
+    stats["bytes_read"] += len(data)
+    return data.decode("utf-8")
+
+def apply_transform(transform, content: str, stats: Dict[str, Any]) -> str:
+    """Apply a transform function or rule set, accumulating the time spent in it."""
+    start = time.perf_counter()
+    if isinstance(transform, RuleSet):
+        result = transform.apply(content, stats["rule_hits"])
+    else:
+        result = transform(content)
+    stats["transform_time"] += time.perf_counter() - start
+    return result
+
+def write_if_changed(path: Path, content: str, stats: Dict[str, Any]) -> None:
+    """Write a text file unless it already holds exactly ``content``."""
+    write_bytes_if_changed(path, content.encode("utf-8"), stats)
+
+def write_bytes_if_changed(path: Path, data: bytes, stats: Dict[str, Any]) -> None:
+    """Write a file unless it already holds exactly ``data``."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            stats["files_unchanged"] += 1
+            return
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    stats["bytes_written"] += len(data)
+    stats["files_written"] += 1
+
+# Chunk size for the buffered copy fallback
+COPY_CHUNK_SIZE = 1024 * 1024
+
+def copy_fd_range(src_fd: int, dst_fd: int, size: int) -> int:
+    """Copy ``size`` bytes between file descriptors, in the kernel when possible.
+    
+    Tries copy_file_range (which can reflink on CoW filesystems), then
+    sendfile, then a buffered read/write loop. Returns the bytes copied.
+    """
+    copied = 0
+    for method in ("copy_file_range", "sendfile"):
+        if copied >= size or not hasattr(os, method):
+            continue
+        try:
+            while copied < size:
+                if method == "copy_file_range":
+                    count = os.copy_file_range(src_fd, dst_fd, size - copied, copied, copied)
+                else:
+                    os.lseek(dst_fd, copied, os.SEEK_SET)
+                    count = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                if count == 0:
+                    return copied  # Source shrank while copying
+                copied += count
+        except OSError:
+            continue  # Unsupported for these files; try the next method
+    
+    os.lseek(src_fd, copied, os.SEEK_SET)
+    os.lseek(dst_fd, copied, os.SEEK_SET)
+    while copied < size:
+        chunk = os.read(src_fd, min(COPY_CHUNK_SIZE, size - copied))
+        if not chunk:
+            break
+        os.write(dst_fd, chunk)
+        copied += len(chunk)
+    return copied
 
-def copy_terraform(source_path: str, dest_path: str) -> None:
+def copy_file_fast(source: Path, dest: Path, stats: Dict[str, Any]) -> None:
+    """Copy a file without a transform, skipping it if dest is already current.
+    
+    A destination with the source's size and mtime is treated as unchanged;
+    the source mtime is copied onto every file written here.
+    """
+    source_stat = source.stat()
+    try:
+        dest_stat = dest.stat()
+        if (dest_stat.st_size == source_stat.st_size
+                and dest_stat.st_mtime_ns == source_stat.st_mtime_ns):
+            stats["files_unchanged"] += 1
+            return
+    except FileNotFoundError:
+        pass
+    
+    with open(source, "rb") as fsrc, open(dest, "wb") as fdst:
+        copied = copy_fd_range(fsrc.fileno(), fdst.fileno(), source_stat.st_size)
+    shutil.copystat(source, dest)
+    stats["bytes_read"] += copied
+    stats["bytes_written"] += copied
+    stats["files_written"] += 1
+
+class WorkingTreeSource:
+    """Reads sources from repository checkouts under ``base``.
+    
+    A source path such as ``adk-samples/agents/...`` is resolved against
+    ``base``. File handles are plain paths.
+    """
+    
+    def __init__(self, base: Path):
+        self.base = Path(base)
+    
+    def has_repo(self, repo: str) -> bool:
+        """Return True if the named repository is available."""
+        return (self.base / repo).exists()
+    
+    def location(self) -> str:
+        """Describe where sources are read from."""
+        return str(self.base.absolute())
+    
+    def commit(self, source: str):
+        """Working trees are not pinned to a commit."""
+        return None
+    
+    def refresh(self) -> None:
+        """Nothing is cached between reads."""
+    
+    def close(self) -> None:
+        """Nothing to release."""
+    
+    def files(self, source: str) -> List[Tuple[str, Path]]:
+        """List (relative name, handle) for a source file or every file in a tree.
+        
+        A single file is listed with the relative name ``""``.
+        """
+        source_path = self.base / source
+        if source_path.is_dir():
+            return sorted(
+                (path.relative_to(source_path).as_posix(), path)
+                for path in source_path.rglob('*') if path.is_file()
+            )
+        if source_path.exists():
+            return [("", source_path)]
+        return []
+    
+    def read_bytes(self, handle: Path) -> bytes:
+        """Read a file's content."""
+        return handle.read_bytes()
+    
+    def signature(self, handle: Path) -> Tuple:
+        """Cheap stat-only signature of a file."""
+        stat = handle.stat()
+        return (stat.st_size, stat.st_mtime_ns)
+    
+    def fingerprint(self, handle: Path, recorded: List = None) -> List:
+        """Return [size, mtime_ns, content hash] for a file.
+        
+        A file whose size and mtime match ``recorded`` reuses its recorded
+        hash instead of being read again.
+        """
+        stat = handle.stat()
+        if recorded and recorded[0] == stat.st_size and recorded[1] == stat.st_mtime_ns:
+            return recorded
+        return [stat.st_size, stat.st_mtime_ns, hashlib.sha256(handle.read_bytes()).hexdigest()]
+    
+    def copy_to(self, handle: Path, dest: Path, stats: Dict[str, Any]) -> None:
+        """Copy a file verbatim, in the kernel when possible."""
+        copy_file_fast(handle, dest, stats)
+
+class GitObjectSource:
+    """Reads sources straight from git objects at pinned commits.
+    
+    Each repository is a bare repo (or a clone's ``.git`` directory) listed
+    in ``git_dirs``; nothing is checked out. Trees are listed once per
+    commit with ``git ls-tree`` and blobs are streamed from one long-lived
+    ``git cat-file --batch`` process per repository. File handles are
+    (repository, blob id, size) tuples.
+    """
+    
+    def __init__(self, git_dirs: Dict[str, Path], pins: Dict[str, str] = None):
+        self.git_dirs = {name: Path(git_dir) for name, git_dir in git_dirs.items()}
+        self.pins = dict(pins or {})
+        self._commits = {}
+        self._trees = {}
+        self._batches = {}
+        self._locks = {name: threading.Lock() for name in self.git_dirs}
+    
+    @classmethod
+    def discover(cls, root: Path, repos: List[str], pins: Dict[str, str] = None) -> "GitObjectSource":
+        """Find ``<repo>.git`` bare repos or ``<repo>/.git`` clones under ``root``."""
+        git_dirs = {}
+        for repo in repos:
+            for candidate in (root / f"{repo}.git", root / repo / ".git", root / repo):
+                if (candidate / "objects").is_dir():
+                    git_dirs[repo] = candidate
+                    break
+        return cls(git_dirs, pins)
+    
+    def has_repo(self, repo: str) -> bool:
+        """Return True if the named repository is available."""
+        return repo in self.git_dirs
+    
+    def location(self) -> str:
+        """Describe where sources are read from."""
+        return ", ".join(
+            f"{name}@{self.pins.get(name, 'HEAD')}" for name in sorted(self.git_dirs)
+        )
+    
+    def _git(self, repo: str, *args: str) -> bytes:
+        """Run a git command against a repository and return its stdout."""
+        result = subprocess.run(
+            ["git", "--git-dir", str(self.git_dirs[repo]), *args],
+            capture_output=True, check=True,
+        )
+        return result.stdout
+    
+    def _split(self, source: str) -> Tuple[str, str]:
+        """Split a source path into (repository, path inside it)."""
+        repo, _, path = source.partition("/")
+        if repo not in self.git_dirs:
+            raise FileNotFoundError(f"Repository {repo} not found for {source}")
+        return repo, path.rstrip("/")
+    
+    def commit(self, source: str) -> str:
+        """Return the commit SHA the source is read from."""
+        repo, _ = self._split(source)
+        with self._locks[repo]:
+            if repo not in self._commits:
+                rev = self.pins.get(repo, "HEAD")
+                try:
+                    output = self._git(repo, "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}")
+                except subprocess.CalledProcessError:
+                    raise ValueError(f"Cannot resolve {rev} in {repo}") from None
+                self._commits[repo] = output.decode().strip()
+            return self._commits[repo]
+    
+    def refresh(self) -> None:
+        """Re-resolve pins on the next read (a pin may name a moving branch)."""
+        for repo, lock in self._locks.items():
+            with lock:
+                self._commits.pop(repo, None)
+    
+    def close(self) -> None:
+        """Stop the cat-file processes."""
+        for process in self._batches.values():
+            process.stdin.close()
+            process.wait()
+        self._batches.clear()
+    
+    def _tree(self, repo: str, commit: str) -> Dict[str, Tuple[str, int]]:
+        """Map every blob path at ``commit`` to (blob id, size)."""
+        key = (repo, commit)
+        if key not in self._trees:
+            output = self._git(repo, "ls-tree", "-r", "-z", "--long", commit)
+            tree = {}
+            for record in output.split(b"\0"):
+                if not record:
+                    continue
+                meta, _, path = record.partition(b"\t")
+                mode, object_type, oid, size = meta.split()
+                # Symlinks and submodules are not extracted
+                if object_type == b"blob" and mode != b"120000":
+                    tree[path.decode("utf-8")] = (oid.decode(), int(size))
+            self._trees[key] = tree
+        return self._trees[key]
+    
+    def files(self, source: str) -> List[Tuple[str, Tuple[str, str, int]]]:
+        """List (relative name, handle) for a source file or every file in a tree."""
+        repo, path = self._split(source)
+        tree = self._tree(repo, self.commit(source))
+        if path in tree:
+            oid, size = tree[path]
+            return [("", (repo, oid, size))]
+        prefix = f"{path}/" if path else ""
+        return sorted(
+            (name[len(prefix):], (repo, oid, size))
+            for name, (oid, size) in tree.items() if name.startswith(prefix)
+        )
+    
+    def read_bytes(self, handle: Tuple[str, str, int]) -> bytes:
+        """Read a blob through the repository's cat-file process."""
+        repo, oid, _ = handle
+        with self._locks[repo]:
+            process = self._batches.get(repo)
+            if process is None:
+                process = subprocess.Popen(
+                    ["git", "--git-dir", str(self.git_dirs[repo]), "cat-file", "--batch"],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                )
+                self._batches[repo] = process
+            process.stdin.write(f"{oid}\n".encode())
+            process.stdin.flush()
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                raise FileNotFoundError(f"Object {oid} missing from {repo}")
+            data = process.stdout.read(int(header[2]))
+            process.stdout.read(1)  # Trailing newline
+            return data
+    
+    def signature(self, handle: Tuple[str, str, int]) -> str:
+        """A blob id changes exactly when the content does."""
+        return handle[1]
+    
+    def fingerprint(self, handle: Tuple[str, str, int], recorded: List = None) -> List:
+        """Return [size, None, blob id]; no content needs to be read."""
+        return [handle[2], None, f"git:{handle[1]}"]
+    
+    def copy_to(self, handle: Tuple[str, str, int], dest: Path, stats: Dict[str, Any]) -> None:
+        """Write a blob to ``dest`` unless it is already identical."""
+        data = self.read_bytes(handle)
+        stats["bytes_read"] += len(data)
+        write_bytes_if_changed(dest, data, stats)
+
+def extract_tree(source, source_name: str, dest_path: Path, transforms: Dict[str, List],
+                 stats: Dict[str, Any]) -> None:
+    """Copy a source tree to ``dest_path`` in one pass.
+    
+    ``transforms`` maps a file suffix to the chain of transforms (functions
+    or RuleSets) its content is streamed through on the way to the
+    destination. Files with no matching suffix take the backend's copy
+    path (zero-copy for working trees). Unchanged destination files are
+    left alone.
+    """
+    created_dirs = set()
+    for name, handle in source.files(source_name):
+        if not name:
+            continue  # A single file, not a tree
+        dest_file = dest_path / name
+        if dest_file.parent not in created_dirs:
+            dest_file.parent.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(dest_file.parent)
+        
+        chain = transforms.get(Path(name).suffix)
+        if chain:
+            content = read_text(source, handle, stats)
+            for transform in chain:
+                content = apply_transform(transform, content, stats)
+            write_if_changed(dest_file, content, stats)
+        else:
+            source.copy_to(handle, dest_file, stats)
+
+def copy_terraform(source, source_name: str, dest_path: Path, stats: Dict[str, Any] = None) -> None:
     """Copy Terraform files and templatize variables."""
-    if os.path.isdir(source_path):
-        shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-        # Process all .tf files
-        for tf_file in Path(dest_path).rglob('*.tf'):
-            content = tf_file.read_text()
-            # Make variables configurable
-            content = re.sub(r'default\s*=\s*"[\w-]+"', 'default = "{{project_id}}"', content)
-            tf_file.write_text(content)
-
-def process_extraction(extraction: Dict[str, str], source_base: Path, dest_base: Path) -> None:
-    """Process a single extraction."""
-    source_path = source_base / extraction["source"]
-    dest_path = dest_base / extraction["dest"]
+    stats = stats if stats is not None else new_stats()
+    # Make variables configurable in all .tf files
+    extract_tree(source, source_name, dest_path, {".tf": [TEMPLATIZE_TERRAFORM_RULES]}, stats)
+
+def transform_version(transform: str) -> str:
+    """Return the version of a transform, used to invalidate cached output."""
+    if transform == "copy_terraform":
+        return f"{STATE_VERSION}:{TEMPLATIZE_TERRAFORM_RULES.version}"
+    if isinstance(TRANSFORMS.get(transform), RuleSet):
+        return f"{STATE_VERSION}:{TRANSFORMS[transform].version}"
+    return str(STATE_VERSION)
+
+def source_signature(source, source_name: str) -> Tuple:
+    """Cheap signature of a source, used by --watch to spot changes."""
+    return tuple(
+        (name, source.signature(handle)) for name, handle in source.files(source_name)
+    )
+
+def source_fingerprint(source, source_name: str, previous: Dict[str, Any] = None) -> Tuple[str, Dict[str, List]]:
+    """Hash the content of a source file or tree.
     
-    # Ensure destination directory exists
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
+    Returns the combined hash and the per-file fingerprints recorded in the
+    state file, which let unchanged files skip hashing on the next run.
+    """
+    previous_files = (previous or {}).get("files", {})
+    files = {
+        name: source.fingerprint(handle, previous_files.get(name))
+        for name, handle in source.files(source_name)
+    }
+    combined = json.dumps(sorted((name, entry[2]) for name, entry in files.items()))
+    return hashlib.sha256(combined.encode("utf-8")).hexdigest(), files
+
+def load_state(state_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load extraction state entries keyed by destination."""
+    if not state_path.exists():
+        return {}
+    with open(state_path) as f:
+        state = json.load(f)
+    if state.get("version") != STATE_VERSION:
+        return {}
+    return state.get("entries", {})
+
+def save_state(state_path: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    """Atomically write extraction state entries."""
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_name(state_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"version": STATE_VERSION, "entries": entries}, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+def process_extraction(extraction: Dict[str, str], source, dest_base: Path,
+                       state: Dict[str, Dict[str, Any]] = None, force: bool = False) -> Dict[str, Any]:
+    """Process a single extraction and return its report entry.
+    
+    ``source`` is the backend sources are read from (WorkingTreeSource or
+    GitObjectSource). With ``state``, the extraction is skipped when its
+    source content, commit, transform version and attribution match the
+    recorded entry and the destination still exists, unless ``force`` is
+    set. The new state entry is returned under ``"state_entry"``.
+    """
+    source_name = extraction["source"]
+    dest_path = dest_base / extraction["dest"]
     
     transform = extraction["transform"]
     attribution = extraction["attribution"]
     
-    print(f"Extracting: {extraction['source']} -> {extraction['dest']}")
+    stats = new_stats()
+    result = {
+        "source": extraction["source"],
+        "dest": extraction["dest"],
+        "transform": transform,
+        "status": "ok",
+        "error": None,
+        "state_entry": None,
+    }
+    start = time.perf_counter()
     
     try:
+        commit = source.commit(source_name)
+        result["commit"] = commit
+        
+        if state is not None:
+            previous = state.get(extraction["dest"])
+            source_hash, files = source_fingerprint(source, source_name, previous)
+            entry = {
+                "source": extraction["source"],
+                "commit": commit,
+                "source_hash": source_hash,
+                "transform": transform,
+                "transform_version": transform_version(transform),
+                "attribution": attribution,
+                "files": files,
+            }
+            result["state_entry"] = entry
+            unchanged = previous is not None and all(
+                previous.get(key) == entry[key]
+                for key in ("source", "commit", "source_hash", "transform",
+                            "transform_version", "attribution")
+            )
+            if unchanged and files and dest_path.exists() and not force:
+                result["status"] = "skipped"
+                result["wall_time"] = time.perf_counter() - start
+                result.update(stats)
+                return result
+        
+        # Ensure destination directory exists
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        
         if transform == "copy_directory":
-            if source_path.is_dir():
-                shutil.copytree(source_path, dest_path, dirs_exist_ok=True)
-                # Add attribution to all Python files
-                for py_file in dest_path.rglob('*.py'):
-                    content = py_file.read_text()
-                    content = add_attribution(content, '.py', attribution)
-                    py_file.write_text(content)
+            # Add attribution to all Python files
+            add_py_attribution = lambda content: add_attribution(content, '.py', attribution, commit)
+            extract_tree(source, source_name, dest_path, {".py": [add_py_attribution]}, stats)
         
         elif transform == "copy_terraform":
-            copy_terraform(str(source_path), str(dest_path))
+            copy_terraform(source, source_name, dest_path, stats)
         
         else:
             # Read source file
-            content = source_path.read_text()
+            files = source.files(source_name)
+            if not files or files[0][0]:
+                raise FileNotFoundError(f"No such source file: {source_name}")
+            content = read_text(source, files[0][1], stats)
             
             # Get file extension
-            file_ext = source_path.suffix
+            file_ext = Path(source_name).suffix
             
             # Apply transformation
-            if transform == "make_configurable":
-                content = make_configurable(content)
-            elif transform == "templatize_pyproject":
-                content = templatize_pyproject(content)
-            elif transform == "templatize_readme":
-                content = templatize_readme(content)
-            elif transform == "make_env_configurable":
-                content = make_env_configurable(content)
-            elif transform == "templatize_makefile":
-                content = templatize_makefile(content)
+            if transform in TRANSFORMS:
+                content = apply_transform(TRANSFORMS[transform], content, stats)
             
             # Add attribution
-            content = add_attribution(content, file_ext, attribution)
+            content = add_attribution(content, file_ext, attribution, commit)
             
             # Write to destination
-            dest_path.write_text(content)
-            
-        print(f"  ✓ Extracted successfully")
+            write_if_changed(dest_path, content, stats)
         
     except Exception as e:
-        print(f"  ✗ Error: {e}")
+        result["status"] = "error"
+        result["error"] = str(e)
+        result["state_entry"] = None
+    
+    result["wall_time"] = time.perf_counter() - start
+    result.update(stats)
+    return result
+
+def group_by_destination(extractions: List[Dict[str, str]]) -> List[List[Dict[str, str]]]:
+    """Group extractions whose destination paths overlap.
+    
+    Groups are independent and can run concurrently; extractions inside a
+    group keep their EXTRACTIONS order and run one after another.
+    """
+    groups = []
+    for extraction in extractions:
+        dest = Path(extraction["dest"])
+        overlapping = [
+            group for group in groups
+            if any(
+                dest == other or dest in other.parents or other in dest.parents
+                for other in (Path(item["dest"]) for item in group)
+            )
+        ]
+        merged = [extraction]
+        for group in overlapping:
+            groups.remove(group)
+            merged = group + merged
+        groups.append(merged)
+    return groups
+
+def run_extractions(extractions: List[Dict[str, str]], source, dest_base: Path,
+                    workers: int = DEFAULT_WORKERS, state: Dict[str, Dict[str, Any]] = None,
+                    force: bool = False) -> List[Dict[str, Any]]:
+    """Run extractions on a worker pool; results keep EXTRACTIONS order.
+    
+    ``state`` is read by the workers and updated here, in the calling
+    thread, once all extractions have finished.
+    """
+    def run_group(group):
+        return [
+            process_extraction(extraction, source, dest_base, state=state, force=force)
+            for extraction in group
+        ]
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for group_results in executor.map(run_group, group_by_destination(extractions)):
+            for result in group_results:
+                results[(result["source"], result["dest"])] = result
+    
+    ordered = [results[(extraction["source"], extraction["dest"])] for extraction in extractions]
+    for result in ordered:
+        entry = result.pop("state_entry")
+        if state is not None and entry is not None:
+            state[result["dest"]] = entry
+    return ordered
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Print one status line per extraction."""
+    for result in results:
+        print(f"Extracting: {result['source']} -> {result['dest']}")
+        if result["status"] == "ok":
+            print(f"  ✓ Extracted successfully ({result['wall_time'] * 1000:.1f} ms, "
+                  f"{result['bytes_read']} bytes read, {result['bytes_written']} bytes written)")
+        elif result["status"] == "skipped":
+            print(f"  ✓ Unchanged, skipped")
+        else:
+            print(f"  ✗ Error: {result['error']}")
+
+def watch_extractions(extractions: List[Dict[str, str]], source, dest_base: Path,
+                      args, state: Dict[str, Dict[str, Any]]) -> None:
+    """Poll the upstream sources and re-extract only sources that change."""
+    signatures = {
+        extraction["dest"]: source_signature(source, extraction["source"])
+        for extraction in extractions
+    }
+    print(f"\nWatching {len(extractions)} sources (every {args.interval:g}s, Ctrl+C to stop)...")
+    
+    try:
+        while True:
+            time.sleep(args.interval)
+            source.refresh()
+            changed = []
+            for extraction in extractions:
+                signature = source_signature(source, extraction["source"])
+                if signature != signatures[extraction["dest"]]:
+                    signatures[extraction["dest"]] = signature
+                    changed.append(extraction)
+            if not changed:
+                continue
+            
+            results = run_extractions(changed, source, dest_base,
+                                      workers=args.workers, state=state)
+            print_results(results)
+            save_state(Path(args.state), state)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+def write_report(results: List[Dict[str, Any]], wall_time: float, report_path: Path) -> None:
+    """Write the structured extraction report as JSON."""
+    rule_hits = {}
+    for result in results:
+        for key, count in result["rule_hits"].items():
+            rule_hits[key] = rule_hits.get(key, 0) + count
+    report = {
+        "wall_time": wall_time,
+        "successful": sum(1 for result in results if result["status"] != "error"),
+        "skipped": sum(1 for result in results if result["status"] == "skipped"),
+        "failed": sum(1 for result in results if result["status"] == "error"),
+        "bytes_read": sum(result["bytes_read"] for result in results),
+        "bytes_written": sum(result["bytes_written"] for result in results),
+        "transform_time": sum(result["transform_time"] for result in results),
+        "rule_hits": rule_hits,
+        "extractions": results,
+    }
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Extract templates from the official ADK repositories"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of extractions to run concurrently (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--report",
+        default=DEFAULT_REPORT,
+        help=f"Where to write the JSON extraction report (default: {DEFAULT_REPORT})"
+    )
+    parser.add_argument(
+        "--state",
+        default=DEFAULT_STATE,
+        help=f"Incremental extraction state file (default: {DEFAULT_STATE})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-extract everything, ignoring the extraction state"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After extracting, keep re-extracting sources as they change"
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help=f"Polling interval in seconds for --watch (default: {DEFAULT_WATCH_INTERVAL:g})"
+    )
+    parser.add_argument(
+        "--git-dir",
+        metavar="DIR",
+        help="Read sources from git objects in DIR/<repo>.git or DIR/<repo>/.git "
+             "instead of working-tree checkouts"
+    )
+    parser.add_argument(
+        "--pin",
+        action="append",
+        default=[],
+        metavar="REPO=REV",
+        help="Commit, tag or branch to extract a repository at with --git-dir "
+             "(repeatable, default: HEAD)"
+    )
+    return parser.parse_args(argv)
+
+def parse_pins(pins: List[str]) -> Dict[str, str]:
+    """Parse repeated REPO=REV arguments."""
+    parsed = {}
+    for pin in pins:
+        repo, sep, rev = pin.partition("=")
+        if not sep or not repo or not rev:
+            raise ValueError(f"Invalid --pin {pin!r}, expected REPO=REV")
+        parsed[repo] = rev
+    return parsed
 
 def main():
     """Main extraction process."""
+    args = parse_args()
+    
     print("Universal ADK Agent Starter Kit - Extraction Process")
     print("=" * 60)
     
@@ -305,22 +1041,33 @@ def main():
         print("ERROR: Run this script from the universal-adk-agent-starter-kit directory")
         return
     
-    # Source repositories base path
-    source_base = Path("../")  # Assumes repos are cloned in parent directory
     dest_base = Path(".")
-    
-    # Check if source repositories exist
     required_repos = ["adk-samples", "agent-starter-pack", "adk-python", "A2A", "generative-ai"]
-    missing_repos = []
     
-    for repo in required_repos:
-        if not (source_base / repo).exists():
-            missing_repos.append(repo)
+    # Source repositories: pinned git objects, or checkouts in the parent directory
+    if args.git_dir:
+        try:
+            pins = parse_pins(args.pin)
+        except ValueError as e:
+            print(f"ERROR: {e}")
+            return
+        # Only the repositories extractions actually read from are needed
+        required_repos = sorted({extraction["source"].split("/")[0] for extraction in EXTRACTIONS})
+        source = GitObjectSource.discover(Path(args.git_dir), required_repos, pins)
+        unknown_pins = sorted(set(pins) - set(required_repos))
+        if unknown_pins:
+            print(f"ERROR: --pin names unknown repositories: {', '.join(unknown_pins)}")
+            return
+    else:
+        source = WorkingTreeSource(Path("../"))  # Assumes repos are cloned in parent directory
+    
+    # Check if source repositories exist
+    missing_repos = [repo for repo in required_repos if not source.has_repo(repo)]
     
     if missing_repos:
         print(f"ERROR: Missing source repositories: {', '.join(missing_repos)}")
         print("\nPlease clone all repositories first:")
-        print("cd ..")
+        print(f"cd {args.git_dir or '..'}")
         for repo in missing_repos:
             if repo == "adk-samples":
                 print(f"git clone https://github.com/google/{repo}.git")
@@ -332,24 +1079,41 @@ def main():
                 print(f"git clone https://github.com/GoogleCloudPlatform/{repo}.git")
         return
     
-    print(f"Source repositories found in: {source_base.absolute()}")
+    # Resolve every pin up front so a bad revision fails once, not per file
+    try:
+        for repo in required_repos:
+            source.commit(repo)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        source.close()
+        return
+    
+    print(f"Source repositories found in: {source.location()}")
     print(f"Extracting to: {dest_base.absolute()}")
     print()
     
-    # Process each extraction
-    successful = 0
-    failed = 0
+    # Process extractions concurrently, skipping unchanged sources
+    state_path = Path(args.state)
+    state = load_state(state_path)
+    start = time.perf_counter()
+    results = run_extractions(EXTRACTIONS, source, dest_base, workers=args.workers,
+                              state=state, force=args.force)
+    wall_time = time.perf_counter() - start
+    save_state(state_path, state)
     
-    for extraction in EXTRACTIONS:
-        try:
-            process_extraction(extraction, source_base, dest_base)
-            successful += 1
-        except Exception as e:
-            print(f"Failed to extract {extraction['source']}: {e}")
-            failed += 1
+    print_results(results)
+    
+    failed = sum(1 for result in results if result["status"] == "error")
+    skipped = sum(1 for result in results if result["status"] == "skipped")
+    successful = len(results) - failed
     
     print("\n" + "=" * 60)
-    print(f"Extraction complete: {successful} successful, {failed} failed")
+    print(f"Extraction complete: {successful} successful ({skipped} unchanged), "
+          f"{failed} failed in {wall_time:.2f}s")
+    
+    report_path = Path(args.report)
+    write_report(results, wall_time, report_path)
+    print(f"✓ Wrote extraction report to {report_path}")
     
     # Create configuration template
     print("\nCreating starter-kit.yaml configuration template...")
@@ -387,6 +1151,10 @@ def main():
     print("1. Review extracted files in .starter-kit/templates/")
     print("2. Configure starter-kit.yaml with your project settings")
     print("3. Run: python create_agent.py --type simple --name my_first_agent")
+    
+    if args.watch:
+        watch_extractions(EXTRACTIONS, source, dest_base, args, state)
+    source.close()
 
 if __name__ == "__main__":
     main()
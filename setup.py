@@ -10,11 +10,19 @@ This script sets up the Universal ADK Agent Starter Kit by:
 
 import os
 import sys
+import json
+import time
+import hashlib
+import tempfile
+import argparse
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import yaml
 
+from extract import EXTRACTIONS
+
 REQUIRED_REPOS = [
     {
         "name": "adk-samples",
@@ -43,10 +51,28 @@ REQUIRED_REPOS = [
     }
 ]
 
+DEFAULT_WORKERS = 5
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "adk-starter-kit"
+DEFAULT_MIRROR_CACHE = CACHE_DIR / "mirrors"
+DEFAULT_WHEELHOUSE = CACHE_DIR / "wheelhouse"
+
+DEPENDENCIES = [
+    "google-adk>=1.0.0",
+    "pyyaml",
+    "agent-starter-pack",
+    "a2a-sdk",
+]
+LOCKFILE = Path("requirements.lock")
+# Records which lockfile the venv was last installed from
+INSTALL_STAMP = Path("venv") / ".starter-kit-install"
+
+# Top-level files of every repository are always checked out
+ROOT_FILE_PATTERNS = ["/*", "!/*/"]
+
 def run_command(cmd, cwd=None):
-    """Run a shell command and return success status."""
-    print(f"Running: {cmd}")
-    result = subprocess.run(cmd, shell=True, cwd=cwd, capture_output=True, text=True)
+    """Run a command (a shell string or an argument list) and return success status."""
+    print(f"Running: {cmd if isinstance(cmd, str) else ' '.join(map(str, cmd))}")
+    result = subprocess.run(cmd, shell=isinstance(cmd, str), cwd=cwd, capture_output=True, text=True)
     if result.returncode != 0:
         print(f"Error: {result.stderr}")
         return False
@@ -77,68 +103,308 @@ def check_prerequisites():
     
     return True
 
-def clone_repositories():
-    """Clone all required repositories."""
+def git(*args, cwd=None, input=None, env=None):
+    """Run git with an argument list and return its stdout; raise on failure."""
+    result = subprocess.run(
+        ["git", *args], cwd=cwd, input=input, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+def dir_size(path):
+    """Total size in bytes of the files under ``path``."""
+    path = Path(path)
+    if not path.exists():
+        return 0
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file() and not f.is_symlink())
+
+def sparse_paths(repo_name):
+    """Paths inside a repository that EXTRACTIONS reads, as sparse-checkout patterns."""
+    patterns = []
+    for extraction in EXTRACTIONS:
+        repo, _, path = extraction["source"].partition("/")
+        if repo == repo_name and path:
+            patterns.append(f"/{path}")
+    return sorted(set(patterns))
+
+def matches_sparse(path, patterns):
+    """Return True if a repository path is covered by ``sparse_paths`` patterns."""
+    if "/" not in path:
+        return True
+    for pattern in patterns:
+        pattern = pattern.lstrip("/")
+        if path == pattern or (pattern.endswith("/") and path.startswith(pattern)):
+            return True
+    return False
+
+def update_mirror(repo, url, mirror_path):
+    """Create or refresh a shallow, blob-less bare mirror of ``url``.
+    
+    Returns True if upstream was reached. When an existing mirror cannot be
+    refreshed (e.g. offline), the cached copy is used as-is.
+    """
+    if not mirror_path.exists():
+        mirror_path.parent.mkdir(parents=True, exist_ok=True)
+        git("clone", "--bare", "--depth", "1", "--filter=blob:none", url, str(mirror_path))
+        git("config", "uploadpack.allowFilter", "true", cwd=mirror_path)
+        return True
+    
+    branch = git("symbolic-ref", "HEAD", cwd=mirror_path).strip()
+    try:
+        git("fetch", "--depth", "1", "--filter=blob:none", "--no-tags", "origin",
+            f"+HEAD:{branch}", cwd=mirror_path)
+    except RuntimeError as e:
+        print(f"⚠ Using cached mirror of {repo['name']}: {e}")
+        return False
+    return True
+
+def hydrate_mirror(mirror_path, patterns):
+    """Fetch the blobs a sparse checkout needs into the blob-less mirror.
+    
+    Clones served from the mirror cannot fetch missing blobs through it, so
+    every blob under ``patterns`` at HEAD is fetched up front, in one batch.
+    """
+    listing = git("ls-tree", "-r", "-z", "HEAD", cwd=mirror_path)
+    oids = []
+    for record in listing.split("\0"):
+        if not record:
+            continue
+        meta, _, path = record.partition("\t")
+        mode, object_type, oid = meta.split()
+        if object_type == "blob" and matches_sparse(path, patterns):
+            oids.append(oid)
+    if not oids:
+        return
+    
+    # Listing local objects never triggers a lazy fetch
+    present = set(git("cat-file", "--batch-all-objects", "--batch-check=%(objectname)",
+                      cwd=mirror_path).split())
+    missing = [oid for oid in dict.fromkeys(oids) if oid not in present]
+    if missing:
+        git("-c", "fetch.negotiationAlgorithm=noop", "fetch", "origin", "--no-tags",
+            "--no-write-fetch-head", "--recurse-submodules=no", "--filter=blob:none",
+            "--stdin", cwd=mirror_path, input="\n".join(missing) + "\n")
+
+def provision_repository(repo, parent_dir, mirror_cache, url_base=None):
+    """Clone one repository as a shallow, sparse checkout through the mirror cache.
+    
+    Returns a result dict with the status, wall time, bytes fetched from
+    upstream into the mirror and bytes written to the checkout's .git.
+    """
+    repo_path = parent_dir / repo["name"]
+    result = {"name": repo["name"], "status": "exists", "time": 0.0,
+              "fetched_bytes": 0, "checkout_bytes": 0, "error": None}
+    if repo_path.exists():
+        return result
+    
+    url = f"{url_base.rstrip('/')}/{repo['name']}.git" if url_base else repo["url"]
+    mirror_path = mirror_cache / f"{repo['name']}.git"
+    patterns = sparse_paths(repo["name"])
+    start = time.perf_counter()
+    try:
+        mirror_before = dir_size(mirror_path)
+        update_mirror(repo, url, mirror_path)
+        hydrate_mirror(mirror_path, patterns)
+        result["fetched_bytes"] = dir_size(mirror_path) - mirror_before
+        
+        git("clone", "--depth", "1", "--filter=blob:none", "--sparse", "--no-checkout",
+            mirror_path.absolute().as_uri(), str(repo_path))
+        git("sparse-checkout", "set", "--no-cone", *ROOT_FILE_PATTERNS, *patterns, cwd=repo_path)
+        git("checkout", cwd=repo_path)
+        # Point the checkout at upstream so later fetches bypass the cache
+        git("remote", "set-url", "origin", url, cwd=repo_path)
+        result["checkout_bytes"] = dir_size(repo_path / ".git")
+        result["status"] = "cloned"
+    except RuntimeError as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+        shutil.rmtree(repo_path, ignore_errors=True)
+    result["time"] = time.perf_counter() - start
+    return result
+
+def format_bytes(size):
+    """Human-readable byte count."""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def clone_repositories(url_base=None, mirror_cache=DEFAULT_MIRROR_CACHE, workers=DEFAULT_WORKERS):
+    """Clone all required repositories concurrently.
+    
+    Each repository is a shallow, blob-filtered, sparse checkout limited to
+    the paths EXTRACTIONS reads, cloned through a local mirror cache that
+    is reused across runs. ``url_base`` replaces the upstream host (e.g. a
+    ``file://`` directory of mirrors for offline use).
+    """
     print("\n" + "="*60)
     print("Cloning source repositories...")
     print("="*60)
     
     parent_dir = Path("..").absolute()
-    all_cloned = True
+    mirror_cache = Path(mirror_cache).expanduser()
     
-    for repo in REQUIRED_REPOS:
-        repo_path = parent_dir / repo["name"]
-        if repo_path.exists():
-            print(f"✓ {repo['name']} already exists")
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda repo: provision_repository(repo, parent_dir, mirror_cache, url_base),
+            REQUIRED_REPOS,
+        ))
+    wall_time = time.perf_counter() - start
+    
+    for result in results:
+        if result["status"] == "exists":
+            print(f"✓ {result['name']} already exists")
+        elif result["status"] == "cloned":
+            print(f"✓ Cloned {result['name']} ({result['time']:.2f}s, "
+                  f"{format_bytes(result['fetched_bytes'])} fetched, "
+                  f"{format_bytes(result['checkout_bytes'])} in .git)")
         else:
-            print(f"\nCloning {repo['name']}...")
-            if run_command(f"git clone {repo['url']}", cwd=str(parent_dir)):
-                print(f"✓ Cloned {repo['name']}")
-            else:
-                print(f"✗ Failed to clone {repo['name']}")
-                all_cloned = False
-    
-    return all_cloned
+            print(f"✗ Failed to clone {result['name']}: {result['error']}")
+    
+    fetched = sum(result["fetched_bytes"] for result in results)
+    print(f"\nProvisioned {len(results)} repositories in {wall_time:.2f}s "
+          f"({format_bytes(fetched)} fetched, mirrors in {mirror_cache})")
+    
+    return all(result["status"] != "error" for result in results)
+
+def dependencies_hash(dependencies):
+    """Hash of the requested dependencies and interpreter the lockfile was resolved for."""
+    key = "\n".join([f"python {sys.version_info[0]}.{sys.version_info[1]}", *sorted(dependencies)])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def lockfile_inputs(lockfile):
+    """Return the dependencies hash recorded in a lockfile header, or None."""
+    if not lockfile.exists():
+        return None
+    with open(lockfile) as f:
+        first_line = f.readline().strip()
+    prefix = "# inputs: "
+    return first_line[len(prefix):] if first_line.startswith(prefix) else None
+
+def wheelhouse_args(wheelhouse):
+    """pip arguments that prefer wheels from a local wheelhouse, if there is one."""
+    if wheelhouse and Path(wheelhouse).is_dir() and any(Path(wheelhouse).glob("*.whl")):
+        return ["--find-links", str(wheelhouse)]
+    return []
+
+def resolve_dependencies(python_path, dependencies, lockfile, wheelhouse=None):
+    """Resolve all dependencies in one pip pass and pin the result in ``lockfile``.
+    
+    Uses ``pip install --dry-run --report`` so the full set is resolved once,
+    without installing anything. The lockfile is reused as long as the
+    requested dependencies and Python version are unchanged.
+    """
+    inputs = dependencies_hash(dependencies)
+    if lockfile_inputs(lockfile) == inputs:
+        print(f"✓ {lockfile} is up to date")
+        return True
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = Path(tmp) / "report.json"
+        cmd = [python_path, "-m", "pip", "install", "--dry-run", "--ignore-installed",
+               "--quiet", "--report", str(report_path), *wheelhouse_args(wheelhouse), *dependencies]
+        if not run_command(cmd):
+            return False
+        with open(report_path) as f:
+            report = json.load(f)
+    
+    pins = sorted(
+        f"{item['metadata']['name']}=={item['metadata']['version']}"
+        for item in report.get("install", [])
+    )
+    with open(lockfile, "w") as f:
+        f.write(f"# inputs: {inputs}\n")
+        f.write("# Generated by setup.py from DEPENDENCIES; delete to re-resolve.\n")
+        f.write("\n".join(pins) + "\n")
+    print(f"✓ Resolved {len(pins)} packages into {lockfile}")
+    return True
 
-def setup_python_environment():
-    """Set up Python virtual environment and install dependencies."""
+def install_locked(python_path, lockfile, wheelhouse=None):
+    """Install exactly the pinned set from ``lockfile`` without resolving again.
+    
+    Installs offline from the wheelhouse when it holds every wheel, falling
+    back to the index otherwise. Skipped entirely when the venv was already
+    installed from this lockfile.
+    """
+    lock_hash = hashlib.sha256(lockfile.read_bytes()).hexdigest()
+    if INSTALL_STAMP.exists() and INSTALL_STAMP.read_text().strip() == lock_hash:
+        print("✓ Dependencies already installed from lockfile")
+        return True
+    
+    base_cmd = [python_path, "-m", "pip", "install", "--no-deps", "--quiet", "-r", str(lockfile)]
+    find_links = wheelhouse_args(wheelhouse)
+    installed = bool(find_links) and run_command([*base_cmd, "--no-index", *find_links])
+    if not installed:
+        if find_links:
+            print("⚠ Wheelhouse is incomplete, installing from the package index")
+        installed = run_command([*base_cmd, *find_links])
+    if not installed:
+        return False
+    
+    INSTALL_STAMP.write_text(lock_hash + "\n")
+    return True
+
+def print_setup_timings(timings):
+    """Print the per-phase bootstrap timing breakdown."""
+    print("\nEnvironment setup timings:")
+    for phase, seconds in timings.items():
+        print(f"  {phase:<10} {seconds:7.2f}s")
+    print(f"  {'total':<10} {sum(timings.values()):7.2f}s")
+
+def setup_python_environment(wheelhouse=DEFAULT_WHEELHOUSE, dependencies=DEPENDENCIES):
+    """Set up Python virtual environment and install dependencies.
+    
+    Dependencies are resolved once into requirements.lock and installed
+    from it with ``--no-deps``, preferring a local wheelhouse. Timings for
+    venv creation, resolution and install are printed at the end.
+    """
     print("\n" + "="*60)
     print("Setting up Python environment...")
     print("="*60)
     
+    timings = {"venv": 0.0, "resolve": 0.0, "install": 0.0}
+    
     # Create virtual environment if it doesn't exist
     venv_path = Path("venv")
+    start = time.perf_counter()
     if not venv_path.exists():
         print("Creating virtual environment...")
-        if not run_command(f"{sys.executable} -m venv venv"):
+        if not run_command([sys.executable, "-m", "venv", "venv"]):
             return False
         print("✓ Virtual environment created")
+    timings["venv"] = time.perf_counter() - start
     
-    # Determine pip path based on OS
+    # Determine interpreter path based on OS
     if sys.platform == "win32":
-        pip_path = "venv\\Scripts\\pip"
+        python_path = "venv\\Scripts\\python"
         activation_cmd = "venv\\Scripts\\activate.bat"
     else:
-        pip_path = "venv/bin/pip"
+        python_path = "venv/bin/python"
         activation_cmd = "source venv/bin/activate"
     
     print(f"\nTo activate the virtual environment, run:")
     print(f"  {activation_cmd}")
     
-    # Install dependencies
+    # Resolve all dependencies in a single pass
+    print("\nResolving dependencies...")
+    start = time.perf_counter()
+    resolved = resolve_dependencies(python_path, dependencies, LOCKFILE, wheelhouse)
+    timings["resolve"] = time.perf_counter() - start
+    
+    # Install the pinned set
     print("\nInstalling dependencies...")
-    dependencies = [
-        "google-adk>=1.0.0",
-        "pyyaml",
-        "agent-starter-pack",
-        "a2a-sdk",
-    ]
-    
-    for dep in dependencies:
-        print(f"Installing {dep}...")
-        if not run_command(f"{pip_path} install {dep}"):
-            print(f"⚠ Failed to install {dep}")
+    start = time.perf_counter()
+    if resolved:
+        if not install_locked(python_path, LOCKFILE, wheelhouse):
+            print("⚠ Failed to install dependencies")
+    else:
+        print("⚠ Dependency resolution failed, skipping install")
+    timings["install"] = time.perf_counter() - start
     
+    print_setup_timings(timings)
     return True
 
 def run_extraction():
@@ -220,8 +486,39 @@ def create_example_agents():
     print("  - rag: RAG-enabled agent with vector search")
     print("  - tool: Agent with custom tools")
 
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Set up the Universal ADK Agent Starter Kit"
+    )
+    parser.add_argument(
+        "--mirror-cache",
+        default=str(DEFAULT_MIRROR_CACHE),
+        help=f"Directory of bare mirrors reused across runs (default: {DEFAULT_MIRROR_CACHE})"
+    )
+    parser.add_argument(
+        "--url-base",
+        help="Clone <URL_BASE>/<repo>.git instead of the upstream URLs "
+             "(e.g. file:///srv/mirrors for offline setups)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Number of repositories to clone concurrently (default: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        "--wheelhouse",
+        default=str(DEFAULT_WHEELHOUSE),
+        help=f"Directory of prebuilt wheels to install from when present (default: {DEFAULT_WHEELHOUSE}); "
+             f"fill it with: pip wheel -r {LOCKFILE} -w <dir>"
+    )
+    return parser.parse_args(argv)
+
 def main():
     """Main setup process."""
+    args = parse_args()
+    
     print("Universal ADK Agent Starter Kit - Setup")
     print("="*60)
     
@@ -231,12 +528,12 @@ def main():
         sys.exit(1)
     
     # Clone repositories
-    if not clone_repositories():
+    if not clone_repositories(args.url_base, args.mirror_cache, args.workers):
         print("\nRepository cloning failed. Please check your internet connection.")
         sys.exit(1)
     
     # Set up Python environment
-    if not setup_python_environment():
+    if not setup_python_environment(args.wheelhouse):
         print("\nPython environment setup failed.")
         sys.exit(1)
     
@@ -0,0 +1,21 @@
+"""Response caching for generated agents."""
+
+from .response_cache import (
+    ResponseCache,
+    SqliteResponseStore,
+    cache_callbacks,
+    chain_callbacks,
+    normalize_contents,
+    normalize_request,
+    request_key,
+)
+
+__all__ = [
+    "ResponseCache",
+    "SqliteResponseStore",
+    "cache_callbacks",
+    "chain_callbacks",
+    "normalize_contents",
+    "normalize_request",
+    "request_key",
+]
@@ -0,0 +1,507 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Exact-match response cache for ADK agents.
+
+Repeated identical model requests (FAQ-style questions to customer-service
+agents, for instance) are answered from the cache instead of the model. A
+request is keyed on its normalized form: model, system instruction, tools,
+generation config and contents, with the per-run ids of function calls and
+responses dropped and text parts stripped of surrounding whitespace.
+
+Entries live in an in-process LRU with a TTL and, optionally, a SQLite store
+shared by every process on the host. Concurrent identical requests are
+coalesced: the first goes to the model and the rest wait for its response.
+If that request fails, is cancelled or is still unanswered after
+wait_timeout, the next identical request goes to the model in its place.
+
+Agents enable it through model callbacks:
+
+    response_cache = ResponseCache.from_config(config["features"]["response_cache"])
+    root_agent = Agent(
+        ...,
+        **cache_callbacks(response_cache, before_model_callback=rate_limit_callback),
+    )
+
+Hit/miss counters are available from `ResponseCache.metrics()` and are
+exported as OpenTelemetry counters when opentelemetry-api is installed.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+try:
+    from opentelemetry import metrics as otel_metrics
+except ImportError:  # opentelemetry-api is optional
+    otel_metrics = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300.0
+# How long after an in-flight request started identical ones stop waiting for
+# it and call the model themselves
+DEFAULT_WAIT_TIMEOUT = 30.0
+
+METRIC_NAMES = (
+    "hits",
+    "misses",
+    "coalesced",
+    "store_hits",
+    "expired",
+    "evicted",
+    "stored",
+)
+
+# Parts whose ids ADK generates per run; the ids must not change the key
+CALL_FIELDS = ("function_call", "function_response")
+
+
+def normalize_contents(
+    contents: list[types.Content], strip_text: bool = False
+) -> list[dict]:
+    """Dump request contents for hashing, without per-run function call ids.
+
+    Only function_call.id and function_response.id are dropped; args,
+    responses and everything else are kept exactly as sent. With
+    strip_text, text parts lose their surrounding whitespace.
+    """
+    normalized = []
+    for content in contents:
+        dumped = content.model_dump(mode="json", exclude_none=True)
+        for part in dumped.get("parts", ()):
+            for field in CALL_FIELDS:
+                if field in part:
+                    part[field].pop("id", None)
+            if strip_text and "text" in part:
+                part["text"] = part["text"].strip()
+        normalized.append(dumped)
+    return normalized
+
+
+def normalize_request(llm_request: LlmRequest) -> dict[str, Any]:
+    """Dump the parts of a request that determine the answer, for hashing."""
+    config = llm_request.config.model_dump(mode="json", exclude_none=True)
+    # Transport settings do not change the answer
+    config.pop("http_options", None)
+    return {
+        "model": llm_request.model,
+        "config": config,
+        "contents": normalize_contents(llm_request.contents, strip_text=True),
+    }
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """Return the exact-match cache key of a normalized request."""
+    normalized = normalize_request(llm_request)
+    serialized = json.dumps(
+        normalized, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(llm_response: LlmResponse) -> bool:
+    """Only complete, successful responses with content are cached."""
+    return (
+        llm_response.content is not None
+        and not llm_response.partial
+        and not llm_response.error_code
+    )
+
+
+def _pending_key(callback_context: CallbackContext) -> tuple[str, str]:
+    return (callback_context.invocation_id, callback_context.agent_name)
+
+
+class _Flight(NamedTuple):
+    """A request on its way to the model that identical requests can wait for."""
+
+    future: asyncio.Future
+    task: asyncio.Task | None
+    started_at: float
+
+
+def _land(flight: _Flight, llm_response: LlmResponse | None) -> None:
+    """Hand a flight's waiters the response, or None to call the model themselves."""
+    if not flight.future.done() and not flight.future.get_loop().is_closed():
+        flight.future.set_result(llm_response)
+
+
+def _abandon(flight: _Flight) -> None:
+    """Send a replaced flight's waiters on to the flight that replaced it."""
+    if not flight.future.done() and not flight.future.get_loop().is_closed():
+        flight.future.cancel()
+
+
+class _Pending(NamedTuple):
+    """A request awaiting its model response, watched in case it is cancelled."""
+
+    key: str
+    task: asyncio.Task | None
+    on_task_done: Callable[[asyncio.Task], None]
+
+
+class SqliteResponseStore:
+    """Response store shared between processes through a local SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " response TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> LlmResponse | None:
+        cursor = self._connection().execute(
+            "SELECT response FROM responses WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        )
+        row = cursor.fetchone()
+        return LlmResponse.model_validate_json(row[0]) if row else None
+
+    def put(self, key: str, llm_response: LlmResponse, ttl_seconds: float) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO responses (key, response, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET"
+                " response = excluded.response, expires_at = excluded.expires_at",
+                (
+                    key,
+                    llm_response.model_dump_json(exclude_none=True),
+                    time.time() + ttl_seconds,
+                ),
+            )
+
+    def purge_expired(self) -> int:
+        """Delete expired rows; return how many were removed."""
+        with self._connection() as conn:
+            return conn.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+
+
+class ResponseCache:
+    """In-process LRU+TTL response cache with single-flight coalescing."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        store: SqliteResponseStore | None = None,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+        name: str = "default",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self.wait_timeout = wait_timeout
+        self.name = name
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._inflight: dict[str, _Flight] = {}
+        # (invocation id, agent name) -> the request awaiting its response
+        self._pending: dict[tuple, _Pending] = {}
+        self._counts = dict.fromkeys(METRIC_NAMES, 0)
+        self._otel_counters = self._create_otel_counters()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any] | None) -> "ResponseCache | None":
+        """Build a cache from the features.response_cache section of starter-kit.yaml.
+
+        Returns None when the section is missing or not enabled.
+        """
+        if not config or not config.get("enabled", False):
+            return None
+        store_path = config.get("shared_store")
+        return cls(
+            max_entries=int(config.get("max_entries", DEFAULT_MAX_ENTRIES)),
+            ttl_seconds=float(config.get("ttl_seconds", DEFAULT_TTL_SECONDS)),
+            store=SqliteResponseStore(store_path) if store_path else None,
+            wait_timeout=float(config.get("wait_timeout", DEFAULT_WAIT_TIMEOUT)),
+            name=config.get("name", "default"),
+        )
+
+    def _create_otel_counters(self) -> dict[str, Any]:
+        if otel_metrics is None:
+            return {}
+        meter = otel_metrics.get_meter(__name__)
+        return {
+            name: meter.create_counter(
+                f"adk.response_cache.{name}", description=f"Response cache {name}"
+            )
+            for name in METRIC_NAMES
+        }
+
+    def _count(self, name: str) -> None:
+        self._counts[name] += 1
+        counter = self._otel_counters.get(name)
+        if counter is not None:
+            counter.add(1, {"cache": self.name})
+
+    def metrics(self) -> dict[str, Any]:
+        """Counters plus current size and hit ratio."""
+        lookups = self._counts["hits"] + self._counts["misses"]
+        return {
+            **self._counts,
+            "size": len(self._entries),
+            "inflight": len(self._inflight),
+            "hit_ratio": self._counts["hits"] / lookups if lookups else 0.0,
+        }
+
+    def get(self, key: str) -> LlmResponse | None:
+        """Look a key up in memory, then in the shared store; counts no hit/miss."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, llm_response = entry
+            if expires_at > self._clock():
+                self._entries.move_to_end(key)
+                return llm_response
+            del self._entries[key]
+            self._count("expired")
+        if self.store is not None:
+            llm_response = self.store.get(key)
+            if llm_response is not None:
+                self._count("store_hits")
+                self._remember(key, llm_response)
+                return llm_response
+        return None
+
+    def _remember(self, key: str, llm_response: LlmResponse) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, llm_response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._count("evicted")
+
+    def put(self, key: str, llm_response: LlmResponse) -> None:
+        """Cache a response in memory and in the shared store."""
+        self._remember(key, llm_response)
+        if self.store is not None:
+            self.store.put(key, llm_response, self.ttl_seconds)
+        self._count("stored")
+
+    def _resolve(self, key: str, llm_response: LlmResponse | None) -> None:
+        flight = self._inflight.pop(key, None)
+        if flight is not None:
+            _land(flight, llm_response)
+
+    def _is_live(self, flight: _Flight) -> bool:
+        """Whether waiting for an in-flight request can still pay off."""
+        return (
+            not flight.future.done()
+            and flight.future.get_loop() is asyncio.get_running_loop()
+            # A task makes one request at a time; its own flight was abandoned
+            and flight.task is not asyncio.current_task()
+            and (flight.task is None or not flight.task.done())
+            and self._clock() - flight.started_at < self.wait_timeout
+        )
+
+    async def _wait(self, key: str, flight: _Flight) -> LlmResponse | None:
+        """Wait for a flight's response; None if it fails, is abandoned or goes stale.
+
+        Waiters watch the leader's task too, so they wake as soon as it is
+        cancelled instead of at the timeout.
+        """
+        waiting = {flight.future}
+        if flight.task is not None:
+            waiting.add(flight.task)
+        timeout = flight.started_at + self.wait_timeout - self._clock()
+        done, _ = await asyncio.wait(
+            waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+        if flight.future.done():
+            return None if flight.future.cancelled() else flight.future.result()
+        if not done:
+            logger.warning("Timed out waiting for in-flight request %s", key[:12])
+        return None
+
+    def _track(self, callback_context: CallbackContext, key: str) -> None:
+        """Remember the request until its response, error or cancellation."""
+        pending_key = _pending_key(callback_context)
+        self._release(pending_key)
+        task = asyncio.current_task()
+
+        def on_task_done(_: asyncio.Task) -> None:
+            # Cancelled (or otherwise gone) before either model callback ran.
+            # Its waiters wake on the task and elect a new leader among them.
+            if self._pending.pop(pending_key, None) is None:
+                return
+            flight = self._inflight.get(key)
+            if flight is not None and flight.task is task:
+                del self._inflight[key]
+                _abandon(flight)
+
+        if task is not None:
+            task.add_done_callback(on_task_done)
+        self._pending[pending_key] = _Pending(key, task, on_task_done)
+
+    def _release(self, pending_key: tuple) -> str | None:
+        """Forget a tracked request; return its key, or None if it was not tracked."""
+        pending = self._pending.pop(pending_key, None)
+        if pending is None:
+            return None
+        if pending.task is not None:
+            pending.task.remove_done_callback(pending.on_task_done)
+        return pending.key
+
+    async def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        """Answer from the cache, or wait for an identical in-flight request."""
+        key = request_key(llm_request)
+        llm_response = self.get(key)
+        if llm_response is not None:
+            self._count("hits")
+            return llm_response
+
+        flight = self._inflight.get(key)
+        while flight is not None and self._is_live(flight):
+            llm_response = await self._wait(key, flight)
+            if llm_response is not None:
+                self._count("coalesced")
+                return llm_response
+            if flight.future.done() and not flight.future.cancelled():
+                # The in-flight request failed; retry against the model
+                break
+            replacement = self._inflight.get(key)
+            if replacement is flight:
+                # Timed out waiting for it: this request takes its place
+                break
+            # Its leader is gone: wait for whoever took over
+            flight = replacement
+
+        # This request goes to the model; identical ones wait for it
+        self._count("misses")
+        flight = self._inflight.get(key)
+        if flight is None or not self._is_live(flight):
+            if flight is not None:
+                # Replace a flight that was abandoned or went stale
+                _abandon(flight)
+            self._inflight[key] = _Flight(
+                asyncio.get_running_loop().create_future(),
+                asyncio.current_task(),
+                self._clock(),
+            )
+        self._track(callback_context, key)
+        return None
+
+    async def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> LlmResponse | None:
+        """Store the model's response and release coalesced waiters."""
+        if llm_response.partial:
+            return None
+        key = self._release(_pending_key(callback_context))
+        if key is None:
+            return None
+        if is_cacheable(llm_response):
+            self.put(key, llm_response)
+            self._resolve(key, llm_response)
+        else:
+            self._resolve(key, None)
+        return None
+
+    async def on_model_error_callback(
+        self,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception,
+    ) -> LlmResponse | None:
+        """Release coalesced waiters so they retry against the model themselves."""
+        key = self._release(_pending_key(callback_context))
+        if key is not None:
+            self._resolve(key, None)
+        return None
+
+
+def chain_callbacks(*callbacks: Callable | None) -> Callable | None:
+    """Combine model callbacks into one; the first non-None result wins.
+
+    Works with sync and async callbacks and with ADK versions that accept
+    only a single callback per hook.
+    """
+    callbacks = [callback for callback in callbacks if callback is not None]
+    if not callbacks:
+        return None
+    if len(callbacks) == 1:
+        return callbacks[0]
+
+    async def chained(*args, **kwargs):
+        for callback in callbacks:
+            result = callback(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                result = await result
+            if result is not None:
+                return result
+        return None
+
+    return chained
+
+
+def cache_callbacks(
+    cache: ResponseCache | None,
+    before_model_callback: Callable | None = None,
+    after_model_callback: Callable | None = None,
+    on_model_error_callback: Callable | None = None,
+) -> dict[str, Callable | None]:
+    """Agent keyword arguments that wire a cache in around existing callbacks.
+
+    The agent's own before_model_callback runs first (e.g. rate limiting
+    applies before a cache lookup), and its after_model_callback runs
+    before the response is cached. With no cache the callbacks are returned
+    unchanged.
+    """
+    if cache is None:
+        return {
+            "before_model_callback": before_model_callback,
+            "after_model_callback": after_model_callback,
+            "on_model_error_callback": on_model_error_callback,
+        }
+
+    async def after_model(callback_context, llm_response):
+        # The cache stores whatever response the agent's own callback settles on
+        result = (
+            after_model_callback(callback_context, llm_response)
+            if after_model_callback
+            else None
+        )
+        if asyncio.iscoroutine(result):
+            result = await result
+        await cache.after_model_callback(callback_context, result or llm_response)
+        return result
+
+    return {
+        "before_model_callback": chain_callbacks(
+            before_model_callback, cache.before_model_callback
+        ),
+        "after_model_callback": after_model,
+        "on_model_error_callback": chain_callbacks(
+            cache.on_model_error_callback, on_model_error_callback
+        ),
+    }
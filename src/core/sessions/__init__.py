@@ -0,0 +1,17 @@
+"""Session persistence and history bounds for generated agents."""
+
+from .history import (
+    HistoryPolicy,
+    estimate_tokens,
+    extractive_summarizer,
+    history_callbacks,
+)
+from .sqlite_session_service import SqliteSessionService
+
+__all__ = [
+    "HistoryPolicy",
+    "SqliteSessionService",
+    "estimate_tokens",
+    "extractive_summarizer",
+    "history_callbacks",
+]
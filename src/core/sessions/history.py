@@ -0,0 +1,350 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Bounded conversation history for ADK agents.
+
+Without a bound, every turn sends the whole session to the model, so
+latency and cost grow with the conversation. A HistoryPolicy trims the
+session's events at the start of each invocation, before the model is
+called:
+
+    off       keep everything
+    window    keep the last max_events events
+    budget    keep the newest events that fit in max_tokens
+    summary   as budget, but fold dropped events into a rolling summary
+              event at the head of the history
+
+Events are only dropped a whole turn at a time (a user message and
+everything up to the next one), so function calls are never separated
+from their responses, and the current turn is always kept. Only the
+in-memory session is trimmed; the session service keeps the full history.
+
+Each event's token estimate is computed once, when it is first seen, and
+the policy keeps a running total per session, so checking the budget costs
+O(1) per turn however long the conversation gets. The rolling summary is
+extended with only the newly dropped events.
+
+Agents enable it through their before_agent_callback:
+
+    defaults = config["agent_defaults"]
+    history_policy = HistoryPolicy.from_config(
+        defaults["history"], max_tokens=defaults["max_tokens"]
+    )
+    root_agent = Agent(
+        ...,
+        **history_callbacks(history_policy, before_agent_callback=before_agent),
+    )
+"""
+
+import json
+import logging
+from collections import OrderedDict, deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.events.event import Event
+from google.adk.sessions.session import Session
+from google.genai import types
+
+from ..cache import chain_callbacks
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "window", "budget", "summary")
+
+DEFAULT_MAX_TOKENS = 2048
+DEFAULT_SUMMARY_TOKENS = 256
+DEFAULT_WINDOW_EVENTS = 50
+DEFAULT_MAX_SESSIONS = 1024
+
+# Rough average for English text with Gemini and GPT tokenizers
+CHARS_PER_TOKEN = 4
+# Gemini bills each image as a fixed number of tokens
+INLINE_DATA_TOKENS = 258
+# Longest excerpt of a single message kept by the default summarizer
+SNIPPET_CHARS = 200
+
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+
+Summarizer = Callable[[str, Sequence[Event]], str]
+
+
+def estimate_tokens(event: Event) -> int:
+    """Approximate the tokens an event adds to a model request."""
+    if event.content is None or not event.content.parts:
+        return 0
+    chars = 0
+    tokens = 0
+    for part in event.content.parts:
+        if part.text:
+            chars += len(part.text)
+        if part.function_call:
+            chars += len(part.function_call.name or "")
+            chars += len(json.dumps(part.function_call.args or {}, default=str))
+        if part.function_response:
+            chars += len(part.function_response.name or "")
+            chars += len(json.dumps(part.function_response.response or {}, default=str))
+        if part.inline_data or part.file_data:
+            tokens += INLINE_DATA_TOKENS
+    return tokens + (chars + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def is_turn_start(event: Event) -> bool:
+    """A user message, as opposed to a function response sent on the user's behalf."""
+    if event.author != "user" or event.content is None or not event.content.parts:
+        return False
+    return not any(part.function_response for part in event.content.parts)
+
+
+def _excerpt(event: Event) -> str | None:
+    if event.content is None or not event.content.parts:
+        return None
+    texts = [
+        part.text for part in event.content.parts if part.text and not part.thought
+    ]
+    if texts:
+        text = " ".join(" ".join(texts).split())
+        if len(text) > SNIPPET_CHARS:
+            text = text[: SNIPPET_CHARS - 3].rstrip() + "..."
+        return f"{event.author}: {text}"
+    calls = [
+        part.function_call.name for part in event.content.parts if part.function_call
+    ]
+    if calls:
+        return f"{event.author} called {', '.join(calls)}"
+    return None
+
+
+def extractive_summarizer(summary_tokens: int = DEFAULT_SUMMARY_TOKENS) -> Summarizer:
+    """Summarize by appending a short excerpt of each dropped message.
+
+    The oldest lines are discarded once the summary exceeds summary_tokens.
+    """
+    max_chars = summary_tokens * CHARS_PER_TOKEN
+
+    def summarize(summary: str, events: Sequence[Event]) -> str:
+        lines = summary.splitlines() if summary else []
+        lines.extend(line for line in map(_excerpt, events) if line)
+        size = sum(len(line) + 1 for line in lines)
+        start = 0
+        while size > max_chars and start < len(lines) - 1:
+            size -= len(lines[start]) + 1
+            start += 1
+        return "\n".join(lines[start:])[-max_chars:]
+
+    return summarize
+
+
+def _session_key(session: Session) -> tuple[str, str, str]:
+    return (session.app_name, session.user_id, session.id)
+
+
+class _Entry(NamedTuple):
+    event_id: str
+    tokens: int
+    turn_start: bool
+
+
+@dataclass
+class _SessionHistory:
+    """What the policy remembers about one session between turns."""
+
+    # Events kept for the model, oldest first
+    kept: deque[_Entry] = field(default_factory=deque)
+    kept_tokens: int = 0
+    kept_turns: int = 0
+    # Events dropped from the head of the full history so far
+    dropped: int = 0
+    summary: str = ""
+    summary_event: Event | None = None
+
+
+class HistoryPolicy:
+    """Keeps the history an agent sends to the model within a bound."""
+
+    def __init__(
+        self,
+        mode: str = "summary",
+        max_tokens: int | None = DEFAULT_MAX_TOKENS,
+        max_events: int | None = None,
+        summary_tokens: int = DEFAULT_SUMMARY_TOKENS,
+        summarizer: Summarizer | None = None,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+    ):
+        if mode not in MODES:
+            raise ValueError(
+                f"Unknown history policy {mode!r}; expected one of {', '.join(MODES)}"
+            )
+        if mode == "window" and not max_events:
+            raise ValueError("The window policy needs max_events")
+        if mode in ("budget", "summary") and not max_tokens:
+            raise ValueError(f"The {mode} policy needs max_tokens")
+        self.mode = mode
+        self.max_tokens = max_tokens if mode != "window" else None
+        self.max_events = max_events or None
+        self.summary_tokens = summary_tokens if mode == "summary" else 0
+        self.summarizer = summarizer or extractive_summarizer(summary_tokens)
+        self.max_sessions = max_sessions
+        self._sessions: OrderedDict[tuple, _SessionHistory] = OrderedDict()
+        self._counts = {"compactions": 0, "dropped_events": 0}
+
+    @classmethod
+    def from_config(
+        cls, config: dict[str, Any] | None, max_tokens: int | None = None
+    ) -> "HistoryPolicy | None":
+        """Build a policy from the agent_defaults.history section of starter-kit.yaml.
+
+        max_tokens defaults to agent_defaults.max_tokens and the window policy
+        to DEFAULT_WINDOW_EVENTS events. Returns None when the section is
+        missing or its policy is "off".
+        """
+        if not config or config.get("policy", "off") == "off":
+            return None
+        max_events = int(config.get("max_events") or 0)
+        if config["policy"] == "window" and not max_events:
+            max_events = DEFAULT_WINDOW_EVENTS
+        return cls(
+            mode=config["policy"],
+            max_tokens=int(
+                config.get("max_tokens") or max_tokens or DEFAULT_MAX_TOKENS
+            ),
+            max_events=max_events,
+            summary_tokens=int(config.get("summary_tokens", DEFAULT_SUMMARY_TOKENS)),
+            max_sessions=int(config.get("max_sessions", DEFAULT_MAX_SESSIONS)),
+        )
+
+    def metrics(self) -> dict[str, int]:
+        return {**self._counts, "sessions": len(self._sessions)}
+
+    def _history(self, session: Session) -> _SessionHistory:
+        key = _session_key(session)
+        history = self._sessions.get(key)
+        if history is None:
+            history = self._sessions[key] = _SessionHistory()
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(key)
+        return history
+
+    def forget(self, session: Session) -> None:
+        """Drop what the policy remembers about a session, e.g. once it is deleted."""
+        self._sessions.pop(_session_key(session), None)
+
+    def _kept_start(self, history: _SessionHistory, events: list[Event]) -> int | None:
+        """Index of the first kept event in `events`, or None if they are unfamiliar.
+
+        `events` is either a session this policy already trimmed (the summary
+        event, then the kept events) or a freshly loaded full history.
+        """
+        if not history.kept:
+            # Turns are dropped only while a later one is kept, so this is a new session
+            return 0
+        first_id = history.kept[0].event_id
+        for start in (
+            1 if history.summary_event is not None else 0,
+            0,
+            history.dropped,
+        ):
+            if start < len(events) and events[start].id == first_id:
+                break
+        else:
+            return None
+        last = start + len(history.kept) - 1
+        if last >= len(events) or events[last].id != history.kept[-1].event_id:
+            return None
+        return start
+
+    def _over_budget(self, history: _SessionHistory) -> bool:
+        if self.max_events and len(history.kept) > self.max_events:
+            return True
+        return (
+            bool(self.max_tokens)
+            and history.kept_tokens > self.max_tokens - self.summary_tokens
+        )
+
+    def _drop_turn(self, history: _SessionHistory) -> int:
+        """Drop the oldest turn if a later one is kept; returns the events dropped."""
+        later_turns = history.kept_turns - (1 if history.kept[0].turn_start else 0)
+        if later_turns < 1:
+            return 0
+        dropped = 0
+        while dropped == 0 or not history.kept[0].turn_start:
+            entry = history.kept.popleft()
+            history.kept_tokens -= entry.tokens
+            history.kept_turns -= entry.turn_start
+            dropped += 1
+        return dropped
+
+    def apply(self, session: Session) -> int:
+        """Trim session.events to the policy's bound; returns the events dropped."""
+        if self.mode == "off":
+            return 0
+        events = session.events
+        history = self._history(session)
+        start = self._kept_start(history, events)
+        if start is None:
+            # Not the history this policy last saw (e.g. loaded with a limit)
+            logger.debug("Recounting history of session %s", session.id)
+            history = self._sessions[_session_key(session)] = _SessionHistory()
+            start = 0
+
+        for event in events[start + len(history.kept) :]:
+            entry = _Entry(event.id, estimate_tokens(event), is_turn_start(event))
+            history.kept.append(entry)
+            history.kept_tokens += entry.tokens
+            history.kept_turns += entry.turn_start
+
+        dropped = 0
+        while self._over_budget(history):
+            count = self._drop_turn(history)
+            if not count:
+                break
+            dropped += count
+
+        if dropped:
+            dropped_events = events[start : start + dropped]
+            history.dropped += dropped
+            if self.mode == "summary":
+                history.summary = self.summarizer(history.summary, dropped_events)
+                history.summary_event = Event(
+                    invocation_id=dropped_events[-1].invocation_id,
+                    author="user",
+                    content=types.Content(
+                        role="user",
+                        parts=[types.Part(text=f"{SUMMARY_HEADER}\n{history.summary}")],
+                    ),
+                    timestamp=dropped_events[-1].timestamp,
+                )
+            self._counts["compactions"] += 1
+            self._counts["dropped_events"] += dropped
+
+        head = [history.summary_event] if history.summary_event is not None else []
+        if dropped or events[:start] != head:
+            session.events[:] = head + events[start + dropped :]
+        return dropped
+
+    async def before_agent_callback(self, callback_context: CallbackContext) -> None:
+        """Trim the invocation's session before the agent calls the model."""
+        # ReadonlyContext.session is missing from early 1.x releases
+        self.apply(callback_context._invocation_context.session)
+        return None
+
+
+def history_callbacks(
+    policy: HistoryPolicy | None,
+    before_agent_callback: Callable | None = None,
+) -> dict[str, Callable | None]:
+    """Agent keyword arguments that trim history before the agent's callback.
+
+    The policy runs before the agent's own before_agent_callback. With no
+    policy the callback is returned unchanged.
+    """
+    if policy is None:
+        return {"before_agent_callback": before_agent_callback}
+    return {
+        "before_agent_callback": chain_callbacks(
+            policy.before_agent_callback, before_agent_callback
+        )
+    }
@@ -0,0 +1,588 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""SQLite session service for local development and single-node production.
+
+A drop-in replacement for ADK's InMemorySessionService whose sessions
+survive restarts and whose memory use does not grow with every event:
+
+    session_service = SqliteSessionService(".starter-kit/sessions.db")
+    runner = Runner(
+        agent=root_agent, app_name=APP_NAME, session_service=session_service
+    )
+    try:
+        ...
+    finally:
+        await runner.close()  # flushes pending events
+        session_service.close()
+
+Layout:
+- `sessions` is keyed by (app_name, user_id, session_id) and holds session
+  state, update time and event count; a second index orders sessions by
+  update time for list_sessions.
+- `events` is append-only, keyed by (app_name, user_id, session_id, seq).
+  Rows are only ever inserted, or removed together with their session.
+- `app_states` and `user_states` hold `app:`- and `user:`-prefixed state,
+  merged into every session returned, as InMemorySessionService does.
+
+The database runs in WAL mode, so readers never block the writer.
+Appended events are buffered and committed together: once `batch_size`
+events are pending, `flush_interval` seconds after the first pending event
+(by a background thread, so it does not depend on the event loop still
+running), on `flush()` and on `close()`. Reads flush first, so they always
+see every appended event. Services still open at interpreter exit are
+closed by an atexit hook. A crash can lose at most `flush_interval` seconds
+of events; use `batch_size=1` to commit every event.
+
+Events are loaded lazily. `get_session` honours GetSessionConfig in SQL,
+and `max_loaded_events` caps how many recent events it loads when the
+caller sets no limit. Older events stay on disk and can be paged through
+with `list_events` or `iter_events`.
+
+Only one process should write to a database, which suits single-node
+deployments; any number of processes may read it.
+"""
+
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import (
+    BaseSessionService,
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+
+try:
+    from google.adk.errors.already_exists_error import AlreadyExistsError
+    from google.adk.errors.session_not_found_error import SessionNotFoundError
+except ImportError:  # older ADK releases raise ValueError
+    AlreadyExistsError = SessionNotFoundError = ValueError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 0.05
+DEFAULT_PAGE_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (app_name, user_id, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS sessions_by_update_time
+    ON sessions (app_name, update_time);
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+) WITHOUT ROWID;
+"""
+
+# Filters on a session key, in the sessions and events tables
+SESSION_WHERE = "WHERE app_name = ? AND user_id = ? AND id = ?"
+EVENTS_WHERE = "WHERE app_name = ? AND user_id = ? AND session_id = ?"
+
+SessionKey = tuple[str, str, str]
+
+# Services not yet closed, committed at interpreter exit
+_open_services: "weakref.WeakSet[SqliteSessionService]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_services() -> None:
+    for service in list(_open_services):
+        service.close()
+
+
+def split_state(
+    state: dict[str, Any]
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Split state into (app, user, session) parts.
+
+    Prefixes are dropped from app and user keys, and temp keys are dropped.
+    """
+    app_state, user_state, session_state = {}, {}, {}
+    for key, value in state.items():
+        if key.startswith(State.APP_PREFIX):
+            app_state[key[len(State.APP_PREFIX) :]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_state[key[len(State.USER_PREFIX) :]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_state[key] = value
+    return app_state, user_state, session_state
+
+
+class SqliteSessionService(BaseSessionService):
+    """Session service on a local SQLite database in WAL mode."""
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_loaded_events: int | None = None,
+    ):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_loaded_events = max_loaded_events
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # (session key, event) pairs appended but not yet committed
+        self._pending: list[tuple[SessionKey, Event]] = []
+        # When the flusher thread commits the pending events (time.monotonic)
+        self._flush_due: float | None = None
+        self._wakeup = threading.Condition(self._lock)
+        self._flusher: threading.Thread | None = None
+        self._closed = False
+        # Sessions known to exist, so appends need no lookup
+        self._known: set = set()
+        _open_services.add(self)
+
+    def close(self) -> None:
+        """Commit pending events, stop the flusher thread and close the database."""
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_pending()
+            self._closed = True
+            self._wakeup.notify()
+            self._conn.close()
+        _open_services.discard(self)
+        if (
+            self._flusher is not None
+            and self._flusher is not threading.current_thread()
+        ):
+            self._flusher.join()
+
+    def __enter__(self) -> "SqliteSessionService":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Writes
+
+    async def flush(self) -> None:
+        with self._lock:
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        """Commit every pending event, with its state changes, in one transaction."""
+        self._flush_due = None
+        if not self._pending:
+            return
+        # Cleared only once committed, so the next flush retries a failed batch
+        pending = self._pending
+
+        # key -> [state delta, update time, event count]
+        session_updates: dict[SessionKey, list[Any]] = {}
+        app_updates: dict[str, dict[str, Any]] = {}
+        user_updates: dict[tuple[str, str], dict[str, Any]] = {}
+        rows = []
+        for key, event in pending:
+            app_name, user_id, session_id = key
+            rows.append(
+                (
+                    *key,
+                    event.id,
+                    event.timestamp,
+                    event.model_dump_json(exclude_none=True),
+                    *key,
+                )
+            )
+            update = session_updates.setdefault(key, [{}, event.timestamp, 0])
+            update[1] = event.timestamp
+            update[2] += 1
+            if event.actions and event.actions.state_delta:
+                app_delta, user_delta, session_delta = split_state(
+                    event.actions.state_delta
+                )
+                update[0].update(session_delta)
+                if app_delta:
+                    app_updates.setdefault(app_name, {}).update(app_delta)
+                if user_delta:
+                    user_updates.setdefault((app_name, user_id), {}).update(user_delta)
+
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO events"
+                " (app_name, user_id, session_id, seq, id, timestamp, event)"
+                " SELECT ?, ?, ?, COALESCE(MAX(seq), 0) + 1, ?, ?, ?"
+                f" FROM events {EVENTS_WHERE}",
+                rows,
+            )
+            for key, (delta, update_time, count) in session_updates.items():
+                if delta:
+                    row = conn.execute(
+                        f"SELECT state FROM sessions {SESSION_WHERE}", key
+                    ).fetchone()
+                    state = {**json.loads(row[0]), **delta} if row else delta
+                    conn.execute(
+                        "UPDATE sessions SET state = ?, update_time = ?,"
+                        f" event_count = event_count + ? {SESSION_WHERE}",
+                        (json.dumps(state), update_time, count, *key),
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE sessions SET update_time = ?,"
+                        f" event_count = event_count + ? {SESSION_WHERE}",
+                        (update_time, count, *key),
+                    )
+            for app_name, delta in app_updates.items():
+                self._merge_scoped_state("app_states", (app_name,), delta)
+            for (app_name, user_id), delta in user_updates.items():
+                self._merge_scoped_state("user_states", (app_name, user_id), delta)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._pending = []
+
+    def _merge_scoped_state(
+        self, table: str, key: tuple, delta: dict[str, Any]
+    ) -> None:
+        columns = ("app_name", "user_id")[: len(key)]
+        where = " AND ".join(f"{column} = ?" for column in columns)
+        row = self._conn.execute(
+            f"SELECT state FROM {table} WHERE {where}", key
+        ).fetchone()
+        state = {**json.loads(row[0]), **delta} if row else delta
+        self._conn.execute(
+            f"INSERT INTO {table} ({', '.join(columns)}, state)"
+            f" VALUES ({', '.join('?' * len(key))}, ?)"
+            f" ON CONFLICT({', '.join(columns)})"
+            " DO UPDATE SET state = excluded.state",
+            (*key, json.dumps(state)),
+        )
+
+    def _schedule_flush(self) -> None:
+        if len(self._pending) >= self.batch_size:
+            self._flush_pending()
+        elif self._flush_due is None:
+            self._flush_due = time.monotonic() + self.flush_interval
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run_flusher,
+                    name=f"sqlite-session-flush-{id(self):x}",
+                    daemon=True,
+                )
+                self._flusher.start()
+            self._wakeup.notify()
+
+    def _run_flusher(self) -> None:
+        """Commit pending events once they are flush_interval old, until closed."""
+        with self._wakeup:
+            while not self._closed:
+                if self._flush_due is None:
+                    self._wakeup.wait()
+                    continue
+                delay = self._flush_due - time.monotonic()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+                    continue
+                try:
+                    self._flush_pending()
+                except sqlite3.Error:
+                    # The events stay pending; the next flush retries them
+                    logger.exception("Could not commit pending session events")
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: dict[str, Any] | None = None,
+        session_id: str | None = None,
+    ) -> Session:
+        session_id = (session_id or "").strip() or str(uuid.uuid4())
+        app_delta, user_delta, session_state = split_state(state or {})
+        now = time.time()
+        with self._lock:
+            self._flush_pending()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO sessions"
+                    " (app_name, user_id, id, state, create_time, update_time)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        app_name,
+                        user_id,
+                        session_id,
+                        json.dumps(session_state),
+                        now,
+                        now,
+                    ),
+                )
+                if app_delta:
+                    self._merge_scoped_state("app_states", (app_name,), app_delta)
+                if user_delta:
+                    self._merge_scoped_state(
+                        "user_states", (app_name, user_id), user_delta
+                    )
+                conn.execute("COMMIT")
+            except sqlite3.IntegrityError:
+                conn.execute("ROLLBACK")
+                raise AlreadyExistsError(
+                    f"Session with id {session_id} already exists."
+                )
+            self._known.add((app_name, user_id, session_id))
+            session = Session(
+                app_name=app_name,
+                user_id=user_id,
+                id=session_id,
+                state=session_state,
+                last_update_time=now,
+            )
+            return self._merge_state(session)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        if key not in self._known:
+            with self._lock:
+                if not self._session_exists(key):
+                    raise SessionNotFoundError(f"Session {session.id} not found.")
+            self._known.add(key)
+        # Applies the state delta to the caller's session object
+        event = await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        with self._lock:
+            self._pending.append((key, event))
+            self._schedule_flush()
+        return event
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        key = (app_name, user_id, session_id)
+        with self._lock:
+            self._flush_pending()
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f"DELETE FROM events {EVENTS_WHERE}", key)
+            conn.execute(f"DELETE FROM sessions {SESSION_WHERE}", key)
+            conn.execute("COMMIT")
+            self._known.discard(key)
+
+    # Reads
+
+    def _session_exists(self, key: SessionKey) -> bool:
+        row = self._conn.execute(f"SELECT 1 FROM sessions {SESSION_WHERE}", key)
+        return row.fetchone() is not None
+
+    def _scoped_state(
+        self, app_name: str, user_id: str
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        app_row = self._conn.execute(
+            "SELECT state FROM app_states WHERE app_name = ?", (app_name,)
+        ).fetchone()
+        user_row = self._conn.execute(
+            "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?",
+            (app_name, user_id),
+        ).fetchone()
+        app_state = json.loads(app_row[0]) if app_row else {}
+        user_state = json.loads(user_row[0]) if user_row else {}
+        return app_state, user_state
+
+    def _merge_state(
+        self,
+        session: Session,
+        app_state: dict[str, Any] | None = None,
+        user_state: dict[str, Any] | None = None,
+    ) -> Session:
+        if app_state is None or user_state is None:
+            app_state, user_state = self._scoped_state(
+                session.app_name, session.user_id
+            )
+        session.state.update(
+            {State.APP_PREFIX + key: value for key, value in app_state.items()}
+        )
+        session.state.update(
+            {State.USER_PREFIX + key: value for key, value in user_state.items()}
+        )
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: GetSessionConfig | None = None,
+    ) -> Session | None:
+        key = (app_name, user_id, session_id.strip() if session_id else session_id)
+        with self._lock:
+            self._flush_pending()
+            row = self._conn.execute(
+                f"SELECT state, update_time FROM sessions {SESSION_WHERE}", key
+            ).fetchone()
+            if row is None:
+                return None
+            self._known.add(key)
+
+            limit = config.num_recent_events if config else None
+            if limit is None:
+                limit = self.max_loaded_events
+            after = config.after_timestamp if config else None
+            query = f"SELECT event FROM events {EVENTS_WHERE}"
+            params: list = list(key)
+            if after is not None:
+                query += " AND timestamp >= ?"
+                params.append(after)
+            query += " ORDER BY seq DESC"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            events = [
+                Event.model_validate_json(event)
+                for (event,) in self._conn.execute(query, params)
+            ]
+            events.reverse()
+
+            session = Session(
+                app_name=app_name,
+                user_id=user_id,
+                id=key[2],
+                state=json.loads(row[0]),
+                events=events,
+                last_update_time=row[1],
+            )
+            return self._merge_state(session)
+
+    async def list_events(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        page_token: int | None = None,
+    ) -> tuple[list[Event], int | None]:
+        """One page of a session's events, oldest first.
+
+        Pass the returned token back to get the next page; it is None after
+        the last page.
+        """
+        with self._lock:
+            self._flush_pending()
+            rows = self._conn.execute(
+                f"SELECT seq, event FROM events {EVENTS_WHERE}"
+                " AND seq > ? ORDER BY seq LIMIT ?",
+                (app_name, user_id, session_id, page_token or 0, page_size + 1),
+            ).fetchall()
+        next_token = rows[page_size - 1][0] if len(rows) > page_size else None
+        events = [Event.model_validate_json(event) for _, event in rows[:page_size]]
+        return events, next_token
+
+    async def iter_events(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[Event]:
+        """Every event of a session, oldest first, loaded a page at a time."""
+        page_token = None
+        while True:
+            events, page_token = await self.list_events(
+                app_name=app_name,
+                user_id=user_id,
+                session_id=session_id,
+                page_size=page_size,
+                page_token=page_token,
+            )
+            for event in events:
+                yield event
+            if page_token is None:
+                return
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: str | None = None
+    ) -> ListSessionsResponse:
+        with self._lock:
+            self._flush_pending()
+            user_filter = " AND user_id = ?" if user_id is not None else ""
+            params = [app_name] if user_id is None else [app_name, user_id]
+            rows = self._conn.execute(
+                "SELECT user_id, id, state, update_time FROM sessions"
+                f" WHERE app_name = ?{user_filter}"
+                " ORDER BY update_time, user_id, id",
+                params,
+            ).fetchall()
+            # Scoped state is read once per call, not once per session
+            app_row = self._conn.execute(
+                "SELECT state FROM app_states WHERE app_name = ?", (app_name,)
+            ).fetchone()
+            app_state = json.loads(app_row[0]) if app_row else {}
+            user_rows = self._conn.execute(
+                "SELECT user_id, state FROM user_states"
+                f" WHERE app_name = ?{user_filter}",
+                params,
+            )
+            user_states = {row_user: json.loads(state) for row_user, state in user_rows}
+            sessions = [
+                self._merge_state(
+                    Session(
+                        app_name=app_name,
+                        user_id=row_user,
+                        id=row_id,
+                        state=json.loads(state),
+                        last_update_time=update_time,
+                    ),
+                    app_state,
+                    user_states.get(row_user, {}),
+                )
+                for row_user, row_id, state, update_time in rows
+            ]
+        return ListSessionsResponse(sessions=sessions)
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> dict[str, Any]:
+        with self._lock:
+            self._flush_pending()
+            return self._scoped_state(app_name, user_id)[1]
@@ -0,0 +1,67 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Shared pytest configuration for the starter kit's tests.
+
+Request recording for MockModel defaults to keeping every request. Long soak
+tests can bound it, either per test with a marker:
+
+  @pytest.mark.request_recording('last', 100)
+  def test_soak(): ...
+
+or for the whole session with `--request-recording=summary` or
+`--request-recording=last:100`.
+"""
+
+import pytest
+
+from testing import testing_utils
+
+
+def _parse_request_recording(value: str) -> tuple[str, int | None]:
+    mode, _, limit = value.partition(":")
+    return mode, int(limit) if limit else None
+
+
+def _marker_request_recording(
+    mode: str = "all", limit: int | None = None
+) -> tuple[str, int | None]:
+    """Binds request_recording marker arguments, given by position or keyword."""
+    return mode, limit
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--request-recording",
+        default="all",
+        help=(
+            "How MockModel records requests: all, last:N or summary[:N]"
+            " (default: all)"
+        ),
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "request_recording(mode, limit=None): recording mode for MockModels"
+        " created in this test",
+    )
+
+
+@pytest.fixture(autouse=True)
+def request_recording(request):
+    """Applies the MockModel request recording mode for the current test.
+
+    Yields the (mode, limit) in effect and restores the previous default
+    afterwards.
+    """
+    marker = request.node.get_closest_marker("request_recording")
+    if marker:
+        mode, limit = _marker_request_recording(*marker.args, **marker.kwargs)
+    else:
+        mode, limit = _parse_request_recording(
+            request.config.getoption("--request-recording")
+        )
+    previous = testing_utils.set_default_request_recording(mode, limit)
+    yield mode, limit
+    testing_utils.set_default_request_recording(*previous)
@@ -0,0 +1,171 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""create_agent.py's StagingArea and ManifestStore: atomic writes and sync."""
+
+import importlib.util
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def create_agent():
+    spec = importlib.util.spec_from_file_location(
+        "create_agent", ROOT / "create_agent.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+def _leftovers(directory: Path) -> list[str]:
+    return sorted(path.name for path in directory.iterdir() if path.name[0] == ".")
+
+
+def test_commit_writes_new_and_existing_directories(create_agent, tmp_path):
+    (tmp_path / "existing.txt").write_text("old")
+    staging = create_agent.StagingArea()
+    staging.add(tmp_path / "existing.txt", "new")
+    staging.add(tmp_path / "agent/sub/tools.py", "TOOLS = []\n")
+
+    staging.commit()
+
+    assert (tmp_path / "existing.txt").read_text() == "new"
+    assert (tmp_path / "agent/sub/tools.py").read_text() == "TOOLS = []\n"
+    assert _leftovers(tmp_path) == []
+
+
+def test_replaced_files_keep_their_mode(create_agent, tmp_path):
+    script = tmp_path / "run.sh"
+    script.write_text("old")
+    script.chmod(0o755)
+    staging = create_agent.StagingArea()
+    staging.add(script, "new")
+    staging.add(tmp_path / "fresh.txt", "new")
+
+    staging.commit()
+
+    assert _mode(script) == 0o755
+    # New files get the umask default, not mkstemp's owner-only 0600
+    umask = os.umask(0)
+    os.umask(umask)
+    assert _mode(tmp_path / "fresh.txt") == 0o666 & ~umask
+
+
+def test_failed_replace_restores_the_tree(create_agent, tmp_path, monkeypatch):
+    for name in ("a.txt", "b.txt"):
+        (tmp_path / name).write_text(f"old {name}")
+    staging = create_agent.StagingArea()
+    staging.add(tmp_path / "a.txt", "new a")
+    staging.add(tmp_path / "new.txt", "new file")
+    staging.add(tmp_path / "agent/tools.py", "TOOLS = []\n")
+    staging.add(tmp_path / "b.txt", "new b")
+
+    real_replace = os.replace
+
+    def failing_replace(src, dst):
+        if Path(dst).name == "b.txt":
+            raise OSError("disk full")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(create_agent.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        staging.commit()
+    monkeypatch.undo()
+
+    assert (tmp_path / "a.txt").read_text() == "old a.txt"
+    assert (tmp_path / "b.txt").read_text() == "old b.txt"
+    assert not (tmp_path / "new.txt").exists()
+    assert not (tmp_path / "agent").exists()
+    assert _leftovers(tmp_path) == []
+
+
+@pytest.fixture
+def manifest(create_agent, tmp_path):
+    """Open ManifestStores on one database and YAML file; closes them after."""
+    stores = []
+
+    def open_store():
+        store = create_agent.ManifestStore(
+            tmp_path / "manifest.db", tmp_path / "a2a_manifest.yaml"
+        )
+        stores.append(store)
+        return store
+
+    yield open_store
+    for store in stores:
+        store.close()
+
+
+def _yaml_names(path: Path) -> list[str]:
+    return [entry["name"] for entry in yaml.safe_load(path.read_text())["agents"]]
+
+
+def test_yaml_round_trips_through_a_new_store(manifest, tmp_path):
+    store = manifest()
+    store.upsert_many([{"name": "a", "port": 1}, {"name": "b", "port": 2}])
+    store.upsert({"name": "a", "port": 3})
+
+    # A fresh database imports the exported YAML, order and all
+    (tmp_path / "manifest.db").rename(tmp_path / "old.db")
+    reopened = manifest()
+    assert reopened.entries() == [{"name": "a", "port": 3}, {"name": "b", "port": 2}]
+    reopened.export_yaml()
+    assert _yaml_names(tmp_path / "a2a_manifest.yaml") == ["a", "b"]
+
+
+def test_hand_edits_to_the_yaml_survive_the_next_upsert(manifest, tmp_path):
+    yaml_path = tmp_path / "a2a_manifest.yaml"
+    store = manifest()
+    store.upsert({"name": "a"})
+    agents = yaml.safe_load(yaml_path.read_text())["agents"]
+    yaml_path.write_text(yaml.dump({"agents": agents + [{"name": "b"}]}))
+
+    store.upsert({"name": "c"})
+
+    assert _yaml_names(yaml_path) == ["a", "b", "c"]
+    assert store.get("b") == {"name": "b"}
+
+
+def test_yaml_keeps_its_mode(manifest, tmp_path):
+    yaml_path = tmp_path / "a2a_manifest.yaml"
+    store = manifest()
+    store.upsert({"name": "a"})
+    yaml_path.chmod(0o644)
+
+    store.upsert({"name": "b"})
+
+    assert _mode(yaml_path) == 0o644
+
+
+def test_concurrent_upserts_lose_nothing(create_agent, manifest, tmp_path):
+    writers, agents = 4, 25
+
+    def write(writer_id):
+        # One connection per thread, as separate processes would have
+        store = create_agent.ManifestStore(
+            tmp_path / "manifest.db", tmp_path / "a2a_manifest.yaml"
+        )
+        try:
+            for index in range(agents):
+                store.upsert({"name": f"shared_{index}", "writer": writer_id})
+                store.upsert({"name": f"writer_{writer_id}_{index}"})
+        finally:
+            store.close()
+
+    with ThreadPoolExecutor(writers) as executor:
+        list(executor.map(write, range(writers)))
+
+    names = [entry["name"] for entry in manifest().entries()]
+    assert len(names) == len(set(names)) == agents * (writers + 1)
+    assert _yaml_names(tmp_path / "a2a_manifest.yaml") == names
@@ -0,0 +1,150 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Sharding, pass criteria and checkpoint resume of the eval runner."""
+
+import argparse
+import json
+import logging
+
+import pytest
+
+from testing import eval_runner
+
+
+def _case(**fields) -> eval_runner.EvalCase:
+    return eval_runner.EvalCase.from_dict({"query": "hi", **fields}, line=1)
+
+
+def _result(response="", tool_calls=()) -> eval_runner.CaseResult:
+    return eval_runner.CaseResult(
+        id="case", passed=False, latency=0.0, response=response, tool_calls=tool_calls
+    )
+
+
+def _write_cases(path, count: int) -> None:
+    path.write_text(
+        "".join(
+            json.dumps({"id": f"case-{i}", "query": f"Question {i}?"}) + "\n"
+            for i in range(count)
+        )
+    )
+
+
+def test_parse_shard():
+    assert eval_runner.parse_shard("1/4") == (1, 4)
+    with pytest.raises(argparse.ArgumentTypeError):
+        eval_runner.parse_shard("4/4")
+    with pytest.raises(ValueError):
+        eval_runner.parse_shard("first")
+
+
+def test_shards_split_the_cases_between_them(tmp_path):
+    cases = tmp_path / "cases.jsonl"
+    _write_cases(cases, 10)
+    cases.write_text(cases.read_text() + "\n")
+
+    shards = [
+        [case.id for case in eval_runner.iter_cases(str(cases), index, 3)]
+        for index in range(3)
+    ]
+
+    assert sorted(sum(shards, [])) == sorted(f"case-{i}" for i in range(10))
+    assert all(shards)
+
+
+def test_evalset_json_is_read_whole(tmp_path):
+    evalset = tmp_path / "agent_eval.json"
+    evalset.write_text(
+        json.dumps(
+            {
+                "test_cases": [
+                    {
+                        "inputs": {"text": "Look it up"},
+                        "expected_events": [
+                            {"tool_name": "lookup_order"},
+                            {"has_content": False},
+                        ],
+                    }
+                ]
+            }
+        )
+    )
+
+    [case] = eval_runner.iter_cases(str(evalset))
+
+    assert (case.id, case.query) == ("line-1", "Look it up")
+    assert case.expected_tool_use == ("lookup_order",)
+    assert not case.expects_content
+
+
+def test_check_case():
+    check = eval_runner.check_case
+    assert not check(_case(), _result())
+    assert check(_case(), _result("anything"))
+    assert check(_case(expected_events=[{"has_content": False}]), _result())
+
+    tools = _case(expected_tool_use=[{"tool_name": "lookup"}, "refund"])
+    assert check(tools, _result("ok", ["lookup", "refund"]))
+    assert not check(tools, _result("ok", ["refund", "lookup"]))
+
+    reference = _case(reference="Yes,  within 30 days.")
+    assert check(reference, _result("yes, within\n30 DAYS."))
+    assert not check(reference, _result("No."))
+
+
+@pytest.mark.parametrize(
+    "content, kept",
+    [
+        (b"", b""),
+        (b'{"id": "a"}\n', b'{"id": "a"}\n'),
+        (b'{"id": "a"}\n{"id": "b', b'{"id": "a"}\n'),
+        (b'{"id": "torn', b""),
+        # A torn line longer than the 64 KiB block read at a time
+        (b'{"id": "a"}\n' + b"x" * 200_000, b'{"id": "a"}\n'),
+    ],
+)
+def test_drop_torn_line(tmp_path, content, kept):
+    path = tmp_path / "shard-0-of-1.jsonl"
+    path.write_bytes(content)
+
+    eval_runner.drop_torn_line(path)
+
+    assert path.read_bytes() == kept
+
+
+def test_drop_torn_line_ignores_a_missing_file(tmp_path):
+    eval_runner.drop_torn_line(tmp_path / "missing.jsonl")
+
+
+@pytest.fixture
+def restore_logging():
+    # Shard runs silence logging for the whole process
+    yield
+    logging.disable(logging.NOTSET)
+
+
+def test_rerun_resumes_after_the_recorded_cases(tmp_path, capsys, restore_logging):
+    cases, output = tmp_path / "cases.jsonl", tmp_path / "results"
+    _write_cases(cases, 6)
+    args = [str(cases), "--mock", "--mock-latency-ms", "1", "--output", str(output)]
+    args += ["--report", str(tmp_path / "report.json")]
+
+    def report():
+        return json.loads((tmp_path / "report.json").read_text())
+
+    assert eval_runner.main(args + ["--shard", "0/2"]) == 0
+    assert (report()["ran"], report()["cases"]) == (3, 3)
+
+    # Interrupted mid-write: the torn line is dropped and nothing reruns
+    shard = eval_runner.shard_path(str(output), 0, 2)
+    recorded = shard.read_text()
+    shard.write_text(recorded + '{"id": "case-1", "pas')
+    assert eval_runner.main(args + ["--shard", "0/2"]) == 0
+    assert (report()["ran"], report()["resumed_from"]) == (0, 3)
+    assert shard.read_text() == recorded
+
+    # Without --shard, only the other shard's cases are left to run
+    assert eval_runner.main(args) == 0
+    assert (report()["ran"], report()["resumed_from"], report()["cases"]) == (3, 3, 6)
+    assert report()["passed"] == 6
+    assert "resumed after 3" in capsys.readouterr().out
@@ -0,0 +1,114 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Text and trajectory metrics and the score cache of eval_scoring."""
+
+import random
+
+import pytest
+
+from testing import eval_runner, eval_scoring
+
+
+def _reference_lcs(a: list[str], b: list[str]) -> int:
+    """The textbook O(len(a) * len(b)) dynamic program."""
+    table = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            table[i + 1][j + 1] = (
+                table[i][j] + 1 if x == y else max(table[i][j + 1], table[i + 1][j])
+            )
+    return table[-1][-1]
+
+
+def test_bit_parallel_lcs_matches_the_dynamic_program():
+    rng = random.Random(0)
+    for _ in range(500):
+        # Small alphabets force many repeated tokens and partial matches
+        alphabet = [f"t{i}" for i in range(rng.randint(1, 6))]
+        a = rng.choices(alphabet, k=rng.randint(0, 90))
+        b = rng.choices(alphabet, k=rng.randint(0, 90))
+        assert eval_scoring._lcs_length(a, b) == _reference_lcs(a, b), (a, b)
+
+
+def test_tokenize_drops_case_punctuation_and_articles():
+    assert eval_scoring.tokenize("The order, AN item & a refund!") == [
+        "order",
+        "item",
+        "refund",
+    ]
+
+
+@pytest.mark.parametrize(
+    "response, reference, f1, rouge_l, exact",
+    [
+        ("Yes, within 30 days.", "yes within 30 days", 1.0, 1.0, 1.0),
+        ("refund within 30 days", "within 30 days refund", 1.0, 0.75, 0.0),
+        ("cat sat", "cat cat sat", 0.8, 0.8, 0.0),
+        ("No.", "Yes.", 0.0, 0.0, 0.0),
+        ("", "", 1.0, 1.0, 1.0),
+        ("The", "something", 0.0, 0.0, 0.0),
+    ],
+)
+def test_text_scores(response, reference, f1, rouge_l, exact):
+    scores = eval_scoring.score_texts([response], [reference])
+
+    assert scores["f1"] == [pytest.approx(f1)]
+    assert scores["rouge_l"] == [pytest.approx(rouge_l)]
+    assert scores["exact_match"] == [exact]
+
+
+def test_trajectory_match():
+    assert eval_scoring.trajectory_match(
+        [["lookup", "refund"], ["refund", "lookup"], [], ["lookup"]],
+        [("lookup", "refund"), ("lookup", "refund"), None, ()],
+    ) == [1.0, 0.0, None, 0.0]
+
+
+def test_score_cache_persists_across_runs(tmp_path):
+    path = tmp_path / "scores.jsonl"
+    pairs = (["Yes.", "No.", "Yes."], ["yes", "yes", "yes"])
+
+    cache = eval_scoring.ScoreCache(str(path))
+    first = eval_scoring.score_texts(*pairs, cache)
+    cache.save()
+    # Duplicate pairs are looked up and scored once
+    assert (cache.misses, len(cache)) == (2, 2)
+
+    reloaded = eval_scoring.ScoreCache(str(path))
+    assert eval_scoring.score_texts(*pairs, reloaded) == first
+    assert (reloaded.hits, reloaded.misses) == (2, 0)
+    reloaded.save()
+    assert len(path.read_text().splitlines()) == 2
+
+
+def test_score_cache_skips_a_torn_line(tmp_path):
+    path = tmp_path / "scores.jsonl"
+    cache = eval_scoring.ScoreCache(str(path))
+    eval_scoring.score_texts(["Yes."], ["yes"], cache)
+    cache.save()
+    path.write_text(path.read_text() + '["abc", "de')
+
+    assert len(eval_scoring.ScoreCache(str(path))) == 1
+
+
+def test_thresholds_apply_to_scored_results():
+    cases = [
+        eval_runner.EvalCase("close", 1, "q", reference="refund within 30 days"),
+        eval_runner.EvalCase("tools", 2, "q", expected_tool_use=("lookup",)),
+        eval_runner.EvalCase("failed", 3, "q", reference="yes"),
+    ]
+    results = {
+        "close": {"response": "Refund in 30 days", "tool_calls": [], "error": None},
+        "tools": {"response": "Done", "tool_calls": ["refund"], "error": None},
+        "failed": {"response": "", "tool_calls": [], "error": "Timed out"},
+    }
+
+    scores = eval_scoring.score_results(cases, results)
+
+    assert scores["close"]["f1"] == pytest.approx(0.75)
+    assert scores["tools"]["f1"] is None and scores["tools"]["trajectory"] == 0.0
+    lenient = eval_scoring.Thresholds(f1=0.6, trajectory=False)
+    assert [lenient.passes(scores[case.id]) for case in cases] == [True, True, False]
+    strict = eval_scoring.Thresholds(f1=0.6, exact_match=True)
+    summary = eval_scoring.summarize(scores, strict)
+    assert (summary["passed"], summary["mean_trajectory"]) == (0, 0.0)
@@ -0,0 +1,167 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""extract.py's GitObjectSource against bare fixture repos cloned over file://."""
+
+import importlib.util
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="git is not installed"
+)
+
+
+@pytest.fixture(scope="module")
+def extract():
+    spec = importlib.util.spec_from_file_location("extract", ROOT / "extract.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=Fixture",
+            "-c",
+            "user.email=fixture@example.com",
+            "-c",
+            "init.defaultBranch=main",
+            *args,
+        ],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+def _commit(work: Path, files: dict[str, str], message: str) -> str:
+    for name, content in files.items():
+        path = work / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    _git(work, "add", "-A")
+    _git(work, "commit", "-q", "-m", message)
+    return _git(work, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def fixture_repo(tmp_path):
+    """A bare `sample-repo.git` with two commits; returns (root, shas)."""
+    work = tmp_path / "work"
+    work.mkdir()
+    _git(work, "init", "-q")
+    first = _commit(
+        work,
+        {
+            "agent.py": 'root_agent = "v1"\n',
+            "pkg/tools.py": "def tool():\n  return 1\n",
+            "pkg/sub/util.py": "VALUE = 1\n",
+            "pkg/data.txt": "raw data\n",
+        },
+        "first",
+    )
+    second = _commit(work, {"agent.py": 'root_agent = "v2"\n'}, "second")
+    repos = tmp_path / "repos"
+    repos.mkdir()
+    _git(repos, "clone", "-q", "--bare", work.as_uri(), "sample-repo.git")
+    return repos, {"first": first, "second": second}
+
+
+def _extraction(source: str, dest: str, transform: str) -> dict[str, str]:
+    return {
+        "source": source,
+        "dest": dest,
+        "transform": transform,
+        "attribution": "example/sample-repo/",
+    }
+
+
+def test_single_file_at_head_records_commit(extract, fixture_repo, tmp_path):
+    repos, shas = fixture_repo
+    source = extract.GitObjectSource.discover(repos, ["sample-repo"])
+    try:
+        result = extract.process_extraction(
+            _extraction("sample-repo/agent.py", "out/agent.py", "add_attribution_only"),
+            source,
+            tmp_path,
+        )
+    finally:
+        source.close()
+
+    assert result["status"] == "ok", result["error"]
+    assert result["commit"] == shas["second"]
+    content = (tmp_path / "out/agent.py").read_text()
+    assert f'# Source commit: {shas["second"]}\n' in content
+    assert content.startswith("# Extracted from example/sample-repo/\n")
+    assert content.endswith('root_agent = "v2"\n')
+
+
+def test_pinned_commit_reads_old_blobs(extract, fixture_repo, tmp_path):
+    repos, shas = fixture_repo
+    source = extract.GitObjectSource.discover(
+        repos, ["sample-repo"], pins={"sample-repo": shas["first"][:10]}
+    )
+    try:
+        result = extract.process_extraction(
+            _extraction("sample-repo/agent.py", "out/agent.py", "add_attribution_only"),
+            source,
+            tmp_path,
+        )
+    finally:
+        source.close()
+
+    assert result["commit"] == shas["first"]
+    content = (tmp_path / "out/agent.py").read_text()
+    assert f'# Source commit: {shas["first"]}\n' in content
+    assert content.endswith('root_agent = "v1"\n')
+
+
+def test_directory_copies_tree_with_python_headers(extract, fixture_repo, tmp_path):
+    repos, shas = fixture_repo
+    source = extract.GitObjectSource.discover(repos, ["sample-repo"])
+    try:
+        result = extract.process_extraction(
+            _extraction("sample-repo/pkg", "out/pkg", "copy_directory"),
+            source,
+            tmp_path,
+        )
+    finally:
+        source.close()
+
+    assert result["status"] == "ok", result["error"]
+    out = tmp_path / "out/pkg"
+    assert sorted(
+        str(path.relative_to(out)) for path in out.rglob("*") if path.is_file()
+    ) == ["data.txt", "sub/util.py", "tools.py"]
+    tools = (out / "tools.py").read_text()
+    assert f'# Source commit: {shas["second"]}\n' in tools
+    assert tools.endswith("def tool():\n  return 1\n")
+    # Non-Python files are copied byte for byte, without a header
+    assert (out / "data.txt").read_text() == "raw data\n"
+
+
+def test_unknown_pin_is_an_error(extract, fixture_repo, tmp_path):
+    repos, _ = fixture_repo
+    source = extract.GitObjectSource.discover(
+        repos, ["sample-repo"], pins={"sample-repo": "no-such-branch"}
+    )
+    try:
+        result = extract.process_extraction(
+            _extraction("sample-repo/agent.py", "out/agent.py", "add_attribution_only"),
+            source,
+            tmp_path,
+        )
+    finally:
+        source.close()
+
+    assert result["status"] == "error"
+    assert "no-such-branch" in result["error"]
@@ -0,0 +1,182 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Turn-aware trimming, resume and session eviction of HistoryPolicy."""
+
+import logging
+
+import pytest
+from google.adk.events.event import Event
+from google.adk.sessions.session import Session
+from google.genai import types
+
+from core.sessions import HistoryPolicy
+from core.sessions.history import SUMMARY_HEADER, is_turn_start
+
+
+def _event(author: str, part: types.Part) -> Event:
+    role = "user" if author == "user" else "model"
+    return Event(
+        invocation_id="inv",
+        author=author,
+        content=types.Content(role=role, parts=[part]),
+    )
+
+
+def _turn(index: int, words: int = 10) -> list[Event]:
+    """A user message, a tool call and its response, then the answer."""
+    text = " ".join(f"word{index}" for _ in range(words))
+    return [
+        _event("user", types.Part(text=f"question {index} {text}")),
+        _event(
+            "agent",
+            types.Part(function_call=types.FunctionCall(name="lookup", args={})),
+        ),
+        _event(
+            "user",
+            types.Part(
+                function_response=types.FunctionResponse(
+                    name="lookup", response={"result": index}
+                )
+            ),
+        ),
+        _event("agent", types.Part(text=f"answer {index} {text}")),
+    ]
+
+
+def _session(turns: int, session_id: str = "s1", words: int = 10) -> Session:
+    events = [event for index in range(turns) for event in _turn(index, words)]
+    return Session(app_name="app", user_id="user", id=session_id, events=events)
+
+
+def _assert_whole_turns(session: Session, summary: bool = False) -> None:
+    events = session.events[1:] if summary else session.events
+    assert is_turn_start(events[0])
+    calls = responses = 0
+    for event in events:
+        calls += len(event.get_function_calls())
+        responses += len(event.get_function_responses())
+        # A response never arrives before its call
+        assert responses <= calls
+
+
+def test_window_drops_whole_turns_only():
+    policy = HistoryPolicy("window", max_events=6)
+    session = _session(3)
+
+    dropped = policy.apply(session)
+
+    # Keeping 6 events would start mid-turn; the whole oldest two turns go
+    assert dropped == 8
+    assert len(session.events) == 4
+    _assert_whole_turns(session)
+    assert session.events[0].content.parts[0].text.startswith("question 2")
+
+
+def test_current_turn_is_kept_even_over_budget():
+    policy = HistoryPolicy("budget", max_tokens=10)
+    session = _session(2, words=50)
+
+    policy.apply(session)
+
+    assert len(session.events) == 4
+    assert session.events[0].content.parts[0].text.startswith("question 1")
+
+
+def test_budget_keeps_the_newest_turns_that_fit():
+    policy = HistoryPolicy("budget", max_tokens=100)
+    session = _session(6)
+
+    policy.apply(session)
+
+    _assert_whole_turns(session)
+    assert policy._sessions[("app", "user", "s1")].kept_tokens <= 100
+    assert session.events[-1].content.parts[0].text.startswith("answer 5")
+
+
+def test_summary_folds_dropped_turns_into_the_head():
+    policy = HistoryPolicy("summary", max_tokens=150, summary_tokens=50)
+    session = _session(6)
+
+    dropped = policy.apply(session)
+
+    head = session.events[0].content.parts[0].text
+    assert head.startswith(SUMMARY_HEADER)
+    summary = head[len(SUMMARY_HEADER) + 1 :]
+    # The newest dropped turn is in; the oldest lines made way for it
+    assert f"user: question {dropped // 4 - 1}" in summary
+    assert "agent called lookup" in summary
+    assert "question 0" not in summary and len(summary) <= 50 * 4
+    _assert_whole_turns(session, summary=True)
+    assert len(session.events) == 6 * 4 - dropped + 1
+
+
+def _copy(session: Session, events: list[Event]) -> Session:
+    return Session(
+        app_name=session.app_name,
+        user_id=session.user_id,
+        id=session.id,
+        events=list(events),
+    )
+
+
+@pytest.mark.parametrize("mode", ["window", "budget", "summary"])
+def test_resume_after_a_full_reload(mode, caplog):
+    def policy():
+        return HistoryPolicy(mode, max_tokens=150, max_events=6, summary_tokens=50)
+
+    full, new_turn = _session(5), _turn(5)
+    # One runner keeps the trimmed session in memory between invocations
+    in_memory, kept = policy(), _copy(full, full.events)
+    in_memory.apply(kept)
+    kept.events.extend(new_turn)
+    # Another loads the full history from its session service every time
+    reloading, reloaded = policy(), _copy(full, full.events + new_turn)
+    reloading.apply(_copy(full, full.events))
+    assert reloading._sessions[("app", "user", "s1")].dropped
+
+    with caplog.at_level(logging.DEBUG, logger="core.sessions.history"):
+        in_memory.apply(kept)
+        reloading.apply(reloaded)
+
+    assert "Recounting" not in caplog.text
+    head = 1 if mode == "summary" else 0
+    assert [e.id for e in reloaded.events[head:]] == [e.id for e in kept.events[head:]]
+    assert reloaded.events[0].content == kept.events[0].content
+    _assert_whole_turns(reloaded, summary=mode == "summary")
+
+
+def test_a_limited_reload_is_recounted(caplog):
+    policy = HistoryPolicy("window", max_events=6)
+    full = _session(3)
+    policy.apply(_copy(full, full.events))
+
+    # Loaded with a limit: starts after the first event the policy kept
+    partial = _copy(full, full.events[-3:])
+    with caplog.at_level(logging.DEBUG, logger="core.sessions.history"):
+        policy.apply(partial)
+
+    assert "Recounting" in caplog.text
+
+
+def test_least_recently_used_sessions_are_forgotten():
+    policy = HistoryPolicy("window", max_events=6, max_sessions=2)
+    sessions = {name: _session(3, name) for name in ("a", "b", "c")}
+
+    policy.apply(sessions["a"])
+    policy.apply(sessions["b"])
+    policy.apply(sessions["a"])
+    policy.apply(sessions["c"])
+
+    assert [key[2] for key in policy._sessions] == ["a", "c"]
+    assert policy.metrics()["sessions"] == 2
+    policy.forget(sessions["a"])
+    assert [key[2] for key in policy._sessions] == ["c"]
+
+
+def test_invalid_policies_are_rejected():
+    with pytest.raises(ValueError):
+        HistoryPolicy("everything")
+    with pytest.raises(ValueError):
+        HistoryPolicy("window")
+    assert HistoryPolicy.from_config({"policy": "off"}) is None
+    assert HistoryPolicy.from_config({"policy": "window"}).max_events == 50
@@ -0,0 +1,57 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""The test InMemoryRunner's private event loop is always released."""
+
+import gc
+
+import pytest
+from google.adk.agents.llm_agent import LlmAgent
+
+from testing import testing_utils
+
+
+def _runner() -> testing_utils.InMemoryRunner:
+    model = testing_utils.MockModel.create(["first", "second"])
+    return testing_utils.InMemoryRunner(LlmAgent(name="agent", model=model))
+
+
+def _text(events) -> list[str]:
+    return [event.content.parts[0].text for event in events]
+
+
+def test_turns_share_one_loop_until_close():
+    runner = _runner()
+    assert _text(runner.run("one")) == ["first"]
+    assert _text(runner.run("two")) == ["second"]
+    assert len(runner.session.events) == 4
+
+    runner.close()
+    runner.close()
+    assert runner._loop.is_closed()
+
+
+def test_context_manager_closes_the_loop():
+    with _runner() as runner:
+        runner.run("one")
+    assert runner._loop.is_closed()
+
+
+def test_unclosed_runner_closes_its_loop_when_collected():
+    runner = _runner()
+    runner.run("one")
+    loop = runner._loop
+
+    del runner
+    gc.collect()
+    assert loop.is_closed()
+
+
+@pytest.mark.asyncio
+async def test_runner_collected_inside_a_running_loop():
+    runner = _runner()
+    assert _text(await runner.run_async("one")) == ["first"]
+    loop = runner._loop
+
+    del runner
+    gc.collect()
+    assert loop.is_closed()
@@ -0,0 +1,112 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""The reactive MockLlmConnection and live sessions driven through it."""
+
+import asyncio
+import time
+
+import pytest
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from testing import live_harness, testing_utils
+
+
+def _responses(*texts: str) -> list[LlmResponse]:
+    return [
+        LlmResponse(content=testing_utils.ModelContent([types.Part(text=text)]))
+        for text in texts
+    ]
+
+
+async def _receive_turn(connection) -> list[LlmResponse]:
+    return [response async for response in connection.receive()]
+
+
+def _texts(responses: list[LlmResponse]) -> list[str | None]:
+    return [
+        response.content.parts[0].text if response.content else None
+        for response in responses
+    ]
+
+
+@pytest.mark.asyncio
+async def test_replaying_connection_yields_everything_at_once():
+    connection = testing_utils.MockLlmConnection(_responses("a", "b"))
+
+    assert _texts(await _receive_turn(connection)) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_reactive_connection_answers_each_turn():
+    connection = testing_utils.MockLlmConnection(_responses("a", "b"), reactive=True)
+    receiving = asyncio.create_task(_receive_turn(connection))
+    await asyncio.sleep(0.01)
+    assert not receiving.done()
+
+    await connection.send_content(testing_utils.UserContent("hi"))
+    first = await asyncio.wait_for(receiving, 1)
+    assert _texts(first) == ["a", "b", None]
+    assert first[-1].turn_complete
+
+    # An audio turn ends with ActivityEnd; its chunks are counted
+    receiving = asyncio.create_task(_receive_turn(connection))
+    await connection.send_realtime(types.ActivityStart())
+    for _ in range(3):
+        await connection.send_realtime(types.Blob(data=b"\0\0", mime_type="audio/pcm"))
+    await connection.send_realtime(types.ActivityEnd())
+    assert len(await asyncio.wait_for(receiving, 1)) == 3
+    assert (connection.turns, connection.realtime_chunks) == (2, 3)
+
+    receiving = asyncio.create_task(_receive_turn(connection))
+    await connection.close()
+    assert await asyncio.wait_for(receiving, 1) == []
+
+
+@pytest.mark.asyncio
+async def test_reactive_connection_models_latency():
+    connection = testing_utils.MockLlmConnection(
+        _responses("a", "b", "c"),
+        reactive=True,
+        time_to_first_chunk=testing_utils.LatencyDistribution.fixed(0.05),
+        chunk_delay=testing_utils.LatencyDistribution.fixed(0.02),
+    )
+    await connection.send_content(testing_utils.UserContent("hi"))
+
+    start = time.perf_counter()
+    arrivals = []
+    async for _ in connection.receive():
+        arrivals.append(time.perf_counter() - start)
+
+    # Slack for the loop clock and perf_counter differing in resolution
+    assert arrivals[0] >= 0.045
+    assert arrivals[2] - arrivals[0] >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_latency_model_connections_are_reactive_and_recorded():
+    model = testing_utils.LatencyMockModel.create(["a"])
+
+    async with model.connect(LlmRequest(model="mock")) as connection:
+        assert connection.reactive
+    assert model.recorder.count == 1
+
+
+@pytest.mark.asyncio
+async def test_live_sessions_complete_every_turn():
+    model = testing_utils.LatencyMockModel.create(["chunk 0 ", "chunk 1 "])
+    model.time_to_first_chunk = testing_utils.LatencyDistribution.fixed(0.01)
+    agent = LlmAgent(name="live_agent", model=model, instruction="Answer.")
+    script = [
+        live_harness.TextTurn("Hello"),
+        live_harness.AudioTurn(seconds=0.06, chunk_ms=20),
+    ]
+
+    report = await live_harness.run_live_sessions(agent, script, 3, turn_timeout=5)
+
+    assert report.errors == []
+    assert report.turns_completed == 6
+    assert len(report.time_to_first_response) == 6
+    assert min(report.time_to_first_response) >= 0.009
@@ -0,0 +1,97 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Record, replay and LRU eviction of the test LLM cache."""
+
+import os
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from core.cache import request_key as response_cache_key
+from testing import llm_cache, testing_utils
+
+
+def _request(text: str, timeout: int | None = None) -> LlmRequest:
+    return LlmRequest(
+        model="mock",
+        contents=[testing_utils.UserContent(text)],
+        config=types.GenerateContentConfig(
+            http_options=types.HttpOptions(timeout=timeout) if timeout else None
+        ),
+    )
+
+
+async def _generate(model, llm_request: LlmRequest) -> list[str]:
+    return [
+        response.content.parts[0].text
+        async for response in model.generate_content_async(llm_request)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_without_the_wrapped_model(tmp_path):
+    inner = testing_utils.MockModel.create(["first", "second"])
+    recording = llm_cache.CachingLlm.wrap(inner, str(tmp_path), "record")
+
+    assert await _generate(recording, _request("hi")) == ["first"]
+    assert await _generate(recording, _request("hi")) == ["first"]
+    assert inner.recorder.count == 1
+    assert (recording.cache.hits, recording.cache.misses) == (1, 1)
+
+    replaying = llm_cache.CachingLlm.wrap(None, str(tmp_path), "replay", model="mock")
+    assert await _generate(replaying, _request("hi")) == ["first"]
+    with pytest.raises(llm_cache.CacheMissError):
+        await _generate(replaying, _request("something else"))
+
+
+@pytest.mark.asyncio
+async def test_passthrough_stores_nothing(tmp_path):
+    inner = testing_utils.MockModel.create(["first", "second"])
+    model = llm_cache.CachingLlm.wrap(inner, str(tmp_path), "passthrough")
+
+    assert await _generate(model, _request("hi")) == ["first"]
+    assert await _generate(model, _request("hi")) == ["second"]
+    assert model.cache.size() == 0
+
+
+def test_replay_needs_a_model_name(tmp_path):
+    with pytest.raises(ValueError):
+        llm_cache.CachingLlm.wrap(None, str(tmp_path), "replay")
+
+
+def test_keys_ignore_http_options_like_the_response_cache():
+    plain, with_timeout = _request("hi"), _request("hi", timeout=30_000)
+
+    assert llm_cache.request_key(None, plain, stream=False) == llm_cache.request_key(
+        None, with_timeout, stream=False
+    )
+    assert response_cache_key(plain) == response_cache_key(with_timeout)
+    assert llm_cache.request_key(None, plain, stream=False) != llm_cache.request_key(
+        None, plain, stream=True
+    )
+
+
+def _responses(text: str) -> list[LlmResponse]:
+    return [LlmResponse(content=testing_utils.ModelContent([types.Part(text=text)]))]
+
+
+def test_eviction_drops_the_least_recently_used_entry(tmp_path):
+    cache = llm_cache.LlmCache(str(tmp_path))
+    for key in ("aa01", "bb02"):
+        cache.put(key, _responses(key))
+    entry_size = cache.size() // 2
+    # Explicit mtimes, so the order does not depend on timestamp resolution
+    os.utime(cache._path("aa01"), ns=(1, 1))
+    os.utime(cache._path("bb02"), ns=(2, 2))
+
+    # A fresh cache reads last-use order from the files; the hit touches aa01
+    cache = llm_cache.LlmCache(str(tmp_path), max_bytes=entry_size * 5 // 2)
+    assert cache.get("aa01") is not None
+    cache.put("cc03", _responses("cc03"))
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01")[0].content.parts[0].text == "aa01"
+    assert cache.get("cc03")[0].content.parts[0].text == "cc03"
+    assert cache.size() <= cache.max_bytes
@@ -0,0 +1,64 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Request keys must ignore per-run call ids but nothing else."""
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from core.cache import request_key
+from testing import llm_cache
+
+
+def _tool_request(call_id: str, order_id: str) -> LlmRequest:
+    return LlmRequest(
+        model="gemini-2.0-flash",
+        contents=[
+            types.Content(role="user", parts=[types.Part(text="Where is my order?")]),
+            types.Content(
+                role="model",
+                parts=[
+                    types.Part(
+                        function_call=types.FunctionCall(
+                            id=call_id, name="get_order", args={"id": order_id}
+                        )
+                    )
+                ],
+            ),
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part(
+                        function_response=types.FunctionResponse(
+                            id=call_id,
+                            name="get_order",
+                            response={"id": order_id, "status": "shipped"},
+                        )
+                    )
+                ],
+            ),
+        ],
+    )
+
+
+def test_response_cache_key_ignores_call_ids():
+    assert request_key(_tool_request("adk-1", "A")) == request_key(
+        _tool_request("adk-2", "A")
+    )
+
+
+def test_response_cache_key_keeps_tool_args():
+    assert request_key(_tool_request("adk-1", "A")) != request_key(
+        _tool_request("adk-1", "B")
+    )
+
+
+def test_llm_cache_key_ignores_call_ids():
+    assert llm_cache.request_key(
+        None, _tool_request("adk-1", "A"), stream=False
+    ) == llm_cache.request_key(None, _tool_request("adk-2", "A"), stream=False)
+
+
+def test_llm_cache_key_keeps_tool_args():
+    assert llm_cache.request_key(
+        None, _tool_request("adk-1", "A"), stream=False
+    ) != llm_cache.request_key(None, _tool_request("adk-1", "B"), stream=False)
@@ -0,0 +1,87 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""MockModel request recording: per instance, bounded, reset between tests."""
+
+import pytest
+from google.adk.models.llm_request import LlmRequest
+
+from testing import testing_utils
+
+
+def _request(text: str) -> LlmRequest:
+    return LlmRequest(model="mock", contents=[testing_utils.UserContent(text)])
+
+
+def _call(model: testing_utils.MockModel, *texts: str) -> None:
+    for text in texts:
+        list(model.generate_content(_request(text)))
+
+
+def _texts(requests: list[LlmRequest]) -> list[str]:
+    return [request.contents[0].parts[0].text for request in requests]
+
+
+@pytest.mark.request_recording("all")
+def test_each_model_has_its_own_recorder():
+    first = testing_utils.MockModel.create(["a", "b"])
+    second = testing_utils.MockModel.create(["c"])
+
+    _call(first, "one", "two")
+    _call(second, "three")
+
+    assert first.recorder is not second.recorder
+    assert _texts(first.requests) == ["one", "two"]
+    assert _texts(second.requests) == ["three"]
+
+
+def test_last_mode_keeps_only_the_newest_requests():
+    recorder = testing_utils.RequestRecorder("last", 2)
+    for text in ("one", "two", "three", "four"):
+        recorder.record(_request(text))
+
+    assert recorder.count == 4
+    assert _texts(recorder.requests) == ["three", "four"]
+
+
+def test_summary_mode_keeps_summaries_only():
+    recorder = testing_utils.RequestRecorder("summary", 1)
+    recorder.record(_request("one"))
+    recorder.record(_request("two"))
+
+    assert recorder.count == 2
+    assert recorder.requests == []
+    [summary] = recorder.summaries
+    assert summary.num_contents == 1
+    assert summary == testing_utils.summarize_request(_request("two"))
+
+
+def test_last_mode_needs_a_limit():
+    with pytest.raises(ValueError):
+        testing_utils.RequestRecorder("last")
+
+
+# The next three tests run in file order: the marked test and the test that
+# changes the default itself must not leak their mode into the one after.
+
+
+@pytest.mark.request_recording("last", 1)
+def test_marker_sets_the_mode_of_new_models():
+    model = testing_utils.MockModel.create(["a", "b", "c"])
+    _call(model, "one", "two", "three")
+
+    assert (model.recorder.mode, model.recorder.limit) == ("last", 1)
+    assert model.recorder.count == 3
+    assert _texts(model.requests) == ["three"]
+
+
+def test_default_changed_inside_a_test():
+    testing_utils.set_default_request_recording("summary")
+
+    assert testing_utils.RequestRecorder().mode == "summary"
+
+
+def test_fixture_restores_the_session_default(request_recording, pytestconfig):
+    session_default = pytestconfig.getoption("--request-recording")
+    assert request_recording[0] == session_default.partition(":")[0]
+    recorder = testing_utils.MockModel.create(["a"]).recorder
+    assert (recorder.mode, recorder.limit) == request_recording
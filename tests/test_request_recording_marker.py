@@ -0,0 +1,25 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""The request_recording marker accepts positional and keyword arguments."""
+
+import pytest
+
+
+@pytest.mark.request_recording("last", 100)
+def test_positional_marker(request_recording):
+    assert request_recording == ("last", 100)
+
+
+@pytest.mark.request_recording(mode="last", limit=5)
+def test_keyword_marker(request_recording):
+    assert request_recording == ("last", 5)
+
+
+@pytest.mark.request_recording("summary", limit=10)
+def test_mixed_marker(request_recording):
+    assert request_recording == ("summary", 10)
+
+
+@pytest.mark.request_recording(mode="summary")
+def test_keyword_mode_without_limit(request_recording):
+    assert request_recording == ("summary", None)
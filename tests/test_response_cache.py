@@ -0,0 +1,302 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Single-flight coalescing, cancellation and TTL of the response cache."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from core.cache import (
+    ResponseCache,
+    SqliteResponseStore,
+    cache_callbacks,
+    request_key,
+)
+from testing import testing_utils
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _request(text: str = "Where is my order?") -> LlmRequest:
+    return LlmRequest(
+        model="gemini-2.0-flash",
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+    )
+
+
+def _response(text: str = "It shipped.") -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=text)])
+    )
+
+
+def _context(invocation_id: str) -> SimpleNamespace:
+    return SimpleNamespace(invocation_id=invocation_id, agent_name="agent")
+
+
+async def _turn(cache, invocation_id, model_call):
+    """One model call wrapped in the cache's callbacks, as an agent makes it."""
+    context = _context(invocation_id)
+    cached = await cache.before_model_callback(context, _request())
+    if cached is not None:
+        return cached
+    try:
+        llm_response = await model_call()
+    except Exception as e:
+        await cache.on_model_error_callback(context, _request(), e)
+        raise
+    await cache.after_model_callback(context, llm_response)
+    return llm_response
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_model_call():
+    cache = ResponseCache()
+    release = asyncio.Event()
+    calls = 0
+
+    async def model_call():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return _response()
+
+    turns = [
+        asyncio.create_task(_turn(cache, f"inv-{i}", model_call)) for i in range(5)
+    ]
+    await _settle()
+    release.set()
+    responses = await asyncio.gather(*turns)
+
+    assert calls == 1
+    assert {response.content.parts[0].text for response in responses} == {"It shipped."}
+    metrics = cache.metrics()
+    assert (metrics["misses"], metrics["coalesced"]) == (1, 4)
+    assert (metrics["inflight"], cache._pending) == (0, {})
+
+    await _turn(cache, "inv-later", model_call)
+    assert cache.metrics()["hits"] == 1
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_over_at_once():
+    cache = ResponseCache(wait_timeout=30)
+    never = asyncio.Event()
+
+    async def stuck_call():
+        await never.wait()
+
+    async def model_call():
+        return _response()
+
+    leader = asyncio.create_task(_turn(cache, "leader", stuck_call))
+    await _settle()
+    follower = asyncio.create_task(_turn(cache, "follower", model_call))
+    await _settle()
+    assert not follower.done()
+
+    leader.cancel()
+    # Far sooner than wait_timeout: the follower calls the model itself
+    response = await asyncio.wait_for(follower, 1)
+
+    assert response.content.parts[0].text == "It shipped."
+    assert cache._pending == {}
+    assert cache.metrics()["inflight"] == 0
+    assert cache.get(request_key(_request())) is not None
+
+
+@pytest.mark.asyncio
+async def test_followers_of_a_cancelled_leader_coalesce_again():
+    cache = ResponseCache(wait_timeout=30)
+    never, release = asyncio.Event(), asyncio.Event()
+    calls = 0
+
+    async def stuck_call():
+        await never.wait()
+
+    async def model_call():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return _response()
+
+    leader = asyncio.create_task(_turn(cache, "leader", stuck_call))
+    await _settle()
+    followers = [
+        asyncio.create_task(_turn(cache, f"inv-{i}", model_call)) for i in range(3)
+    ]
+    await _settle()
+    leader.cancel()
+    await _settle()
+    release.set()
+    await asyncio.wait_for(asyncio.gather(*followers), 1)
+
+    # The first woken follower leads; the others wait for it, not the model
+    assert calls == 1
+    assert cache.metrics()["coalesced"] == 2
+    assert cache._pending == {}
+    assert cache.metrics()["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_flight_is_replaced_without_waiting():
+    clock = FakeClock()
+    cache = ResponseCache(wait_timeout=30, clock=clock)
+    never = asyncio.Event()
+
+    async def stuck_call():
+        await never.wait()
+
+    # A leader that never answers but is not cancelled either
+    leader = asyncio.create_task(_turn(cache, "leader", stuck_call))
+    await _settle()
+    stale = cache._inflight[request_key(_request())]
+
+    clock.now += 31
+    response = await asyncio.wait_for(_turn(cache, "next", _async(_response())), 1)
+
+    assert response.content.parts[0].text == "It shipped."
+    assert stale.future.cancelled()
+    assert cache.metrics()["inflight"] == 0
+    leader.cancel()
+    await _settle()
+    assert cache._pending == {}
+
+
+@pytest.mark.asyncio
+async def test_waiters_that_time_out_coalesce_on_one_replacement():
+    cache = ResponseCache(wait_timeout=0.05)
+    never, release = asyncio.Event(), asyncio.Event()
+    calls = 0
+
+    async def stuck_call():
+        await never.wait()
+
+    async def model_call():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return _response()
+
+    leader = asyncio.create_task(_turn(cache, "leader", stuck_call))
+    await _settle()
+    waiters = [
+        asyncio.create_task(_turn(cache, f"inv-{i}", model_call)) for i in range(3)
+    ]
+    await asyncio.sleep(0.1)
+    release.set()
+    await asyncio.wait_for(asyncio.gather(*waiters), 1)
+
+    assert calls == 1
+    assert cache.metrics()["coalesced"] == 2
+    leader.cancel()
+    await _settle()
+    assert cache._pending == {}
+
+
+def _async(value):
+    async def call():
+        return value
+
+    return call
+
+
+@pytest.mark.asyncio
+async def test_model_error_releases_waiters():
+    cache = ResponseCache()
+    release = asyncio.Event()
+
+    async def failing_call():
+        await release.wait()
+        raise RuntimeError("quota")
+
+    leader = asyncio.create_task(_turn(cache, "leader", failing_call))
+    await _settle()
+    follower = asyncio.create_task(_turn(cache, "follower", _async(_response())))
+    await _settle()
+    release.set()
+
+    with pytest.raises(RuntimeError):
+        await leader
+    assert (await follower).content.parts[0].text == "It shipped."
+    assert cache.metrics()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_responses_are_not_stored():
+    cache = ResponseCache()
+    error = LlmResponse(error_code="RESOURCE_EXHAUSTED", error_message="quota")
+
+    await _turn(cache, "inv", _async(error))
+
+    assert cache.get(request_key(_request())) is None
+    assert cache.metrics()["stored"] == 0
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(ttl_seconds=10, clock=clock)
+    cache.put("key", _response())
+
+    clock.now += 9
+    assert cache.get("key") is not None
+    clock.now += 2
+    assert cache.get("key") is None
+    assert cache.metrics()["expired"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", _response("a"))
+    cache.put("b", _response("b"))
+    cache.get("a")
+    cache.put("c", _response("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.metrics()["evicted"] == 1
+
+
+def test_shared_store_serves_other_caches_until_expiry(tmp_path):
+    store = SqliteResponseStore(str(tmp_path / "responses.db"))
+    ResponseCache(store=store, ttl_seconds=60).put("key", _response())
+
+    other = ResponseCache(store=SqliteResponseStore(str(tmp_path / "responses.db")))
+    assert other.get("key").content.parts[0].text == "It shipped."
+    assert other.metrics()["store_hits"] == 1
+
+    store.put("old", _response(), ttl_seconds=-1)
+    assert other.get("old") is None
+    assert store.purge_expired() == 1
+
+
+def test_agent_answers_a_repeated_question_from_the_cache():
+    cache = ResponseCache()
+    model = testing_utils.MockModel.create(["It shipped.", "Not this one."])
+    agent = LlmAgent(name="agent", model=model, **cache_callbacks(cache))
+
+    with testing_utils.InMemoryRunner(agent) as first:
+        first.run("Where is my order?")
+    with testing_utils.InMemoryRunner(agent) as second:
+        events = second.run("Where is my order?")
+
+    assert events[-1].content.parts[0].text == "It shipped."
+    assert model.recorder.count == 1
+    assert (cache.metrics()["hits"], cache._pending) == (1, {})
@@ -0,0 +1,135 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""setup.py's mirror-cached sparse provisioning against a bare repo over file://."""
+
+import importlib.util
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("git") is None, reason="git is not installed"
+)
+
+
+@pytest.fixture(scope="module")
+def setup_module():
+    # setup.py imports extract.py from the repository root
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.syspath_prepend(str(ROOT))
+        spec = importlib.util.spec_from_file_location(
+            "starter_kit_setup", ROOT / "setup.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+def _git(cwd: Path, *args: str) -> str:
+    return subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=Fixture",
+            "-c",
+            "user.email=fixture@example.com",
+            "-c",
+            "init.defaultBranch=main",
+            *args,
+        ],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def upstream(setup_module, tmp_path):
+    """A bare `adk-samples.git` holding extracted and unrelated paths."""
+    work = tmp_path / "work"
+    work.mkdir()
+    _git(work, "init", "-q")
+    files = {
+        "README.md": "samples\n",
+        "agents/customer-service/customer_service/agent.py": "root_agent = 1\n",
+        "agents/RAG/rag/tools/search.py": "def search(): ...\n",
+        "agents/unused/agent.py": "root_agent = 2\n",
+    }
+    for name, content in files.items():
+        path = work / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    _git(work, "add", "-A")
+    _git(work, "commit", "-q", "-m", "samples")
+
+    repos = tmp_path / "upstream"
+    repos.mkdir()
+    _git(repos, "clone", "-q", "--bare", work.as_uri(), "adk-samples.git")
+    _git(repos / "adk-samples.git", "config", "uploadpack.allowFilter", "true")
+    [repo] = [r for r in setup_module.REQUIRED_REPOS if r["name"] == "adk-samples"]
+    return repos, repo
+
+
+def test_provisions_a_sparse_checkout_through_the_mirror(
+    setup_module, upstream, tmp_path
+):
+    repos, repo = upstream
+    parent, mirrors = tmp_path / "checkouts", tmp_path / "mirrors"
+    parent.mkdir()
+
+    result = setup_module.provision_repository(repo, parent, mirrors, repos.as_uri())
+
+    assert result["status"] == "cloned", result["error"]
+    checkout = parent / "adk-samples"
+    assert (checkout / "README.md").read_text() == "samples\n"
+    assert (checkout / "agents/customer-service/customer_service/agent.py").exists()
+    assert (checkout / "agents/RAG/rag/tools/search.py").exists()
+    # Paths no extraction reads are not checked out
+    assert not (checkout / "agents/unused").exists()
+    assert (mirrors / "adk-samples.git").is_dir()
+    # Later fetches go upstream, not to the cache
+    origin = _git(checkout, "remote", "get-url", "origin")
+    assert origin == f"{repos.as_uri()}/adk-samples.git"
+
+    again = setup_module.provision_repository(repo, parent, mirrors, repos.as_uri())
+    assert again["status"] == "exists"
+
+
+def test_cached_mirror_is_used_when_upstream_is_gone(setup_module, upstream, tmp_path):
+    repos, repo = upstream
+    mirrors = tmp_path / "mirrors"
+    for name in ("first", "second"):
+        (tmp_path / name).mkdir()
+    first = setup_module.provision_repository(
+        repo, tmp_path / "first", mirrors, repos.as_uri()
+    )
+    assert first["status"] == "cloned", first["error"]
+
+    shutil.rmtree(repos)
+    second = setup_module.provision_repository(
+        repo, tmp_path / "second", mirrors, repos.as_uri()
+    )
+
+    assert second["status"] == "cloned", second["error"]
+    assert second["fetched_bytes"] == 0
+    agent = tmp_path / "second/adk-samples/agents/customer-service"
+    assert (agent / "customer_service/agent.py").read_text() == "root_agent = 1\n"
+
+
+def test_unreachable_upstream_leaves_no_checkout(setup_module, tmp_path):
+    repo = {"name": "adk-samples", "url": "unused"}
+    parent = tmp_path / "checkouts"
+    parent.mkdir()
+
+    result = setup_module.provision_repository(
+        repo, parent, tmp_path / "mirrors", (tmp_path / "nowhere").as_uri()
+    )
+
+    assert result["status"] == "error"
+    assert "clone" in result["error"]
+    assert not (parent / "adk-samples").exists()
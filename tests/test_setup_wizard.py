@@ -0,0 +1,54 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""The setup wizard's ADK version check and history-policy prompt."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from core.sessions import history
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def wizard():
+    spec = importlib.util.spec_from_file_location(
+        "setup_wizard", ROOT / ".starter-kit/scripts/setup_wizard.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize(
+    "text, supported",
+    [
+        ("1.0.0", True),
+        ("1.2.3", True),
+        ("1.0.1rc1", True),
+        ("1.0.0rc1", False),
+        ("1.0.0.dev3", False),
+        ("0.5.0", False),
+    ],
+)
+def test_prereleases_of_the_minimum_are_too_old(wizard, text, supported):
+    assert (wizard.parse_version(text) >= wizard.MIN_ADK_VERSION) is supported
+
+
+def test_unparseable_versions_are_none(wizard):
+    assert wizard.parse_version("not a version") is None
+
+
+def test_history_policies_match_the_runtime(wizard):
+    assert wizard.HISTORY_POLICIES == history.MODES
+
+
+def test_history_prompt_accepts_known_policies_only(wizard, monkeypatch, capsys):
+    answers = iter(["sometimes", "Window", ""])
+    monkeypatch.setattr("builtins.input", lambda _: next(answers))
+
+    assert wizard.prompt_choice("History policy", history.MODES, "off") == "window"
+    assert "Choose one of: off, window, budget, summary" in capsys.readouterr().out
+    assert wizard.prompt_choice("History policy", history.MODES, "off") == "off"
@@ -0,0 +1,161 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Batched writes, persistence and paging of SqliteSessionService."""
+
+import asyncio
+import sqlite3
+
+import pytest
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+
+from core.sessions import SqliteSessionService
+from core.sessions.sqlite_session_service import SessionNotFoundError
+from testing import testing_utils
+
+APP, USER = "app", "user"
+
+
+def _event(text: str, **state) -> Event:
+    return Event(
+        author="user",
+        invocation_id="inv",
+        content=testing_utils.UserContent(text),
+        actions=EventActions(state_delta=state),
+    )
+
+
+def _committed_events(path) -> int:
+    """Events on disk, as another process reading the database sees them."""
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+async def _session_with_events(service, count: int):
+    session = await service.create_session(app_name=APP, user_id=USER)
+    for i in range(count):
+        await service.append_event(session, _event(f"event {i}"))
+    return session
+
+
+@pytest.mark.asyncio
+async def test_events_are_committed_a_batch_at_a_time(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    with SqliteSessionService(path, batch_size=3, flush_interval=60) as service:
+        session = await _session_with_events(service, 2)
+        assert _committed_events(path) == 0
+
+        await service.append_event(session, _event("event 2"))
+        assert _committed_events(path) == 3
+
+        await service.append_event(session, _event("event 3"))
+        await service.flush()
+        assert _committed_events(path) == 4
+
+
+@pytest.mark.asyncio
+async def test_pending_events_are_committed_after_the_flush_interval(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    with SqliteSessionService(path, batch_size=100, flush_interval=0.05) as service:
+        await _session_with_events(service, 2)
+
+        for _ in range(100):
+            if _committed_events(path) == 2:
+                break
+            await asyncio.sleep(0.02)
+        assert _committed_events(path) == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_see_pending_events(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    with SqliteSessionService(path, batch_size=100, flush_interval=60) as service:
+        session = await service.create_session(app_name=APP, user_id=USER)
+        await service.append_event(session, _event("hi", topic="refunds"))
+
+        loaded = await service.get_session(
+            app_name=APP, user_id=USER, session_id=session.id
+        )
+        assert [event.content.parts[0].text for event in loaded.events] == ["hi"]
+        assert loaded.state["topic"] == "refunds"
+
+
+@pytest.mark.asyncio
+async def test_close_commits_and_a_new_service_reopens_the_sessions(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    service = SqliteSessionService(path, batch_size=100, flush_interval=60)
+    session = await service.create_session(
+        app_name=APP, user_id=USER, state={"user:name": "Ada", "step": 1}
+    )
+    await service.append_event(session, _event("first", step=2))
+    await service.append_event(session, _event("second"))
+    service.close()
+    service.close()
+    assert _committed_events(path) == 2
+
+    with SqliteSessionService(path) as reopened:
+        loaded = await reopened.get_session(
+            app_name=APP, user_id=USER, session_id=session.id
+        )
+        assert [event.content.parts[0].text for event in loaded.events] == [
+            "first",
+            "second",
+        ]
+        assert (loaded.state["step"], loaded.state["user:name"]) == (2, "Ada")
+        # Appends work on the reopened database too
+        await reopened.append_event(loaded, _event("third"))
+        listed = await reopened.list_sessions(app_name=APP, user_id=USER)
+        assert [s.id for s in listed.sessions] == [session.id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count, pages", [(5, [2, 2, 1]), (4, [2, 2]), (0, [0])])
+async def test_list_events_pages_through_with_tokens(count, pages):
+    with SqliteSessionService() as service:
+        session = await _session_with_events(service, count)
+        keys = {"app_name": APP, "user_id": USER, "session_id": session.id}
+
+        sizes, texts, token = [], [], None
+        while True:
+            events, token = await service.list_events(
+                **keys, page_size=2, page_token=token
+            )
+            sizes.append(len(events))
+            texts += [event.content.parts[0].text for event in events]
+            if token is None:
+                break
+
+        assert sizes == pages
+        assert texts == [f"event {i}" for i in range(count)]
+        iterated = [event async for event in service.iter_events(**keys, page_size=2)]
+        assert len(iterated) == count
+
+
+@pytest.mark.asyncio
+async def test_append_after_delete_raises_session_not_found():
+    with SqliteSessionService(batch_size=100, flush_interval=60) as service:
+        session = await _session_with_events(service, 1)
+
+        await service.delete_session(app_name=APP, user_id=USER, session_id=session.id)
+
+        with pytest.raises(SessionNotFoundError):
+            await service.append_event(session, _event("too late"))
+        assert (
+            await service.get_session(app_name=APP, user_id=USER, session_id=session.id)
+            is None
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_session_loads_recent_events_only():
+    with SqliteSessionService(max_loaded_events=2) as service:
+        session = await _session_with_events(service, 5)
+
+        loaded = await service.get_session(
+            app_name=APP, user_id=USER, session_id=session.id
+        )
+
+        assert [event.content.parts[0].text for event in loaded.events] == [
+            "event 3",
+            "event 4",
+        ]
@@ -0,0 +1,3 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Helpers for the starter kit's tests, benchmarks and eval runs."""
@@ -0,0 +1,489 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Concurrent, sharded, resumable eval runner.
+
+`adk eval` runs an evalset serially. This runner streams cases from a JSONL
+file (one case per line) and runs them through a bounded pool of
+concurrent sessions, optionally sharded across worker processes:
+
+  python tests/testing/eval_runner.py cases.jsonl \\
+      --agent acme.agents.support:root_agent --concurrency 32 --shards 4
+
+A case is a JSON object such as:
+
+  {"id": "refund_1", "query": "Can I get a refund?",
+   "reference": "Yes, within 30 days.", "expected_tool_use": ["lookup_order"]}
+
+`inputs.text` may stand in for `query`, and `expected_events` entries with
+`has_content` or `tool_name` are honoured, so the `<agent>_eval.json` files generated by
+create_agent.py run as they are (a `.json` file is read whole; its
+`test_cases` list is the case list).
+
+Cases are assigned to shards by line number. Each shard appends one result
+line per finished case to `<output>/shard-<i>-of-<n>.jsonl`; these files are
+the checkpoint. Rerunning with the same output directory skips every case
+already recorded, so an interrupted run resumes where it stopped. The final
+report merges all shard files: pass rate, errors and per-case latency
+percentiles.
+
+With `--mock`, every LlmAgent gets a LatencyMockModel, so the runner itself
+can be benchmarked without calling a model.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import importlib
+import json
+import logging
+import os
+import sys
+import time
+import warnings
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CONCURRENCY = 16
+DEFAULT_CASE_TIMEOUT = 120.0
+DEFAULT_MOCK_LATENCY_MS = 50.0
+
+
+@dataclasses.dataclass(frozen=True)
+class EvalCase:
+    """One test case; `line` is its position in the case file."""
+
+    id: str
+    line: int
+    query: str
+    reference: str | None = None
+    expected_tool_use: tuple[str, ...] | None = None
+    expects_content: bool = True
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], line: int) -> "EvalCase":
+        query = data.get("query") or (data.get("inputs") or {}).get("text")
+        if not query:
+            raise ValueError(f"Case on line {line} has no query or inputs.text")
+        tools = data.get("expected_tool_use")
+        if tools is None:
+            # Tool calls among expected_events form the expected trajectory
+            tools = [
+                expected["tool_name"]
+                for expected in data.get("expected_events", [])
+                if expected.get("tool_name")
+            ] or None
+        if tools is not None:
+            tools = tuple(
+                tool["tool_name"] if isinstance(tool, dict) else tool for tool in tools
+            )
+        return cls(
+            id=str(data.get("id") or f"line-{line}"),
+            line=line,
+            query=query,
+            reference=data.get("reference"),
+            expected_tool_use=tools,
+            expects_content=all(
+                expected.get("has_content", True)
+                for expected in data.get("expected_events", [])
+            ),
+        )
+
+
+@dataclasses.dataclass
+class CaseResult:
+    """The outcome of one case, as stored in the shard checkpoint files."""
+
+    id: str
+    passed: bool
+    latency: float
+    response: str = ""
+    tool_calls: list[str] = dataclasses.field(default_factory=list)
+    events: int = 0
+    error: str | None = None
+
+
+def iter_cases(
+    path: str, shard_index: int = 0, num_shards: int = 1
+) -> Iterator[EvalCase]:
+    """Streams the cases of one shard from a JSONL file (or a .json evalset)."""
+    if path.endswith(".json"):
+        with open(path) as f:
+            lines = (json.dumps(case) for case in json.load(f)["test_cases"])
+            yield from _parse_lines(lines, shard_index, num_shards)
+        return
+    with open(path) as f:
+        yield from _parse_lines(f, shard_index, num_shards)
+
+
+def _parse_lines(lines, shard_index: int, num_shards: int):
+    for line, text in enumerate(lines, 1):
+        if line % num_shards != shard_index or not text.strip():
+            continue
+        yield EvalCase.from_dict(json.loads(text), line)
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def check_case(case: EvalCase, result: CaseResult) -> bool:
+    """Default pass criteria: content if expected, exact tools and reference.
+
+    The reference is compared after lowercasing and collapsing whitespace;
+    pass another `check` to run_eval, or re-score the results with
+    eval_scoring.py, for softer metrics.
+    """
+    if case.expects_content and not result.response:
+        return False
+    if (
+        case.expected_tool_use is not None
+        and tuple(result.tool_calls) != case.expected_tool_use
+    ):
+        return False
+    if case.reference is not None:
+        return normalize_text(result.response) == normalize_text(case.reference)
+    return True
+
+
+def shard_path(output_dir: str, shard_index: int, num_shards: int) -> Path:
+    return Path(output_dir) / f"shard-{shard_index}-of-{num_shards}.jsonl"
+
+
+def drop_torn_line(path: Path) -> None:
+    """Truncates a results file after its last newline.
+
+    An interrupted run can leave a partial last line; appending to it would
+    glue the next result onto the fragment and lose both.
+    """
+    if not path.exists():
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            block = min(position, 64 * 1024)
+            f.seek(position - block)
+            newline = f.read(block).rfind(b"\n")
+            if newline != -1:
+                position = position - block + newline + 1
+                break
+            position -= block
+        if position != end:
+            f.truncate(position)
+
+
+def load_results(output_dir: str) -> dict[str, dict[str, Any]]:
+    """Reads every shard file; a torn last line from an interrupted run is skipped."""
+    results = {}
+    for path in sorted(Path(output_dir).glob("shard-*.jsonl")):
+        with open(path) as f:
+            for text in f:
+                try:
+                    result = json.loads(text)
+                except json.JSONDecodeError:
+                    continue
+                results[result["id"]] = result
+    return results
+
+
+def mock_models(agent: BaseAgent, latency_ms: float) -> BaseAgent:
+    """Gives every LlmAgent in the tree a LatencyMockModel."""
+    from testing import testing_utils
+
+    pending = [agent]
+    while pending:
+        current = pending.pop()
+        if isinstance(current, LlmAgent):
+            model = testing_utils.LatencyMockModel.create(["Mock response."])
+            model.cycle_responses = True
+            model.time_to_first_chunk = testing_utils.LatencyDistribution.lognormal(
+                latency_ms / 1000, 0.25
+            )
+            model.recorder = testing_utils.RequestRecorder("last", 1)
+            current.model = model
+        pending.extend(current.sub_agents)
+    return agent
+
+
+def load_agent(spec: str | None) -> BaseAgent:
+    """Imports `module:attribute`; without a spec, a bare agent for --mock runs."""
+    if spec is None:
+        return LlmAgent(name="eval_mock_agent", instruction="Answer the user.")
+    sys.path.insert(0, str(ROOT / "src"))
+    module_name, _, attribute = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attribute or "root_agent")
+
+
+async def run_case(
+    runner: InMemoryRunner,
+    case: EvalCase,
+    timeout: float,
+    check: Callable[[EvalCase, CaseResult], bool],
+) -> CaseResult:
+    """Runs one case in a fresh session, which is deleted afterwards."""
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="eval_user"
+    )
+    result = CaseResult(id=case.id, passed=False, latency=0.0)
+
+    async def drive():
+        async for event in runner.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=types.Content(role="user", parts=[types.Part(text=case.query)]),
+        ):
+            result.events += 1
+            result.tool_calls.extend(call.name for call in event.get_function_calls())
+            if event.is_final_response() and event.content and event.content.parts:
+                result.response = "".join(
+                    part.text for part in event.content.parts if part.text
+                )
+
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(drive(), timeout)
+    except TimeoutError:
+        result.error = f"Timed out after {timeout}s"
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        result.error = f"{type(e).__name__}: {e}"
+    result.latency = time.perf_counter() - start
+    result.passed = result.error is None and check(case, result)
+    await runner.session_service.delete_session(
+        app_name=runner.app_name, user_id=session.user_id, session_id=session.id
+    )
+    return result
+
+
+async def run_eval(
+    agent: BaseAgent,
+    cases: Iterator[EvalCase],
+    results_path: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_CASE_TIMEOUT,
+    done: frozenset[str] = frozenset(),
+    check: Callable[[EvalCase, CaseResult], bool] = check_case,
+) -> int:
+    """Runs cases with at most `concurrency` in flight, appending results.
+
+    Cases are pulled from the iterator only as workers free up, so memory
+    stays bounded however long the case file is. Returns the number of cases
+    run; those in `done` are skipped.
+    """
+    runner = InMemoryRunner(agent=agent, app_name="eval")
+    queue: asyncio.Queue[EvalCase | None] = asyncio.Queue(concurrency)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    drop_torn_line(results_path)
+    count = 0
+
+    with open(results_path, "a") as out:
+
+        async def worker():
+            nonlocal count
+            while (case := await queue.get()) is not None:
+                result = await run_case(runner, case, timeout, check)
+                out.write(json.dumps(dataclasses.asdict(result)) + "\n")
+                out.flush()
+                count += 1
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            for case in cases:
+                if case.id not in done:
+                    await queue.put(case)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+    return count
+
+
+def run_shard(config: dict[str, Any], shard_index: int) -> int:
+    """Runs one shard in this process; the entry point of shard workers."""
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings("ignore", category=UserWarning)
+    agent = load_agent(config["agent"])
+    if config["mock"]:
+        agent = mock_models(agent, config["mock_latency_ms"])
+    done = frozenset(load_results(config["output"]))
+    cases = iter_cases(config["cases"], shard_index, config["num_shards"])
+    return asyncio.run(
+        run_eval(
+            agent,
+            cases,
+            shard_path(config["output"], shard_index, config["num_shards"]),
+            concurrency=config["concurrency"],
+            timeout=config["timeout"],
+            done=done,
+        )
+    )
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))]
+
+
+def summarize(results: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Pass rate, error count and latency percentiles over all results."""
+    latencies = [result["latency"] for result in results.values()]
+    passed = sum(result["passed"] for result in results.values())
+    return {
+        "cases": len(results),
+        "passed": passed,
+        "pass_rate": passed / len(results) if results else 0.0,
+        "errors": sum(result["error"] is not None for result in results.values()),
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p95_ms": percentile(latencies, 95) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+        "latency_max_ms": max(latencies, default=0.0) * 1000,
+    }
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    index, _, total = value.partition("/")
+    index, total = int(index), int(total)
+    if not 0 <= index < total:
+        raise argparse.ArgumentTypeError(f"Shard {value} is not I/N with 0 <= I < N")
+    return index, total
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run eval cases concurrently, sharded and resumable"
+    )
+    parser.add_argument("cases", help="JSONL case file (or a generated .json evalset)")
+    parser.add_argument(
+        "--agent",
+        metavar="MODULE:ATTR",
+        help="Agent to evaluate (optional with --mock)",
+    )
+    parser.add_argument(
+        "--output", help="Results directory (default: .eval_results/<cases stem>)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Concurrent sessions per shard (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Worker processes to shard the cases across (default: 1)",
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="I/N",
+        help="Run only shard I of N in this process, e.g. on one CI node",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_CASE_TIMEOUT,
+        help=f"Per-case timeout in seconds (default: {DEFAULT_CASE_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Discard earlier results instead of resuming",
+    )
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="Replace every model with a LatencyMockModel",
+    )
+    parser.add_argument(
+        "--mock-latency-ms",
+        type=float,
+        default=DEFAULT_MOCK_LATENCY_MS,
+        help=f"Median mock model latency (default: {DEFAULT_MOCK_LATENCY_MS:g})",
+    )
+    parser.add_argument(
+        "--min-pass-rate",
+        type=float,
+        help="Exit non-zero when the pass rate falls below this",
+    )
+    parser.add_argument("--report", help="Also write the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.agent is None and not args.mock:
+        parser.error("--agent is required unless --mock is given")
+    output = args.output or str(ROOT / ".eval_results" / Path(args.cases).stem)
+    if args.fresh:
+        for path in Path(output).glob("shard-*.jsonl"):
+            path.unlink()
+
+    config = {
+        "agent": args.agent,
+        "cases": args.cases,
+        "output": output,
+        "concurrency": args.concurrency,
+        "timeout": args.timeout,
+        "mock": args.mock,
+        "mock_latency_ms": args.mock_latency_ms,
+    }
+    skipped = len(load_results(output))
+    start = time.perf_counter()
+    if args.shard:
+        config["num_shards"] = args.shard[1]
+        ran = run_shard(config, args.shard[0])
+    elif args.shards == 1:
+        config["num_shards"] = 1
+        ran = run_shard(config, 0)
+    else:
+        config["num_shards"] = args.shards
+        with ProcessPoolExecutor(
+            max_workers=args.shards, mp_context=get_context("spawn")
+        ) as executor:
+            ran = sum(
+                executor.map(run_shard, [config] * args.shards, range(args.shards))
+            )
+    wall_time = time.perf_counter() - start
+
+    summary = summarize(load_results(output))
+    summary.update(
+        ran=ran,
+        resumed_from=skipped,
+        wall_time_s=wall_time,
+        cases_per_sec=ran / wall_time if wall_time else 0.0,
+    )
+    print(
+        f"Ran {ran} cases in {wall_time:.1f}s ({summary['cases_per_sec']:.1f}/s)"
+        + (f", resumed after {skipped}" if skipped else "")
+    )
+    print(
+        f"Pass rate: {summary['pass_rate']:.1%} ({summary['passed']}/{summary['cases']}),"
+        f" errors: {summary['errors']}"
+    )
+    print(
+        f"Latency ms: p50 {summary['latency_p50_ms']:.1f}"
+        f"  p95 {summary['latency_p95_ms']:.1f}  p99 {summary['latency_p99_ms']:.1f}"
+    )
+    print(f"Per-case results: {output}")
+    if args.report:
+        Path(args.report).write_text(json.dumps(summary, indent=2) + "\n")
+
+    if args.min_pass_rate is not None and summary["pass_rate"] < args.min_pass_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    # Run as a script: import from the same roots as the test suite
+    sys.path[:0] = [str(ROOT / "src"), str(ROOT / "tests")]
+    sys.exit(main())
@@ -0,0 +1,338 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Batch scoring of eval results.
+
+Scores whole result sets at once rather than case by case:
+
+  token F1      SQuAD-style token-overlap F1 of response and reference
+  ROUGE-L       F-measure of the longest common token subsequence
+  exact match   normalized response equals normalized reference
+  trajectory    the tool calls made equal the expected tool calls
+
+A batch is deduplicated and looked up in the cache first, so only new
+(response, reference) pairs are tokenized and scored. ROUGE-L uses a
+bit-parallel LCS that updates a whole row of the DP table per big-integer
+operation, 64 cells per machine word.
+
+Text scores are cached by (response hash, reference hash). A ScoreCache
+backed by a file keeps them across runs, so re-scoring after a threshold
+change recomputes nothing:
+
+  python tests/testing/eval_scoring.py cases.jsonl --f1 0.6 --rouge-l 0.5
+
+reads the eval runner's results for `cases.jsonl`, scores them and reports
+the pass rate under the given thresholds.
+"""
+
+import argparse
+import collections
+import dataclasses
+import hashlib
+import json
+import re
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+if __name__ == "__main__":
+    # Run as a script: import from the same roots as the test suite
+    sys.path[:0] = [
+        str(Path(__file__).resolve().parents[2] / root) for root in ("src", "tests")
+    ]
+
+from testing import eval_runner  # noqa: E402
+
+TEXT_METRICS = ("f1", "rouge_l", "exact_match")
+
+_TOKEN_RE = re.compile(r"\w+")
+_ARTICLES = frozenset({"a", "an", "the"})
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens without articles, as in SQuAD F1."""
+    return [
+        token for token in _TOKEN_RE.findall(text.lower()) if token not in _ARTICLES
+    ]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=10).hexdigest()
+
+
+class ScoreCache:
+    """Text scores keyed by (response hash, reference hash).
+
+    With a path, scores are loaded from and appended to a JSONL file.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._scores: dict[tuple[str, str], tuple[float, float, float]] = {}
+        self._unsaved: list[tuple[str, str]] = []
+        if self.path and self.path.exists():
+            with open(self.path) as f:
+                for text in f:
+                    try:
+                        response, reference, *scores = json.loads(text)
+                    except ValueError:
+                        continue
+                    self._scores[(response, reference)] = tuple(scores)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, key: tuple[str, str]) -> tuple[float, float, float] | None:
+        scores = self._scores.get(key)
+        if scores is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return scores
+
+    def put(self, key: tuple[str, str], scores: tuple[float, float, float]):
+        self._scores[key] = scores
+        self._unsaved.append(key)
+
+    def save(self) -> None:
+        if not self.path or not self._unsaved:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a") as f:
+            for key in self._unsaved:
+                f.write(json.dumps([*key, *self._scores[key]]) + "\n")
+        self._unsaved = []
+
+
+def _f1(response: list[str], reference: list[str]) -> float:
+    if not response or not reference:
+        return float(response == reference)
+    overlap = sum(
+        (collections.Counter(response) & collections.Counter(reference)).values()
+    )
+    return 2 * overlap / (len(response) + len(reference))
+
+
+def _lcs_length(a: list[str], b: list[str]) -> int:
+    """Bit-parallel LCS length (Allison-Dix): bit i of `row` is response token i."""
+    if not a or not b:
+        return 0
+    masks = {}
+    for i, token in enumerate(a):
+        masks[token] = masks.get(token, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    row = full
+    for token in b:
+        matches = row & masks.get(token, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(a) - bin(row).count("1")
+
+
+def _rouge_l(lcs: float, response_len: float, reference_len: float) -> float:
+    if not response_len or not reference_len:
+        return float(response_len == reference_len)
+    return 2 * lcs / (response_len + reference_len)
+
+
+def _score_uncached(
+    responses: list[list[str]], references: list[list[str]]
+) -> list[tuple[float, float, float]]:
+    return [
+        (
+            _f1(response, reference),
+            _rouge_l(_lcs_length(response, reference), len(response), len(reference)),
+            float(response == reference),
+        )
+        for response, reference in zip(responses, references)
+    ]
+
+
+def score_texts(
+    responses: Sequence[str],
+    references: Sequence[str],
+    cache: ScoreCache | None = None,
+) -> dict[str, list[float]]:
+    """Scores response/reference pairs; returns one list per TEXT_METRICS name.
+
+    Only pairs missing from the cache are scored, each distinct pair once.
+    """
+    cache = cache if cache is not None else ScoreCache()
+    keys = [
+        (text_hash(response), text_hash(reference))
+        for response, reference in zip(responses, references)
+    ]
+    scores = {}
+    missing = {}
+    for key, response, reference in zip(keys, responses, references):
+        if key in scores or key in missing:
+            continue
+        cached = cache.get(key)
+        if cached is None:
+            missing[key] = (tokenize(response), tokenize(reference))
+        else:
+            scores[key] = cached
+    if missing:
+        computed = _score_uncached(
+            [pair[0] for pair in missing.values()],
+            [pair[1] for pair in missing.values()],
+        )
+        for key, value in zip(missing, computed):
+            scores[key] = value
+            cache.put(key, value)
+    return {
+        metric: [scores[key][index] for key in keys]
+        for index, metric in enumerate(TEXT_METRICS)
+    }
+
+
+def trajectory_match(
+    actual: Sequence[Sequence[str]], expected: Sequence[Sequence[str] | None]
+) -> list[float | None]:
+    """1.0 where the tool calls equal the expected ones, None if none expected."""
+    return [
+        None if want is None else float(tuple(got) == tuple(want))
+        for got, want in zip(actual, expected)
+    ]
+
+
+@dataclasses.dataclass(frozen=True)
+class Thresholds:
+    """Minimum scores for a case to pass; None disables a metric."""
+
+    f1: float | None = None
+    rouge_l: float | None = None
+    exact_match: bool = False
+    trajectory: bool = True
+
+    def passes(self, scores: dict[str, Any]) -> bool:
+        if scores.get("error") or not scores.get("has_content", True):
+            return False
+        if self.trajectory and scores.get("trajectory") == 0.0:
+            return False
+        if scores.get("f1") is None:
+            return True
+        if self.f1 is not None and scores["f1"] < self.f1:
+            return False
+        if self.rouge_l is not None and scores["rouge_l"] < self.rouge_l:
+            return False
+        return not self.exact_match or scores["exact_match"] == 1.0
+
+
+def score_results(
+    cases: Sequence[eval_runner.EvalCase],
+    results: dict[str, dict[str, Any]],
+    cache: ScoreCache | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Scores eval runner results against their cases, by case id.
+
+    Text metrics are None for cases without a reference, and trajectory is
+    None for cases without expected tool use.
+    """
+    scored = [case for case in cases if case.id in results]
+    with_reference = [case for case in scored if case.reference is not None]
+    text_scores = score_texts(
+        [results[case.id]["response"] for case in with_reference],
+        [case.reference for case in with_reference],
+        cache,
+    )
+    trajectories = trajectory_match(
+        [results[case.id]["tool_calls"] for case in scored],
+        [case.expected_tool_use for case in scored],
+    )
+    scores = {
+        case.id: {
+            "error": results[case.id]["error"],
+            "has_content": bool(results[case.id]["response"])
+            or not case.expects_content,
+            "trajectory": trajectory,
+            **dict.fromkeys(TEXT_METRICS),
+        }
+        for case, trajectory in zip(scored, trajectories)
+    }
+    for index, case in enumerate(with_reference):
+        for metric in TEXT_METRICS:
+            scores[case.id][metric] = text_scores[metric][index]
+    return scores
+
+
+def summarize(
+    scores: dict[str, dict[str, Any]], thresholds: Thresholds
+) -> dict[str, Any]:
+    """Pass rate under the thresholds plus the mean of every metric."""
+    passed = sum(thresholds.passes(score) for score in scores.values())
+    summary = {
+        "cases": len(scores),
+        "passed": passed,
+        "pass_rate": passed / len(scores) if scores else 0.0,
+    }
+    for metric in (*TEXT_METRICS, "trajectory"):
+        values = [s[metric] for s in scores.values() if s[metric] is not None]
+        summary[f"mean_{metric}"] = sum(values) / len(values) if values else None
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Score eval runner results against their references"
+    )
+    parser.add_argument("cases", help="The case file the eval runner ran")
+    parser.add_argument(
+        "--output",
+        help="Eval runner results directory (default: .eval_results/<cases stem>)",
+    )
+    parser.add_argument("--f1", type=float, help="Minimum token F1 to pass")
+    parser.add_argument("--rouge-l", type=float, help="Minimum ROUGE-L to pass")
+    parser.add_argument(
+        "--exact-match", action="store_true", help="Require an exact (normalized) match"
+    )
+    parser.add_argument(
+        "--ignore-trajectory",
+        action="store_true",
+        help="Do not fail cases whose tool calls differ from expected",
+    )
+    parser.add_argument(
+        "--min-pass-rate",
+        type=float,
+        help="Exit non-zero when the pass rate falls below this",
+    )
+    parser.add_argument("--report", help="Also write the summary to this JSON file")
+    args = parser.parse_args(argv)
+
+    output = args.output or str(
+        eval_runner.ROOT / ".eval_results" / Path(args.cases).stem
+    )
+    results = eval_runner.load_results(output)
+    if not results:
+        print(f"No results in {output}; run tests/testing/eval_runner.py first")
+        return 1
+    cache = ScoreCache(str(Path(output) / "score_cache.jsonl"))
+    scores = score_results(list(eval_runner.iter_cases(args.cases)), results, cache)
+    cache.save()
+
+    thresholds = Thresholds(
+        f1=args.f1,
+        rouge_l=args.rouge_l,
+        exact_match=args.exact_match,
+        trajectory=not args.ignore_trajectory,
+    )
+    summary = summarize(scores, thresholds)
+    summary.update(cache_hits=cache.hits, cache_misses=cache.misses)
+    print(
+        f"Pass rate: {summary['pass_rate']:.1%} ({summary['passed']}/{summary['cases']})"
+    )
+    for metric in (*TEXT_METRICS, "trajectory"):
+        mean = summary[f"mean_{metric}"]
+        print(f"  mean {metric}: {'n/a' if mean is None else f'{mean:.3f}'}")
+    print(f"Score cache: {cache.hits} hits, {cache.misses} misses")
+    if args.report:
+        Path(args.report).write_text(json.dumps(summary, indent=2) + "\n")
+
+    if args.min_pass_rate is not None and summary["pass_rate"] < args.min_pass_rate:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
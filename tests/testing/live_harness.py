@@ -0,0 +1,333 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Latency harness for live (bidi-streaming) agents.
+
+Drives agents through `Runner.run_live` with scripted input at a realistic
+cadence and measures what a caller of a live agent experiences:
+
+  script = [AudioTurn(seconds=2.0), TextTurn('And tomorrow?', think_time=1.0)]
+  report = asyncio.run(run_live_sessions(agent, script, sessions=64))
+  print(report.summary())
+
+An audio turn sends PCM chunks in real time between activity start and end
+markers; a text turn sends a single content. After each turn the session
+waits for the model's turn_complete, then for the turn's think time.
+
+Per turn it records the time to first response, measured from the end of
+user input to the first model event with content, and the gaps between
+response chunks. Before every send it samples the LiveRequestQueue depth,
+which grows when the agent's send loop falls behind. A probe task measures
+event-loop lag for the whole run, and `find_saturation` ramps the number of
+concurrent sessions until lag or time to first response crosses a limit.
+
+LatencyMockModel stands in for the live model: its connections answer every
+turn after its modeled latency.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import time
+from collections.abc import Sequence
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.agents.run_config import RunConfig
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+DEFAULT_LEVELS = (1, 8, 32, 128, 512)
+DEFAULT_MAX_LOOP_LAG = 0.05
+DEFAULT_TURN_TIMEOUT = 30.0
+
+
+@dataclasses.dataclass(frozen=True)
+class TextTurn:
+    """A typed user message, followed by `think_time` seconds of silence."""
+
+    text: str
+    think_time: float = 0.0
+
+
+@dataclasses.dataclass(frozen=True)
+class AudioTurn:
+    """`seconds` of 16-bit mono PCM, sent in real time in `chunk_ms` chunks."""
+
+    seconds: float = 1.0
+    chunk_ms: int = 20
+    sample_rate: int = 16000
+    think_time: float = 0.0
+
+    def chunk(self) -> types.Blob:
+        size = self.sample_rate * 2 * self.chunk_ms // 1000
+        return types.Blob(
+            data=bytes(size), mime_type=f"audio/pcm;rate={self.sample_rate}"
+        )
+
+    def num_chunks(self) -> int:
+        return max(1, round(self.seconds * 1000 / self.chunk_ms))
+
+
+Turn = TextTurn | AudioTurn
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile; 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(q / 100 * (len(ordered) - 1)))]
+
+
+@dataclasses.dataclass
+class SessionMetrics:
+    """What one live session measured, in seconds."""
+
+    time_to_first_response: list[float] = dataclasses.field(default_factory=list)
+    chunk_gaps: list[float] = dataclasses.field(default_factory=list)
+    queue_depths: list[int] = dataclasses.field(default_factory=list)
+    turns_completed: int = 0
+    errors: list[str] = dataclasses.field(default_factory=list)
+
+
+@dataclasses.dataclass
+class LiveReport:
+    """Metrics of all sessions in one run, plus event-loop lag."""
+
+    sessions: int
+    wall_time: float
+    time_to_first_response: list[float]
+    chunk_gaps: list[float]
+    queue_depths: list[int]
+    loop_lag: list[float]
+    turns_completed: int
+    errors: list[str]
+
+    @classmethod
+    def merge(
+        cls,
+        metrics: Sequence[SessionMetrics],
+        wall_time: float,
+        loop_lag: list[float],
+    ) -> "LiveReport":
+        return cls(
+            sessions=len(metrics),
+            wall_time=wall_time,
+            time_to_first_response=[
+                value for m in metrics for value in m.time_to_first_response
+            ],
+            chunk_gaps=[value for m in metrics for value in m.chunk_gaps],
+            queue_depths=[value for m in metrics for value in m.queue_depths],
+            loop_lag=loop_lag,
+            turns_completed=sum(m.turns_completed for m in metrics),
+            errors=[error for m in metrics for error in m.errors],
+        )
+
+    def saturated(
+        self,
+        max_loop_lag: float = DEFAULT_MAX_LOOP_LAG,
+        max_time_to_first_response: float | None = None,
+    ) -> bool:
+        """Whether p99 loop lag or time to first response exceeds its limit."""
+        if self.errors or percentile(self.loop_lag, 99) > max_loop_lag:
+            return True
+        return (
+            max_time_to_first_response is not None
+            and percentile(self.time_to_first_response, 99) > max_time_to_first_response
+        )
+
+    def summary(self) -> dict[str, float]:
+        """Headline numbers, with times in milliseconds."""
+
+        def ms(values, q):
+            return percentile(values, q) * 1000
+
+        return {
+            "sessions": self.sessions,
+            "turns": self.turns_completed,
+            "errors": len(self.errors),
+            "wall_time_s": self.wall_time,
+            "ttfr_p50_ms": ms(self.time_to_first_response, 50),
+            "ttfr_p95_ms": ms(self.time_to_first_response, 95),
+            "ttfr_p99_ms": ms(self.time_to_first_response, 99),
+            "gap_p50_ms": ms(self.chunk_gaps, 50),
+            "gap_p99_ms": ms(self.chunk_gaps, 99),
+            "queue_depth_p99": percentile(self.queue_depths, 99),
+            "queue_depth_max": max(self.queue_depths, default=0),
+            "loop_lag_p99_ms": ms(self.loop_lag, 99),
+            "loop_lag_max_ms": max(self.loop_lag, default=0.0) * 1000,
+        }
+
+
+class LoopLagProbe:
+    """Measures how late the event loop wakes a task sleeping `interval`."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags: list[float] = []
+        self._task = None
+
+    async def __aenter__(self) -> "LoopLagProbe":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - start - self.interval))
+
+
+def _queue_depth(queue: LiveRequestQueue) -> int:
+    return queue._queue.qsize()  # pylint: disable=protected-access
+
+
+async def _send_turn(
+    queue: LiveRequestQueue, turn: Turn, metrics: SessionMetrics
+) -> None:
+    if isinstance(turn, TextTurn):
+        metrics.queue_depths.append(_queue_depth(queue))
+        queue.send_content(
+            types.Content(role="user", parts=[types.Part(text=turn.text)])
+        )
+        return
+
+    loop = asyncio.get_running_loop()
+    blob = turn.chunk()
+    queue.send_activity_start()
+    start = loop.time()
+    for i in range(turn.num_chunks()):
+        # Scheduled from the start time, so a slow loop does not stretch the turn
+        await asyncio.sleep(max(0.0, start + i * turn.chunk_ms / 1000 - loop.time()))
+        metrics.queue_depths.append(_queue_depth(queue))
+        queue.send_realtime(blob)
+    queue.send_activity_end()
+
+
+async def run_live_session(
+    runner: InMemoryRunner,
+    script: Sequence[Turn],
+    user_id: str = "live_user",
+    run_config: RunConfig | None = None,
+    turn_timeout: float = DEFAULT_TURN_TIMEOUT,
+) -> SessionMetrics:
+    """Plays a script through one live session and measures it."""
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id=user_id
+    )
+    queue = LiveRequestQueue()
+    metrics = SessionMetrics()
+    turn_complete = asyncio.Event()
+    input_ended_at = None
+    last_response_at = None
+
+    async def consume() -> None:
+        nonlocal last_response_at
+        async for event in runner.run_live(
+            user_id=user_id,
+            session_id=session.id,
+            live_request_queue=queue,
+            run_config=run_config,
+        ):
+            now = time.perf_counter()
+            if event.error_code:
+                metrics.errors.append(f"{event.error_code}: {event.error_message}")
+            if event.author != "user" and event.content and input_ended_at:
+                if last_response_at is None:
+                    metrics.time_to_first_response.append(now - input_ended_at)
+                else:
+                    metrics.chunk_gaps.append(now - last_response_at)
+                last_response_at = now
+            if event.turn_complete:
+                turn_complete.set()
+
+    consumer = asyncio.create_task(consume())
+    try:
+        for turn in script:
+            turn_complete.clear()
+            input_ended_at = last_response_at = None
+            await _send_turn(queue, turn, metrics)
+            input_ended_at = time.perf_counter()
+            waiter = asyncio.create_task(turn_complete.wait())
+            done, _ = await asyncio.wait(
+                {waiter, consumer},
+                timeout=turn_timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            waiter.cancel()
+            if waiter in done:
+                metrics.turns_completed += 1
+            elif consumer in done:
+                break
+            else:
+                metrics.errors.append(f"Turn timed out after {turn_timeout}s")
+                break
+            await asyncio.sleep(turn.think_time)
+    finally:
+        queue.close()
+        try:
+            await asyncio.wait_for(consumer, turn_timeout)
+        except TimeoutError:
+            metrics.errors.append("Live run did not end after the queue closed")
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            metrics.errors.append(f"{type(e).__name__}: {e}")
+    return metrics
+
+
+async def run_live_sessions(
+    agent: BaseAgent,
+    script: Sequence[Turn],
+    sessions: int,
+    run_config: RunConfig | None = None,
+    turn_timeout: float = DEFAULT_TURN_TIMEOUT,
+    probe_interval: float = 0.01,
+) -> LiveReport:
+    """Plays the script through `sessions` concurrent live sessions."""
+    runner = InMemoryRunner(agent=agent, app_name="live_harness")
+    async with LoopLagProbe(probe_interval) as probe:
+        start = time.perf_counter()
+        metrics = await asyncio.gather(
+            *(
+                run_live_session(
+                    runner, script, f"live_user_{i}", run_config, turn_timeout
+                )
+                for i in range(sessions)
+            )
+        )
+        wall_time = time.perf_counter() - start
+    return LiveReport.merge(metrics, wall_time, probe.lags)
+
+
+async def find_saturation(
+    agent: BaseAgent,
+    script: Sequence[Turn],
+    levels: Sequence[int] = DEFAULT_LEVELS,
+    max_loop_lag: float = DEFAULT_MAX_LOOP_LAG,
+    max_time_to_first_response: float | None = None,
+    warmup: bool = True,
+    **kwargs,
+) -> tuple[int | None, list[LiveReport]]:
+    """Runs increasing session counts until the event loop saturates.
+
+    Unless `warmup` is False, one untimed session runs the script first so
+    one-off setup costs (imports, schema building) don't land in the first
+    level's report.
+
+    Returns the first level whose report is `saturated` (None if none was)
+    and the reports of every level that ran.
+    """
+    if warmup:
+        await run_live_sessions(agent, script, 1, **kwargs)
+    reports = []
+    for sessions in levels:
+        report = await run_live_sessions(agent, script, sessions, **kwargs)
+        reports.append(report)
+        if report.saturated(max_loop_lag, max_time_to_first_response):
+            return sessions, reports
+    return None, reports
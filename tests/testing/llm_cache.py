@@ -0,0 +1,244 @@
+# Part of the Universal ADK Agent Starter Kit
+
+"""Record/replay cache for LLM calls in tests and eval reruns.
+
+`CachingLlm` wraps any `BaseLlm`, in the same spirit as `MockModel`:
+
+  model = CachingLlm.wrap(Gemini(model='gemini-2.0-flash'), 'tests/.llm_cache')
+  agent = LlmAgent(name='agent', model=model)
+
+Each request is keyed by a canonical hash of the model name, generation
+config (system instruction and tools included) and contents, normalized as
+by core.cache: function call ids, which ADK generates per run, and
+transport-only http_options are left out so reruns hit. The responses
+(every streamed chunk, in order) are stored content-addressed on disk.
+
+Modes:
+  'record': replay hits; call the wrapped model on a miss and store the
+    result.
+  'replay': replay hits; raise CacheMissError on a miss. Needs no wrapped
+    model, only the recorded model's name, so the full eval set can run
+    offline:
+
+      CachingLlm.wrap(None, 'tests/.llm_cache', 'replay', model='gemini-2.0-flash')
+  'passthrough': always call the wrapped model and store nothing.
+
+The store is bounded by `max_bytes`; the least recently used entries are
+evicted first.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.base_llm_connection import BaseLlmConnection
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from pydantic import Field
+from typing_extensions import override  # noqa: UP035 (typing.override is 3.12+)
+
+from core.cache import normalize_request
+
+CACHE_MODES = ("record", "replay", "passthrough")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class CacheMissError(KeyError):
+    """Raised in 'replay' mode for a request that was never recorded."""
+
+
+def request_key(model: str | None, llm_request: LlmRequest, stream: bool) -> str:
+    """Returns the canonical hash of a request.
+
+    The request is normalized exactly as for the response cache's keys.
+    """
+    canonical = normalize_request(llm_request)
+    canonical["model"] = canonical["model"] or model
+    canonical["stream"] = stream
+    serialized = json.dumps(
+        canonical,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class LlmCache:
+    """Content-addressed on-disk store of recorded responses, LRU by size.
+
+    Entries live at `<root>/<key[:2]>/<key>.json` and are written atomically.
+    A hit touches the entry's mtime, which orders eviction across processes.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = None  # key -> (size, last use), loaded lazily
+        self._memo = {}  # key -> parsed responses, for repeated replays
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> dict[str, tuple[int, int]]:
+        if self._index is None:
+            self._index = {}
+            for path in self.root.glob("*/*.json"):
+                stat = path.stat()
+                self._index[path.stem] = (stat.st_size, stat.st_mtime_ns)
+        return self._index
+
+    def get(self, key: str) -> list[LlmResponse] | None:
+        with self._lock:
+            path = self._path(key)
+            try:
+                if key not in self._memo:
+                    with open(path) as f:
+                        self._memo[key] = json.load(f)["responses"]
+                os.utime(path)
+            except FileNotFoundError:
+                self._memo.pop(key, None)
+                self.misses += 1
+                return None
+            index = self._load_index()
+            size = index.get(key, (path.stat().st_size, 0))[0]
+            index[key] = (size, path.stat().st_mtime_ns)
+            self.hits += 1
+            return [LlmResponse.model_validate(item) for item in self._memo[key]]
+
+    def put(self, key: str, responses: list[LlmResponse]) -> None:
+        data = json.dumps(
+            {
+                "key": key,
+                "responses": [
+                    response.model_dump(mode="json", exclude_none=True)
+                    for response in responses
+                ],
+            }
+        ).encode("utf-8")
+        with self._lock:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._memo.pop(key, None)
+            index = self._load_index()
+            index[key] = (len(data), path.stat().st_mtime_ns)
+            self._evict(index)
+
+    def _evict(self, index: dict[str, tuple[int, int]]) -> None:
+        total = sum(size for size, _ in index.values())
+        if total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(index.items(), key=lambda item: item[1][1]):
+            with contextlib.suppress(FileNotFoundError):
+                self._path(key).unlink()
+            del index[key]
+            self._memo.pop(key, None)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(size for size, _ in self._load_index().values())
+
+
+class CachingLlm(BaseLlm):
+    """BaseLlm wrapper that records and replays responses through an LlmCache."""
+
+    inner: BaseLlm | None = None
+    cache_dir: str
+    mode: str = "record"
+    max_bytes: int = DEFAULT_MAX_BYTES
+    cache: LlmCache | None = Field(default=None, exclude=True)
+
+    def model_post_init(self, context: Any) -> None:
+        if self.mode not in CACHE_MODES:
+            raise ValueError(
+                f"Unknown cache mode {self.mode!r}, expected one of {CACHE_MODES}"
+            )
+        if self.mode != "replay" and self.inner is None:
+            raise ValueError(f"Cache mode {self.mode!r} needs a wrapped model")
+        if self.cache is None:
+            self.cache = LlmCache(self.cache_dir, self.max_bytes)
+
+    @classmethod
+    def wrap(
+        cls,
+        inner: BaseLlm | None,
+        cache_dir: str,
+        mode: str | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        model: str | None = None,
+    ) -> "CachingLlm":
+        """Wraps a model; the mode defaults to $ADK_LLM_CACHE_MODE or 'record'.
+
+        `model` names the recorded model and defaults to the wrapped model's
+        name; it is required when replaying without a wrapped model.
+        """
+        mode = mode or os.environ.get("ADK_LLM_CACHE_MODE", "record")
+        model = model or (inner.model if inner is not None else None)
+        if model is None:
+            raise ValueError("Pass the recorded model name to replay without a model")
+        return cls(
+            model=model,
+            inner=inner,
+            cache_dir=cache_dir,
+            mode=mode,
+            max_bytes=max_bytes,
+        )
+
+    @staticmethod
+    def supported_models() -> list[str]:
+        return []
+
+    @override
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.mode == "passthrough":
+            async for response in self.inner.generate_content_async(
+                llm_request, stream=stream
+            ):
+                yield response
+            return
+
+        key = request_key(self.model, llm_request, stream)
+        cached = self.cache.get(key)
+        if cached is not None:
+            for response in cached:
+                yield response
+            return
+        if self.mode == "replay":
+            raise CacheMissError(
+                f"No recorded response for request {key} in {self.cache_dir}"
+            )
+
+        responses = []
+        async for response in self.inner.generate_content_async(
+            llm_request, stream=stream
+        ):
+            responses.append(response)
+            yield response
+        self.cache.put(key, responses)
+
+    @contextlib.asynccontextmanager
+    async def connect(self, llm_request: LlmRequest) -> BaseLlmConnection:
+        """Live connections are not cached; they go to the wrapped model."""
+        if self.inner is None:
+            raise NotImplementedError("Live connections need a wrapped model")
+        async with self.inner.connect(llm_request) as connection:
+            yield connection
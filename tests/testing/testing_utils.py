@@ -0,0 +1,784 @@
+# Extracted from google/adk-python/tests/
+# Part of the Universal ADK Agent Starter Kit
+# Original source: https://github.com/google/adk-python/tests/
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import hashlib
+import json
+import math
+import random
+import weakref
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Iterator
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.live_request_queue import LiveRequestQueue
+from google.adk.agents.llm_agent import Agent, LlmAgent
+from google.adk.agents.run_config import RunConfig
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.events.event import Event
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.base_llm_connection import BaseLlmConnection
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner as AfInMemoryRunner
+from google.adk.runners import Runner
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.adk.sessions.session import Session
+from google.genai import errors, types
+from google.genai.types import Part
+from pydantic import Field
+from typing_extensions import override  # noqa: UP035 (typing.override is 3.12+)
+
+
+class UserContent(types.Content):
+
+    def __init__(self, text_or_part: str):
+        parts = [
+            (
+                types.Part.from_text(text=text_or_part)
+                if isinstance(text_or_part, str)
+                else text_or_part
+            )
+        ]
+        super().__init__(role="user", parts=parts)
+
+
+class ModelContent(types.Content):
+
+    def __init__(self, parts: list[types.Part]):
+        super().__init__(role="model", parts=parts)
+
+
+async def create_invocation_context(
+    agent: Agent, user_content: str = "", history_policy=None
+):
+    invocation_id = "test_id"
+    artifact_service = InMemoryArtifactService()
+    session_service = InMemorySessionService()
+    memory_service = InMemoryMemoryService()
+    invocation_context = InvocationContext(
+        artifact_service=artifact_service,
+        session_service=session_service,
+        memory_service=memory_service,
+        invocation_id=invocation_id,
+        agent=agent,
+        session=await session_service.create_session(
+            app_name="test_app", user_id="test_user"
+        ),
+        user_content=types.Content(
+            role="user", parts=[types.Part.from_text(text=user_content)]
+        ),
+        run_config=RunConfig(),
+    )
+    if user_content:
+        append_user_content(
+            invocation_context,
+            [types.Part.from_text(text=user_content)],
+            history_policy=history_policy,
+        )
+    return invocation_context
+
+
+def append_user_content(
+    invocation_context: InvocationContext,
+    parts: list[types.Part],
+    history_policy=None,
+) -> Event:
+    """Appends a user message to the session.
+
+    With a history_policy (a core.sessions.HistoryPolicy), the session's
+    events are then trimmed to the policy's bound, as an agent using the
+    policy would see them.
+    """
+    session = invocation_context.session
+    event = Event(
+        invocation_id=invocation_context.invocation_id,
+        author="user",
+        content=types.Content(role="user", parts=parts),
+    )
+    session.events.append(event)
+    if history_policy is not None:
+        history_policy.apply(session)
+    return event
+
+
+# Extracts the contents from the events and transform them into a list of
+# (author, simplified_content) tuples.
+def simplify_events(events: list[Event]) -> list[(str, types.Part)]:
+    return [(event.author, simplify_content(event.content)) for event in events]
+
+
+# Simplifies the contents into a list of (author, simplified_content) tuples.
+def simplify_contents(contents: list[types.Content]) -> list[(str, types.Part)]:
+    return [(content.role, simplify_content(content)) for content in contents]
+
+
+# Simplifies the content so it's easier to assert.
+# - If there is only one part, return part
+# - If the only part is pure text, return stripped_text
+# - If there are multiple parts, return parts
+# - remove function_call_id if it exists
+def simplify_content(
+    content: types.Content,
+) -> str | types.Part | list[types.Part]:
+    for part in content.parts:
+        if part.function_call and part.function_call.id:
+            part.function_call.id = None
+        if part.function_response and part.function_response.id:
+            part.function_response.id = None
+    if len(content.parts) == 1:
+        if content.parts[0].text:
+            return content.parts[0].text.strip()
+        else:
+            return content.parts[0]
+    return content.parts
+
+
+def get_user_content(message: types.ContentUnion) -> types.Content:
+    return message if isinstance(message, types.Content) else UserContent(message)
+
+
+async def iterate_events(
+    events: AsyncGenerator[Event, None],
+    stop: Callable[[Event], bool] | None = None,
+    max_events: int | None = None,
+    timeout: float | None = None,
+) -> AsyncGenerator[Event, None]:
+    """Yields events as they arrive until a stop condition is met.
+
+    Stops after the first event for which `stop` returns True (that event is
+    still yielded), after `max_events` events, or once `timeout` seconds have
+    passed, whichever comes first. Reaching the timeout ends the iteration
+    without raising. The underlying run is closed in every case, including
+    when the caller stops iterating early.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout is not None else None
+    count = 0
+    try:
+        while max_events is None or count < max_events:
+            if deadline is None:
+                next_event = events.__anext__()
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                next_event = asyncio.wait_for(events.__anext__(), remaining)
+            try:
+                event = await next_event
+            except StopAsyncIteration:
+                return
+            except TimeoutError:
+                return
+            count += 1
+            yield event
+            if stop is not None and stop(event):
+                return
+    finally:
+        await events.aclose()
+
+
+class TestInMemoryRunner(AfInMemoryRunner):
+    """InMemoryRunner that is tailored for tests, features async run method.
+
+    app_name is hardcoded as InMemoryRunner in the parent class.
+    """
+
+    async def run_async_with_new_session(
+        self, new_message: types.ContentUnion
+    ) -> list[Event]:
+        return [event async for event in self.iter_with_new_session(new_message)]
+
+    async def iter_with_new_session(
+        self,
+        new_message: types.ContentUnion,
+        stop: Callable[[Event], bool] | None = None,
+        max_events: int | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[Event]:
+        """Streams the events of a run in a new session; see iterate_events."""
+        session = await self.session_service.create_session(
+            app_name="InMemoryRunner", user_id="test_user"
+        )
+        events = self.run_async(
+            user_id=session.user_id,
+            session_id=session.id,
+            new_message=get_user_content(new_message),
+        )
+        async for event in iterate_events(events, stop, max_events, timeout):
+            yield event
+
+
+def _close_loop(loop: asyncio.AbstractEventLoop) -> None:
+    if loop.is_closed():
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        # Not collected inside another loop, so this one can still run
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+    loop.close()
+
+
+class InMemoryRunner:
+    """InMemoryRunner that is tailored for tests.
+
+    Owns one event loop for its whole lifetime and creates the test session
+    once, so a turn costs a single loop entry instead of an `asyncio.run` per
+    session lookup. `run` and `run_live` drive that loop synchronously; from
+    async tests, await `run_async` instead. Call `close` (or use the runner
+    as a context manager) to release the loop; a runner that is never closed
+    releases it when it is garbage collected, or at exit.
+    """
+
+    def __init__(
+        self,
+        root_agent: Agent | LlmAgent,
+        response_modalities: list[str] = None,
+    ):
+        self.root_agent = root_agent
+        self.runner = Runner(
+            app_name="test_app",
+            agent=root_agent,
+            artifact_service=InMemoryArtifactService(),
+            session_service=InMemorySessionService(),
+            memory_service=InMemoryMemoryService(),
+        )
+        self.session_id = None
+        self.user_id = "test_user"
+        self._loop = asyncio.new_event_loop()
+        self._finalizer = weakref.finalize(self, _close_loop, self._loop)
+
+    def __enter__(self) -> "InMemoryRunner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the runner's event loop and its executor threads."""
+        self._finalizer()
+
+    async def _ensure_session_id(self) -> str:
+        if not self.session_id:
+            session = await self.runner.session_service.create_session(
+                app_name="test_app", user_id=self.user_id
+            )
+            self.session_id = session.id
+        return self.session_id
+
+    async def get_session_async(self) -> Session:
+        """Returns the current state of the test session."""
+        return await self.runner.session_service.get_session(
+            app_name="test_app",
+            user_id=self.user_id,
+            session_id=await self._ensure_session_id(),
+        )
+
+    @property
+    def session(self) -> Session:
+        return self._loop.run_until_complete(self.get_session_async())
+
+    async def run_async(self, new_message: types.ContentUnion) -> list[Event]:
+        """Runs one turn in the test session and returns its events."""
+        session_id = await self._ensure_session_id()
+        return [
+            event
+            async for event in self.runner.run_async(
+                user_id=self.user_id,
+                session_id=session_id,
+                new_message=get_user_content(new_message),
+            )
+        ]
+
+    def run(self, new_message: types.ContentUnion) -> list[Event]:
+        return self._loop.run_until_complete(self.run_async(new_message))
+
+    async def iter_async(
+        self,
+        new_message: types.ContentUnion,
+        stop: Callable[[Event], bool] | None = None,
+        max_events: int | None = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[Event]:
+        """Streams one turn's events as they arrive; see iterate_events."""
+        session_id = await self._ensure_session_id()
+        events = self.runner.run_async(
+            user_id=self.user_id,
+            session_id=session_id,
+            new_message=get_user_content(new_message),
+        )
+        async for event in iterate_events(events, stop, max_events, timeout):
+            yield event
+
+    def iter(
+        self,
+        new_message: types.ContentUnion,
+        stop: Callable[[Event], bool] | None = None,
+        max_events: int | None = None,
+        timeout: float | None = None,
+    ) -> Iterator[Event]:
+        """Sync variant of iter_async, driven on the runner's own loop."""
+        events = self.iter_async(new_message, stop, max_events, timeout)
+        try:
+            while True:
+                try:
+                    yield self._loop.run_until_complete(events.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._loop.run_until_complete(events.aclose())
+
+    def run_live(
+        self,
+        live_request_queue: LiveRequestQueue,
+        max_responses: int | None = 1,
+        timeout: float | None = None,
+        run_config: RunConfig | None = None,
+    ) -> list[Event]:
+        """Collects live events until `max_responses` have arrived.
+
+        With `max_responses=None` it collects until the run ends, which happens
+        once `live_request_queue` is closed. `timeout` bounds the wait; events
+        collected before it expires are returned.
+        """
+        collected_responses = []
+
+        async def consume_responses():
+            session_id = await self._ensure_session_id()
+            run_res = self.runner.run_live(
+                user_id=self.user_id,
+                session_id=session_id,
+                live_request_queue=live_request_queue,
+                run_config=run_config,
+            )
+            async for response in iterate_events(
+                run_res, max_events=max_responses, timeout=timeout
+            ):
+                collected_responses.append(response)
+
+        self._loop.run_until_complete(consume_responses())
+        return collected_responses
+
+
+@dataclasses.dataclass(frozen=True)
+class RequestSummary:
+    """What RequestRecorder keeps of a request in 'summary' mode."""
+
+    contents_hash: str
+    num_contents: int
+    token_estimate: int
+    tool_names: tuple[str, ...]
+
+
+def summarize_request(llm_request: LlmRequest) -> RequestSummary:
+    contents = [
+        content.model_dump(mode="json", exclude_none=True)
+        for content in llm_request.contents
+    ]
+    serialized = json.dumps(contents, sort_keys=True)
+    text_chars = sum(
+        len(part.text)
+        for content in llm_request.contents
+        for part in content.parts or []
+        if part.text
+    )
+    return RequestSummary(
+        contents_hash=hashlib.sha256(serialized.encode("utf-8")).hexdigest(),
+        num_contents=len(contents),
+        # Roughly four characters per token.
+        token_estimate=(text_chars + 3) // 4,
+        tool_names=tuple(llm_request.tools_dict),
+    )
+
+
+_REQUEST_RECORDING_MODES = ("all", "last", "summary")
+_default_request_recording = ("all", None)
+
+
+def set_default_request_recording(
+    mode: str, limit: int | None = None
+) -> tuple[str, int | None]:
+    """Sets the recording mode of RequestRecorders created from now on.
+
+    Returns the previous (mode, limit) so callers can restore it.
+    """
+    global _default_request_recording
+    _validate_request_recording(mode, limit)
+    previous = _default_request_recording
+    _default_request_recording = (mode, limit)
+    return previous
+
+
+def _validate_request_recording(mode: str, limit: int | None) -> None:
+    if mode not in _REQUEST_RECORDING_MODES:
+        raise ValueError(
+            f"Unknown request recording mode {mode!r}, expected one of"
+            f" {_REQUEST_RECORDING_MODES}"
+        )
+    if mode == "last" and not limit:
+        raise ValueError("Request recording mode 'last' needs a positive limit")
+
+
+class RequestRecorder:
+    """Records the LlmRequests a mock model receives.
+
+    Modes:
+      'all': keep every request (the default).
+      'last': keep only the `limit` most recent requests, in a ring buffer.
+      'summary': keep a RequestSummary instead of each request; with `limit`,
+        only the most recent summaries.
+
+    `count` is the number of requests seen, whatever the mode keeps.
+    """
+
+    def __init__(self, mode: str | None = None, limit: int | None = None):
+        if mode is None:
+            mode, limit = _default_request_recording
+        _validate_request_recording(mode, limit)
+        self.mode = mode
+        self.limit = limit
+        self.count = 0
+        self._records = collections.deque(maxlen=limit)
+
+    def record(self, llm_request: LlmRequest) -> None:
+        self.count += 1
+        if self.mode == "summary":
+            self._records.append(summarize_request(llm_request))
+        else:
+            self._records.append(llm_request)
+
+    @property
+    def requests(self) -> list[LlmRequest]:
+        """The kept requests, oldest first; empty in 'summary' mode."""
+        return [] if self.mode == "summary" else list(self._records)
+
+    @property
+    def summaries(self) -> list[RequestSummary]:
+        """Summaries of the kept requests, oldest first."""
+        if self.mode == "summary":
+            return list(self._records)
+        return [summarize_request(request) for request in self._records]
+
+    def clear(self) -> None:
+        self.count = 0
+        self._records.clear()
+
+
+class MockModel(BaseLlm):
+    model: str = "mock"
+
+    responses: list[LlmResponse]
+    response_index: int = -1
+    recorder: RequestRecorder = Field(default_factory=RequestRecorder, exclude=True)
+
+    @property
+    def requests(self) -> list[LlmRequest]:
+        return self.recorder.requests
+
+    @classmethod
+    def create(
+        cls,
+        responses: (
+            list[types.Part] | list[LlmResponse] | list[str] | list[list[types.Part]]
+        ),
+    ):
+        if not responses:
+            return cls(responses=[])
+        elif isinstance(responses[0], LlmResponse):
+            # responses is list[LlmResponse]
+            return cls(responses=responses)
+        else:
+            responses = [
+                (
+                    LlmResponse(content=ModelContent(item))
+                    if isinstance(item, list) and isinstance(item[0], types.Part)
+                    # responses is list[list[Part]]
+                    else LlmResponse(
+                        content=ModelContent(
+                            # responses is list[str] or list[Part]
+                            [Part(text=item) if isinstance(item, str) else item]
+                        )
+                    )
+                )
+                for item in responses
+                if item
+            ]
+
+            return cls(responses=responses)
+
+    @staticmethod
+    def supported_models() -> list[str]:
+        return ["mock"]
+
+    def generate_content(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> Generator[LlmResponse, None, None]:
+        # Increasement of the index has to happen before the yield.
+        self.response_index += 1
+        self.recorder.record(llm_request)
+        # yield LlmResponse(content=self.responses[self.response_index])
+        yield self.responses[self.response_index]
+
+    @override
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        # Increasement of the index has to happen before the yield.
+        self.response_index += 1
+        self.recorder.record(llm_request)
+        yield self.responses[self.response_index]
+
+    @contextlib.asynccontextmanager
+    async def connect(self, llm_request: LlmRequest) -> BaseLlmConnection:
+        """Creates a live connection to the LLM."""
+        yield MockLlmConnection(self.responses)
+
+
+class LatencyDistribution:
+    """A distribution of delays, in seconds, for LatencyMockModel."""
+
+    def __init__(
+        self,
+        kind: str,
+        seconds: float = 0.0,
+        sigma: float = 0.0,
+        samples: list[float] | None = None,
+    ):
+        if kind not in ("fixed", "lognormal", "trace"):
+            raise ValueError(f"Unknown latency distribution {kind!r}")
+        if kind == "trace" and not samples:
+            raise ValueError("A trace latency distribution needs samples")
+        self.kind = kind
+        self.seconds = seconds
+        self.sigma = sigma
+        self.samples = list(samples or [])
+
+    @classmethod
+    def fixed(cls, seconds: float) -> "LatencyDistribution":
+        return cls("fixed", seconds=seconds)
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float) -> "LatencyDistribution":
+        """Lognormal delays with the given median and log-space sigma."""
+        return cls("lognormal", seconds=median, sigma=sigma)
+
+    @classmethod
+    def trace(cls, samples: list[float]) -> "LatencyDistribution":
+        """Draws recorded delays, uniformly at random, from a trace.
+
+        Draws come from the caller's generator, like lognormal ones, so each
+        request gets the same delays however concurrent requests interleave.
+        """
+        return cls("trace", samples=samples)
+
+    @classmethod
+    def from_trace_file(cls, path: str) -> "LatencyDistribution":
+        """Loads a trace recorded as a JSON list of delays in seconds."""
+        with open(path) as f:
+            return cls.trace([float(sample) for sample in json.load(f)])
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "fixed":
+            return self.seconds
+        if self.kind == "lognormal":
+            if self.seconds <= 0:
+                return 0.0
+            return rng.lognormvariate(math.log(self.seconds), self.sigma)
+        return self.samples[rng.randrange(len(self.samples))]
+
+
+class LatencyMockModel(MockModel):
+    """MockModel that answers with modeled latency, failures and streaming.
+
+    Each request waits `time_to_first_chunk`, may then fail with a 429
+    (`rate_limit_rate`) or a 500 (`error_rate`), and otherwise delivers the
+    canned response. With `stream=True` and `chunk_size` set, text responses
+    arrive as partial chunks of `chunk_size` characters `chunk_delay` apart,
+    followed by the complete response; without streaming the same delays
+    elapse before the single response.
+
+    Random draws use a generator seeded from `seed` and the request index, so
+    a run is reproducible regardless of how concurrent requests interleave.
+    `generate_content_async` and live connections from `connect` are
+    latency-modeled; error injection applies to the former only.
+    """
+
+    time_to_first_chunk: LatencyDistribution = Field(
+        default_factory=lambda: LatencyDistribution.fixed(0.0)
+    )
+    chunk_delay: LatencyDistribution = Field(
+        default_factory=lambda: LatencyDistribution.fixed(0.0)
+    )
+    chunk_size: int = 0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    seed: int = 0
+    cycle_responses: bool = False
+
+    def select_response(self, llm_request: LlmRequest, index: int) -> LlmResponse:
+        """Picks the response to a request; override to answer by content."""
+        if self.cycle_responses:
+            return self.responses[index % len(self.responses)]
+        return self.responses[index]
+
+    def _chunks(self, response: LlmResponse) -> list[str]:
+        """Splits a text-only response into chunks; [] if it can't be split."""
+        parts = response.content.parts if response.content else None
+        if not parts or not all(part.text is not None for part in parts):
+            return []
+        text = "".join(part.text for part in parts)
+        if not self.chunk_size:
+            return [text]
+        return [
+            text[i : i + self.chunk_size] for i in range(0, len(text), self.chunk_size)
+        ] or [text]
+
+    @override
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        # Increasement of the index has to happen before the first await.
+        self.response_index += 1
+        index = self.response_index
+        self.recorder.record(llm_request)
+        rng = random.Random(self.seed * 1_000_003 + index)
+        response = self.select_response(llm_request, index)
+
+        await asyncio.sleep(self.time_to_first_chunk.sample(rng))
+        failure = rng.random()
+        if failure < self.rate_limit_rate:
+            raise errors.ClientError(
+                429,
+                {
+                    "error": {
+                        "code": 429,
+                        "message": "Injected rate limit",
+                        "status": "RESOURCE_EXHAUSTED",
+                    }
+                },
+            )
+        if failure < self.rate_limit_rate + self.error_rate:
+            raise errors.ServerError(
+                500,
+                {
+                    "error": {
+                        "code": 500,
+                        "message": "Injected error",
+                        "status": "INTERNAL",
+                    }
+                },
+            )
+
+        chunks = self._chunks(response)
+        if stream and len(chunks) > 1:
+            for i, chunk in enumerate(chunks):
+                if i:
+                    await asyncio.sleep(self.chunk_delay.sample(rng))
+                yield LlmResponse(
+                    content=ModelContent([Part(text=chunk)]), partial=True
+                )
+        else:
+            for _ in range(len(chunks) - 1):
+                await asyncio.sleep(self.chunk_delay.sample(rng))
+        yield response
+
+    @contextlib.asynccontextmanager
+    async def connect(self, llm_request: LlmRequest) -> BaseLlmConnection:
+        """Opens a reactive live connection with this model's latencies."""
+        self.response_index += 1
+        self.recorder.record(llm_request)
+        yield MockLlmConnection(
+            self.responses,
+            reactive=True,
+            time_to_first_chunk=self.time_to_first_chunk,
+            chunk_delay=self.chunk_delay,
+            seed=self.seed * 1_000_003 + self.response_index,
+        )
+
+
+class MockLlmConnection(BaseLlmConnection):
+    """Live connection that replays canned responses.
+
+    By default `receive` yields every canned response at once. With
+    `reactive=True` it answers each user turn instead, the way a live model
+    does: a turn ends with `send_content` or with an ActivityEnd passed to
+    `send_realtime`. After `time_to_first_chunk` the canned responses arrive
+    `chunk_delay` apart, followed by a turn_complete response, and `receive`
+    returns once the connection is closed.
+    """
+
+    def __init__(
+        self,
+        llm_responses: list[LlmResponse],
+        reactive: bool = False,
+        time_to_first_chunk: LatencyDistribution | None = None,
+        chunk_delay: LatencyDistribution | None = None,
+        seed: int = 0,
+    ):
+        self.llm_responses = llm_responses
+        self.reactive = reactive
+        self.time_to_first_chunk = time_to_first_chunk or LatencyDistribution.fixed(0.0)
+        self.chunk_delay = chunk_delay or LatencyDistribution.fixed(0.0)
+        self.realtime_chunks = 0
+        self.turns = 0
+        self._rng = random.Random(seed)
+        # One item per finished user turn; None once the connection is closed.
+        self._turn_ends: asyncio.Queue[bool | None] = asyncio.Queue()
+
+    async def send_history(self, history: list[types.Content]):
+        pass
+
+    async def send_content(self, content: types.Content):
+        if self.reactive:
+            self._turn_ends.put_nowait(True)
+
+    async def send(self, data):
+        pass
+
+    async def send_realtime(self, blob: types.Blob):
+        if isinstance(blob, types.ActivityEnd):
+            if self.reactive:
+                self._turn_ends.put_nowait(True)
+        elif isinstance(blob, types.Blob):
+            self.realtime_chunks += 1
+
+    async def receive(self) -> AsyncGenerator[LlmResponse, None]:
+        """Yield each of the pre-defined LlmResponses, per turn if reactive."""
+        if not self.reactive:
+            for response in self.llm_responses:
+                yield response
+            return
+
+        if not await self._turn_ends.get():
+            return
+        self.turns += 1
+        await asyncio.sleep(self.time_to_first_chunk.sample(self._rng))
+        for i, response in enumerate(self.llm_responses):
+            if i:
+                await asyncio.sleep(self.chunk_delay.sample(self._rng))
+            yield response
+        yield LlmResponse(turn_complete=True)
+
+    async def close(self):
+        if self.reactive:
+            self._turn_ends.put_nowait(None)